@@ -7,9 +7,25 @@ from mensa_member_connect.models.connection_request import ConnectionRequest
 from mensa_member_connect.models.expertise import Expertise
 from mensa_member_connect.models.industry import Industry
 from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.models.email_suppression import EmailSuppression
+from mensa_member_connect.models.queued_email import QueuedEmail
+from mensa_member_connect.pagination import EstimatedCountPaginator
 
 
-class CustomUserAdmin(admin.ModelAdmin):
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables that can grow to millions of rows: an
+    estimated total instead of COUNT(*), and no second count of the
+    unfiltered table next to filtered results. Subclasses join the users
+    they display in get_queryset, which the change views share, rather
+    than through list_select_related.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CustomUserAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "first_name",
@@ -20,46 +36,82 @@ class CustomUserAdmin(admin.ModelAdmin):
         "status",
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("profile_photo")
+
+
+class AdminActionAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "admin_email",
+        "target_email",
+        "action_type",
+        "action",
+        "created_at",
+    )
+    list_filter = ("action_type",)
 
-class AdminActionAdmin(admin.ModelAdmin):
-    list_display = ("id", "admin_email", "target_email", "action", "created_at")
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("admin", "target_user")
+            .defer("admin__profile_photo", "target_user__profile_photo")
+        )
 
     def admin_email(self, obj):
-        return obj.admin.email
+        # Users may have been deleted since; the action row is kept
+        return obj.admin.email if obj.admin else None
 
     admin_email.admin_order_field = "admin__email"
     admin_email.short_description = "Admin Email"
 
     def target_email(self, obj):
-        return obj.target_user.email
+        return obj.target_user.email if obj.target_user else None
 
     target_email.admin_order_field = "target_user__email"
     target_email.short_description = "Target Email"
 
 
-class ConnectionRequestAdmin(admin.ModelAdmin):
+class ConnectionRequestAdmin(LargeTableAdmin):
     list_display = ("id", "seeker_email", "expert_email", "created_at")
 
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("seeker", "expert")
+            .defer("seeker__profile_photo", "expert__profile_photo")
+        )
+
     def seeker_email(self, obj):
-        return obj.seeker.email
+        return obj.seeker.email if obj.seeker else None
 
     seeker_email.admin_order_field = "seeker__email"
     seeker_email.short_description = "Seeker"
 
     def expert_email(self, obj):
-        return obj.expert.user.email
+        return obj.expert.email if obj.expert else None
 
-    expert_email.admin_order_field = "expert__user__email"
+    expert_email.admin_order_field = "expert__email"
     expert_email.short_description = "Expert"
 
 
-class ExpertiseAdmin(admin.ModelAdmin):
+class ExpertiseAdmin(LargeTableAdmin):
     list_display = ("id", "expert_email", "what_offering")
 
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("user")
+            .defer("user__profile_photo")
+        )
+
     def expert_email(self, obj):
-        return getattr(getattr(obj.expert, "user", None), "email", "-")
+        return obj.user.email if obj.user else "-"
 
-    expert_email.admin_order_field = "expert__user__username"
+    expert_email.admin_order_field = "user__email"
     expert_email.short_description = "Expert"
 
 
@@ -71,6 +123,17 @@ class LocalGroupAdmin(admin.ModelAdmin):
     list_display = ("id", "group_name", "group_number")
 
 
+class EmailSuppressionAdmin(admin.ModelAdmin):
+    list_display = ("id", "email", "reason", "created_at")
+    list_filter = ("reason",)
+    search_fields = ("email",)
+
+
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "sender", "created_at", "sent_at", "attempts", "last_error")
+    list_filter = ("sender",)
+
+
 # Register models with default admin
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(AdminAction, AdminActionAdmin)
@@ -78,3 +141,5 @@ admin.site.register(ConnectionRequest, ConnectionRequestAdmin)
 admin.site.register(Expertise, ExpertiseAdmin)
 admin.site.register(Industry, IndustryAdmin)
 admin.site.register(LocalGroup, LocalGroupAdmin)
+admin.site.register(EmailSuppression, EmailSuppressionAdmin)
+admin.site.register(QueuedEmail, QueuedEmailAdmin)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class MensaMemberConnectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mensa_member_connect'
+
+    def ready(self):
+        # Register model signal handlers
+        # pylint: disable=import-outside-toplevel,unused-import
+        from mensa_member_connect import signals  # noqa: F401
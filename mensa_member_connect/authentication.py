@@ -0,0 +1,17 @@
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication as SimpleJWTAuthentication,
+)
+
+
+class JWTAuthentication(SimpleJWTAuthentication):
+    """
+    simplejwt's JWTAuthentication, except that a sub-request of POST
+    /api/batch/ reuses the (user, token) pair the batch already resolved,
+    so the token is decoded and the user loaded once per batch.
+    """
+
+    def authenticate(self, request):
+        resolved = getattr(request._request, "batch_auth", None)
+        if resolved is not None:
+            return resolved
+        return super().authenticate(request)
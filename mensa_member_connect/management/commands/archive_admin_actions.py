@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from mensa_member_connect.utils.audit import ARCHIVE_BATCH_SIZE, archive_admin_actions
+
+
+class Command(BaseCommand):
+    help = (
+        "Move admin actions older than the retention window into "
+        "gzip-compressed JSONL files by month and delete them from the "
+        "database. Safe to re-run after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help=(
+                "Keep this many days in the table "
+                "(default: ADMIN_ACTION_RETENTION_DAYS)."
+            ),
+        )
+        parser.add_argument(
+            "--output-dir",
+            default=None,
+            help="Archive directory (default: ADMIN_ACTION_ARCHIVE_DIR).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="Rows written and deleted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_admin_actions(
+            retention_days=options["retention_days"],
+            directory=options["output_dir"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} admin actions."))
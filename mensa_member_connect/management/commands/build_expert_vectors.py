@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from mensa_member_connect.utils.expert_vectors import build_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the TF-IDF vectors behind the similar-experts endpoint "
+        "from every expert's expertise, occupation and industry."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dims",
+            type=int,
+            default=None,
+            help="Number of hashed dimensions (default: EXPERT_VECTOR_DIMS).",
+        )
+
+    def handle(self, *args, **options):
+        manifest = build_index(dims=options["dims"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built expert vectors for {manifest['experts']} experts "
+                f"({manifest['dims']} dimensions)."
+            )
+        )
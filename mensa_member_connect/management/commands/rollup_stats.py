@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from mensa_member_connect.utils.rollups import (
+    rollup_connection_requests,
+    rollup_registrations,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the daily rollup tables for the days with connection requests "
+        "and registrations created since the last run. Safe to run on a schedule "
+        "(e.g. every 15 minutes)."
+    )
+
+    def handle(self, *args, **options):
+        registrations = rollup_registrations()
+        requests = rollup_connection_requests()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recounted {registrations} registrations and {requests} connection requests."
+            )
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from mensa_member_connect.utils.email_utils import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued emails that are still in the outbox: failed sends that "
+        "are due for a retry, and emails left behind by a worker restart. "
+        "Safe to run on a schedule (e.g. every 5 minutes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Most emails to attempt in this run.",
+        )
+
+    def handle(self, *args, **options):
+        sent, due = send_queued_emails(limit=options["limit"])
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} of {due} due emails."))
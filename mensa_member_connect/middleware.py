@@ -0,0 +1,158 @@
+# mensa_member_connect/middleware.py
+"""
+Per-view request instrumentation. Every request is recorded under its
+resolved view (viewset class and action for DRF viewsets, the function name
+for @api_view views) with its wall time, SQL query count and time, response
+size and status, so N+1 regressions show up as a jump in
+mmc_http_request_queries for one view.
+
+SQL is measured by a wrapper installed on every database connection that
+reports to the request's _QueryTimer through a context variable. Under ASGI
+the sync middleware below this one (WhiteNoise is sync-only) and the views
+run through sync_to_async on the worker's shared sync thread, with that
+thread's connections, and the context variable follows them there.
+"""
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.decorators import sync_and_async_middleware
+
+from mensa_member_connect.utils.metrics import Counter, Histogram, flush_if_due
+
+# Requests that matched no URL share one label, so random paths cannot
+# create new series.
+UNRESOLVED_VIEW = "unresolved"
+
+REQUEST_LABELS = ("view", "method")
+
+REQUESTS = Counter(
+    "mmc_http_requests",
+    "HTTP requests handled, by view, method and status code.",
+    labelnames=REQUEST_LABELS + ("status",),
+)
+REQUEST_SECONDS = Histogram(
+    "mmc_http_request_seconds",
+    "Wall time from request to response, by view.",
+    labelnames=REQUEST_LABELS,
+)
+REQUEST_QUERIES = Histogram(
+    "mmc_http_request_queries",
+    "SQL queries executed per request, by view.",
+    labelnames=REQUEST_LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "mmc_http_request_sql_seconds",
+    "Time spent executing SQL per request, by view.",
+    labelnames=REQUEST_LABELS,
+)
+RESPONSE_BYTES = Histogram(
+    "mmc_http_response_bytes",
+    "Response body size, by view. Streaming responses are not counted.",
+    labelnames=REQUEST_LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+
+class _QueryTimer:
+    """
+    Query count and SQL time of one request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_current_timer = ContextVar("request_query_timer", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - started
+        timer.queries += 1
+
+
+def _instrument(db):
+    if _time_query not in db.execute_wrappers:
+        db.execute_wrappers.append(_time_query)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    _instrument(connection)
+
+
+def _view_label(view_func, method: str) -> str:
+    actions = getattr(view_func, "actions", None)
+    view_class = getattr(view_func, "cls", None)
+    if actions and view_class is not None:
+        return f"{view_class.__name__}.{actions.get(method.lower(), method.lower())}"
+    if view_class is not None:
+        return view_class.__name__
+    name = getattr(view_func, "__name__", type(view_func).__name__)
+    return f"{view_func.__module__}.{name}"
+
+
+@sync_and_async_middleware
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported
+        for db in connections.all(initialized_only=True):
+            _instrument(db)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        request._metrics_view = UNRESOLVED_VIEW
+        timer = _QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._record(request, response, time.perf_counter() - started, timer)
+        return response
+
+    async def __acall__(self, request):
+        request._metrics_view = UNRESOLVED_VIEW
+        timer = _QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._record(request, response, time.perf_counter() - started, timer)
+        return response
+
+    @staticmethod
+    def _record(request, response, elapsed, timer):
+        labels = {"view": request._metrics_view, "method": request.method}
+        REQUESTS.inc(status=response.status_code, **labels)
+        REQUEST_SECONDS.observe(elapsed, **labels)
+        REQUEST_QUERIES.observe(timer.queries, **labels)
+        REQUEST_SQL_SECONDS.observe(timer.seconds, **labels)
+        if not response.streaming:
+            RESPONSE_BYTES.observe(len(response.content), **labels)
+
+        flush_if_due(settings.METRICS_DIR)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = _view_label(view_func, request.method)
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0012_emailsuppression'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['expert', 'created_at'], name='connreq_expert_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['seeker', 'created_at'], name='connreq_seeker_created_idx'),
+        ),
+    ]
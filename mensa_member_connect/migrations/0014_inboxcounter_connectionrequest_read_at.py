@@ -0,0 +1,62 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_inbox_counters(apps, schema_editor):
+    """
+    Seed counters from existing requests. Existing requests start out unread.
+    """
+    ConnectionRequest = apps.get_model("mensa_member_connect", "ConnectionRequest")
+    InboxCounter = apps.get_model("mensa_member_connect", "InboxCounter")
+
+    counters = {}
+    for row in (
+        ConnectionRequest.objects.filter(expert__isnull=False)
+        .values("expert_id")
+        .annotate(total=Count("id"))
+    ):
+        counter = counters.setdefault(
+            row["expert_id"], InboxCounter(user_id=row["expert_id"])
+        )
+        counter.total_received = row["total"]
+        counter.unread_received = row["total"]
+    for row in (
+        ConnectionRequest.objects.filter(seeker__isnull=False)
+        .values("seeker_id")
+        .annotate(total=Count("id"))
+    ):
+        counter = counters.setdefault(
+            row["seeker_id"], InboxCounter(user_id=row["seeker_id"])
+        )
+        counter.total_sent = row["total"]
+
+    InboxCounter.objects.bulk_create(counters.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0013_connectionrequest_connreq_expert_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='inbox_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_received', models.PositiveIntegerField(default=0)),
+                ('total_received', models.PositiveIntegerField(default=0)),
+                ('total_sent', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='connectionrequest',
+            name='read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_inbox_counters, migrations.RunPython.noop),
+    ]
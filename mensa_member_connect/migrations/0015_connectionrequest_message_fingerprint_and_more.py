@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0014_inboxcounter_connectionrequest_read_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='connectionrequest',
+            name='message_fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['seeker', 'expert', 'message_fingerprint'], name='connreq_dedup_idx'),
+        ),
+    ]
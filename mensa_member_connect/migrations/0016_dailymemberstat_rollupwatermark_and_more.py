@@ -0,0 +1,51 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0015_connectionrequest_message_fingerprint_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMemberStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('registrations', models.PositiveIntegerField(default=0)),
+                ('first_requests', models.PositiveIntegerField(default=0)),
+                ('approved_first_requests', models.PositiveIntegerField(default=0)),
+                ('seconds_to_first_request', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='approved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='DailyConnectionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('connection_requests', models.PositiveIntegerField(default=0)),
+                ('industry', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mensa_member_connect.industry')),
+                ('local_group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mensa_member_connect.localgroup')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='dailyconnstat_day_idx')],
+            },
+        ),
+    ]
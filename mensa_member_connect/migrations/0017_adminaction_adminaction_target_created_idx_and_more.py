@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0016_dailymemberstat_rollupwatermark_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminaction',
+            index=models.Index(fields=['target_user', 'created_at'], name='adminaction_target_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminaction',
+            index=models.Index(fields=['admin', 'created_at'], name='adminaction_admin_created_idx'),
+        ),
+    ]
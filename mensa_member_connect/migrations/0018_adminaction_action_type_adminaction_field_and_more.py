@@ -0,0 +1,79 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:43
+
+import re
+
+from django.db import migrations, models
+
+LEGACY_ACTION_RE = re.compile(
+    r"changed the (?P<field>status|role) of user .* "
+    r"from '(?P<old>[^']*)' to '(?P<new>[^']*)'\.$"
+)
+
+
+def backfill_structured_actions(apps, schema_editor):
+    """
+    Parse the status/role messages written before the structured columns.
+    Messages that were cut off at 128 characters stay as type "other".
+    """
+    AdminAction = apps.get_model("mensa_member_connect", "AdminAction")
+
+    batch = []
+    for record in AdminAction.objects.filter(action__contains="changed the").iterator(
+        chunk_size=1000
+    ):
+        match = LEGACY_ACTION_RE.search(record.action)
+        if not match:
+            continue
+        record.action_type = f"{match['field']}_change"
+        record.field = match["field"]
+        record.old_value = match["old"]
+        record.new_value = match["new"]
+        batch.append(record)
+        if len(batch) >= 1000:
+            AdminAction.objects.bulk_update(
+                batch, ["action_type", "field", "old_value", "new_value"]
+            )
+            batch = []
+    AdminAction.objects.bulk_update(
+        batch, ["action_type", "field", "old_value", "new_value"]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0017_adminaction_adminaction_target_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adminaction',
+            name='action_type',
+            field=models.CharField(choices=[('status_change', 'Status change'), ('role_change', 'Role change'), ('other', 'Other')], default='other', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='adminaction',
+            name='field',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='adminaction',
+            name='new_value',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='adminaction',
+            name='old_value',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='adminaction',
+            name='request_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='adminaction',
+            index=models.Index(fields=['action_type', 'created_at'], name='adminaction_type_created_idx'),
+        ),
+        migrations.RunPython(backfill_structured_actions, migrations.RunPython.noop),
+    ]
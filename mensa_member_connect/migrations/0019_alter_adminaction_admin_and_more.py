@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0018_adminaction_action_type_adminaction_field_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminaction',
+            name='admin',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='admin_actions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='adminaction',
+            name='target_user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='targeted_actions', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:10
+
+import hashlib
+import re
+
+from django.db import migrations
+
+
+def fingerprint(message) -> str:
+    # Frozen copy of models.connection_request.message_fingerprint
+    normalized = re.sub(r"\s+", " ", str(message or "")).strip().casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def backfill_message_fingerprints(apps, schema_editor):
+    """
+    Fingerprint requests created before the column existed, so duplicates of
+    them are caught from the first deploy on.
+    """
+    ConnectionRequest = apps.get_model("mensa_member_connect", "ConnectionRequest")
+
+    batch = []
+    for record in (
+        ConnectionRequest.objects.filter(message_fingerprint="")
+        .only("id", "message")
+        .iterator(chunk_size=1000)
+    ):
+        record.message_fingerprint = fingerprint(record.message)
+        batch.append(record)
+        if len(batch) >= 1000:
+            ConnectionRequest.objects.bulk_update(batch, ["message_fingerprint"])
+            batch = []
+    ConnectionRequest.objects.bulk_update(batch, ["message_fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0020_customuser_review_claimed_by_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_message_fingerprints, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:11
+
+import mensa_member_connect.models.custom_user
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mensa_member_connect', '0021_backfill_connectionrequest_message_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='customuser',
+            managers=[
+                ('objects', mensa_member_connect.models.custom_user.CustomUserManager()),
+            ],
+        ),
+    ]
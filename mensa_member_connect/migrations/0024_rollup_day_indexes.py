@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('mensa_member_connect', '0023_queuedemail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['created_at'], name='connreq_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+        ),
+    ]
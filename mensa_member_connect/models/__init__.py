@@ -4,3 +4,7 @@ from .admin_action import AdminAction
 from .connection_request import ConnectionRequest
 from .expertise import Expertise
 from .industry import Industry
+from .email_suppression import EmailSuppression
+from .inbox_counter import InboxCounter
+from .daily_stats import RollupWatermark, DailyConnectionStat, DailyMemberStat
+from .queued_email import QueuedEmail
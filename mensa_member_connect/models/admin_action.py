@@ -3,10 +3,19 @@ from django.db import models
 
 
 class AdminAction(models.Model):
+    TYPE_STATUS_CHANGE = "status_change"
+    TYPE_ROLE_CHANGE = "role_change"
+    TYPE_OTHER = "other"
+    TYPE_CHOICES = [
+        (TYPE_STATUS_CHANGE, "Status change"),
+        (TYPE_ROLE_CHANGE, "Role change"),
+        (TYPE_OTHER, "Other"),
+    ]
+
     # User who performed the action
     admin = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
         related_name="admin_actions",
@@ -15,17 +24,80 @@ class AdminAction(models.Model):
     # User who is the target of the action
     target_user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
         related_name="targeted_actions",
     )
 
+    # Human-readable summary, rendered from the structured fields below
     action = models.CharField(max_length=128, default="")
 
+    action_type = models.CharField(
+        max_length=32, choices=TYPE_CHOICES, default=TYPE_OTHER
+    )
+    # The CustomUser field that changed, with its values before and after
+    field = models.CharField(max_length=64, blank=True, default="")
+    old_value = models.TextField(blank=True, default="")
+    new_value = models.TextField(blank=True, default="")
+    # Groups the rows written by one API request
+    request_id = models.CharField(max_length=64, blank=True, default="")
+
     # Automatically set when object is created, stored in UTC
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Back the newest-first audit log filtered by target user or admin
+        indexes = [
+            models.Index(
+                fields=["target_user", "created_at"],
+                name="adminaction_target_created_idx",
+            ),
+            models.Index(
+                fields=["admin", "created_at"], name="adminaction_admin_created_idx"
+            ),
+            models.Index(
+                fields=["action_type", "created_at"],
+                name="adminaction_type_created_idx",
+            ),
+        ]
+
+    @classmethod
+    def field_change(
+        cls, admin, target_user, action_type, field, old_value, new_value, request_id=""
+    ):
+        """
+        An unsaved record of `admin` changing `field` of `target_user`, with
+        `action` rendered so rows can go straight into bulk_create.
+        """
+        record = cls(
+            admin=admin,
+            target_user=target_user,
+            action_type=action_type,
+            field=field,
+            old_value="" if old_value is None else str(old_value),
+            new_value="" if new_value is None else str(new_value),
+            request_id=request_id,
+        )
+        record.action = record.render_action()
+        return record
+
+    def render_action(self) -> str:
+        if not self.field:
+            return self.action
+        admin_name = self.admin.get_full_name() if self.admin else "Unknown"
+        target = (
+            f"{self.target_user.id} - {self.target_user.get_full_name()}"
+            if self.target_user
+            else "Unknown"
+        )
+        text = (
+            f"Admin {admin_name} changed the {self.field} of user {target} "
+            f"from '{self.old_value}' to '{self.new_value}'."
+        )
+        max_length = self._meta.get_field("action").max_length
+        return text if len(text) <= max_length else text[: max_length - 1] + "…"
+
     def __str__(self):
         admin_username = self.admin.username if self.admin else "Unknown"
         target_username = self.target_user.username if self.target_user else "Unknown"
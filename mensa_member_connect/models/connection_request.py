@@ -1,6 +1,19 @@
 # mensa_member_connect/models/connection_request.py
+import hashlib
+import re
+
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_init
+
+
+def message_fingerprint(message) -> str:
+    """
+    SHA-256 of the message with case and whitespace normalized, used to spot
+    a seeker re-sending the same request.
+    """
+    normalized = re.sub(r"\s+", " ", str(message or "")).strip().casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
 class ConnectionRequest(models.Model):
@@ -23,4 +36,41 @@ class ConnectionRequest(models.Model):
         null=True,
         help_text="Preferred contact method: email, phone, video_call, in_person, other",
     )
+    message_fingerprint = models.CharField(
+        max_length=64, blank=True, default="", editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the expert opens the request; null means unread
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_read(self) -> bool:
+        return self.read_at is not None
+
+    def save(self, *args, **kwargs):
+        self.message_fingerprint = message_fingerprint(self.message)
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # The reloaded values are the baseline the inbox counter signal
+        # compares the next save against (signals.remember_inbox_state).
+        post_init.send(sender=type(self), instance=self)
+
+    class Meta:
+        # Back the newest-first "received" and "sent" inbox listings
+        indexes = [
+            models.Index(
+                fields=["expert", "created_at"], name="connreq_expert_created_idx"
+            ),
+            models.Index(
+                fields=["seeker", "created_at"], name="connreq_seeker_created_idx"
+            ),
+            # Daily rollups recount whole days of requests
+            models.Index(fields=["created_at"], name="connreq_created_idx"),
+            # Duplicate detection: same seeker, expert and message
+            models.Index(
+                fields=["seeker", "expert", "message_fingerprint"],
+                name="connreq_dedup_idx",
+            ),
+        ]
@@ -32,6 +32,14 @@ class CustomUserManager(UserManager["CustomUser"]):
 
 
 class CustomUser(AbstractUser):
+    STATUS_PENDING = "pending"
+    STATUS_ACTIVE = "active"
+    STATUS_REJECTED = "rejected"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_ACTIVE, "Active"),
+        (STATUS_REJECTED, "Rejected"),
+    ]
 
     username = None  # Remove username field entirely
     email = models.EmailField(unique=True)  # Make email the main identifier
@@ -46,6 +54,8 @@ class CustomUser(AbstractUser):
     phone = PhoneNumberField(blank=True, null=True)
     role = models.CharField(max_length=16, default="member")
     status = models.CharField(max_length=24, default="pending")
+    # Set when an admin first moves the user to "active"
+    approved_at = models.DateTimeField(null=True, blank=True)
 
     occupation = models.CharField(max_length=128, default="", blank=True)
     industry = models.ForeignKey(
@@ -66,3 +76,25 @@ class CustomUser(AbstractUser):
         null=True,
         blank=True,
     )
+
+    # Review-queue claim on a pending user (see CustomUserViewSet.review_queue_next)
+    review_claimed_by = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    review_claimed_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Only pending users are ever scanned by the review queue
+            models.Index(
+                fields=["date_joined", "id"],
+                name="user_pending_review_idx",
+                condition=models.Q(status="pending"),
+            ),
+            # Daily rollups recount whole days of registrations
+            models.Index(fields=["date_joined"], name="user_date_joined_idx"),
+        ]
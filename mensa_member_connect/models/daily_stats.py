@@ -0,0 +1,70 @@
+# mensa_member_connect/models/daily_stats.py
+"""
+Rollup tables for analytics dashboards, filled incrementally by the
+`rollup_stats` management command (see utils/rollups.py). Dashboards read
+these instead of scanning the raw user and connection-request tables.
+"""
+from django.db import models
+
+from mensa_member_connect.models.industry import Industry
+from mensa_member_connect.models.local_group import LocalGroup
+
+
+class RollupWatermark(models.Model):
+    """
+    Highest source-row id already folded into a rollup.
+    """
+
+    name = models.CharField(max_length=64, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
+
+
+class DailyConnectionStat(models.Model):
+    """
+    Connection requests per day, by the expert's industry and the seeker's
+    local group.
+    """
+
+    day = models.DateField()
+    industry = models.ForeignKey(
+        Industry,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    local_group = models.ForeignKey(
+        LocalGroup,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    connection_requests = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["day"], name="dailyconnstat_day_idx")]
+
+    def __str__(self):
+        return f"{self.day}: {self.connection_requests} requests"
+
+
+class DailyMemberStat(models.Model):
+    """
+    Registrations per day, plus members who sent their first connection
+    request that day and the total seconds from approval to that request.
+    """
+
+    day = models.DateField(unique=True)
+    registrations = models.PositiveIntegerField(default=0)
+    first_requests = models.PositiveIntegerField(default=0)
+    # Only first requests from members with a known approval time
+    approved_first_requests = models.PositiveIntegerField(default=0)
+    seconds_to_first_request = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: {self.registrations} registrations"
@@ -0,0 +1,32 @@
+# mensa_member_connect/models/email_suppression.py
+from django.db import models
+
+
+class EmailSuppression(models.Model):
+    """
+    An address we must not send to, fed by Mailgun bounce, complaint and
+    unsubscribe events.
+    """
+
+    REASON_BOUNCE = "bounce"
+    REASON_COMPLAINT = "complaint"
+    REASON_UNSUBSCRIBE = "unsubscribe"
+    REASON_CHOICES = [
+        (REASON_BOUNCE, "Bounce"),
+        (REASON_COMPLAINT, "Complaint"),
+        (REASON_UNSUBSCRIBE, "Unsubscribe"),
+    ]
+
+    # Stored lower-cased so lookups are exact matches on the unique index
+    email = models.EmailField(unique=True)
+    reason = models.CharField(max_length=16, choices=REASON_CHOICES)
+    # Mailgun event id of the first event that suppressed this address
+    event_id = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        self.email = self.email.strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.email} ({self.reason})"
@@ -0,0 +1,42 @@
+# mensa_member_connect/models/inbox_counter.py
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+
+
+class InboxCounter(models.Model):
+    """
+    Per-user connection-request counts, maintained incrementally so the
+    inbox badge is a primary-key lookup instead of COUNT(*) queries.
+    Updated in the same transaction as the ConnectionRequest change.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="inbox_counter",
+    )
+    unread_received = models.PositiveIntegerField(default=0)
+    total_received = models.PositiveIntegerField(default=0)
+    total_sent = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def adjust(cls, user_id, create=True, **deltas):
+        """
+        Atomically add `deltas` (field name -> amount) to a user's counters.
+        The row is created on first use unless `create` is False.
+        """
+        if user_id is None or not deltas:
+            return
+        changes = {field: F(field) + amount for field, amount in deltas.items()}
+        if cls.objects.filter(user_id=user_id).update(**changes) or not create:
+            return
+        cls.objects.get_or_create(user_id=user_id)
+        cls.objects.filter(user_id=user_id).update(**changes)
+
+    def __str__(self):
+        return (
+            f"Inbox of user {self.user_id}: {self.unread_received} unread, "
+            f"{self.total_received} received, {self.total_sent} sent"
+        )
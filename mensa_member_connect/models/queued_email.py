@@ -0,0 +1,36 @@
+# mensa_member_connect/models/queued_email.py
+from django.db import models
+
+
+class QueuedEmail(models.Model):
+    """
+    An email queued by email_utils.queue_emails, written in the same
+    transaction as the change that triggered it. The row stays unsent until
+    a delivery succeeds, so emails survive worker restarts and failed sends
+    are retried by the `send_queued_emails` management command.
+    """
+
+    # Name of the email_utils sender to call, e.g. "notify_user_approval"
+    sender = models.CharField(max_length=64)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Null until delivered
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        # Backs the "due for delivery" scan of the outbox
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="queuedemail_unsent_idx",
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        state = "sent" if self.sent_at else f"{self.attempts} attempts"
+        return f"{self.sender} #{self.pk} ({state})"
@@ -0,0 +1,92 @@
+# mensa_member_connect/pagination.py
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class StandardResultsPagination(PageNumberPagination):
+    """
+    Page-number pagination for list endpoints: ?page=2&page_size=50
+    """
+
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """
+    Cursor pagination for append-only logs: ?cursor=...&page_size=100
+    Pages stay stable while new rows arrive and deep pages cost no OFFSET.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django admin paginator that skips COUNT(*) on large, unfiltered
+    PostgreSQL tables and uses the planner's row estimate
+    (pg_class.reltuples) instead. Filtered lists, small tables and other
+    databases get an exact count.
+
+    The estimate can run ahead of the real row count, so a page past the
+    real end is answered with the real last page, after an exact count.
+    """
+
+    # Below this many estimated rows an exact count is cheap enough
+    EXACT_COUNT_THRESHOLD = 10000
+
+    count_is_estimated = False
+    # Set once an estimate turned out too high; later page numbers past the
+    # end (e.g. the admin's page links for the requested page) are clamped
+    recounted = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = self._estimated_rows(queryset)
+            if estimate is not None and estimate >= self.EXACT_COUNT_THRESHOLD:
+                self.count_is_estimated = True
+                return estimate
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.recounted:
+                raise
+            return self.num_pages
+
+    def page(self, number):
+        page = super().page(number)
+        if self.count_is_estimated and page.number > 1 and not page.object_list:
+            # Recount exactly; num_pages and page_range follow the new count
+            for name in ("count", "num_pages", "page_range"):
+                self.__dict__.pop(name, None)
+            self.count_is_estimated = False
+            self.recounted = True
+            self.__dict__["count"] = self.object_list.count()
+            page = super().page(number)
+        return page
+
+    @staticmethod
+    def _estimated_rows(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 (or 0) until the table has been analyzed
+        return int(row[0]) if row and row[0] > 0 else None
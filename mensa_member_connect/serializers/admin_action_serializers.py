@@ -24,14 +24,19 @@ class AdminActionListSerializer(serializers.ModelSerializer):
             "user_id",
             "user_name",
             "action",
+            "action_type",
+            "field",
+            "old_value",
+            "new_value",
+            "request_id",
             "created_at",
         ]
 
 
 # Detail serializer (all fields)
 class AdminActionDetailSerializer(serializers.ModelSerializer):
-    admin = CustomUserMiniSerializer(source="admin_id", read_only=True)
-    user = CustomUserMiniSerializer(source="target_user_id", read_only=True)
+    admin = CustomUserMiniSerializer(read_only=True)
+    user = CustomUserMiniSerializer(source="target_user", read_only=True)
 
     class Meta:
         model = AdminAction
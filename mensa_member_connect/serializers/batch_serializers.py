@@ -0,0 +1,21 @@
+# mensa_member_connect/serializers/batch_serializers.py
+from rest_framework import serializers
+
+MAX_BATCH_REQUESTS = 20
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_path(self, value):
+        if not value.startswith("/api/"):
+            raise serializers.ValidationError("Must be an /api/ path.")
+        return value
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_REQUESTS
+    )
@@ -2,6 +2,7 @@
 from rest_framework import serializers
 from mensa_member_connect.models.connection_request import ConnectionRequest
 from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.inbox_counter import InboxCounter
 from mensa_member_connect.serializers.custom_user_serializers import (
     CustomUserSummarySerializer,
 )
@@ -24,10 +25,11 @@ class ConnectionRequestListSerializer(serializers.ModelSerializer):
             "seeker_id",
             "seeker_name",
             "created_at",
+            "read_at",
         ]
 
 
-# Detail serializer (all fields)
+# Detail serializer (all fields except internal ones)
 class ConnectionRequestDetailSerializer(serializers.ModelSerializer):
     # For reading
     expert = CustomUserSummarySerializer(read_only=True)
@@ -40,4 +42,13 @@ class ConnectionRequestDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ConnectionRequest
-        fields = "__all__"
+        exclude = ["message_fingerprint"]
+        read_only_fields = ["read_at"]
+
+
+class InboxSummarySerializer(serializers.ModelSerializer):
+    unread_count = serializers.IntegerField(source="unread_received", read_only=True)
+
+    class Meta:
+        model = InboxCounter
+        fields = ["unread_count", "total_received", "total_sent"]
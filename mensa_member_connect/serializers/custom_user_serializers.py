@@ -69,6 +69,51 @@ class CustomUserExpertSerializer(serializers.ModelSerializer):
         return f"data:image/{image_format};base64,{base64_data}"
 
 
+class RelatedExpertSerializer(serializers.ModelSerializer):
+    """
+    Compact expert card for the similar-experts panel. Pass the cosine
+    scores as context={"scores": {user_id: score}}.
+    """
+
+    industry = IndustryListSerializer(read_only=True)
+    local_group = LocalGroupMiniSerializer(read_only=True)
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CustomUser
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "city",
+            "state",
+            "occupation",
+            "industry",
+            "local_group",
+            "availability_status",
+            "score",
+        ]
+
+    def get_score(self, obj):
+        return round(self.context.get("scores", {}).get(obj.id, 0.0), 4)
+
+
+class ExpertMatchRequestSerializer(serializers.Serializer):
+    description = serializers.CharField(max_length=2000)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    MAX_USERS = 500
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=MAX_USERS,
+    )
+    status = serializers.ChoiceField(choices=CustomUser.STATUS_CHOICES)
+
+
 class CustomUserMiniSerializer(serializers.ModelSerializer):
     name = serializers.CharField(source="get_full_name", read_only=True)
 
@@ -114,6 +159,17 @@ class CustomUserListSerializer(serializers.ModelSerializer):
         ]
 
 
+class ReviewQueueUserSerializer(CustomUserListSerializer):
+    class Meta(CustomUserListSerializer.Meta):
+        fields = CustomUserListSerializer.Meta.fields + [
+            "city",
+            "state",
+            "occupation",
+            "date_joined",
+            "review_claimed_until",
+        ]
+
+
 class CustomUserDetailSerializer(serializers.ModelSerializer):
     industry = IndustryListSerializer(read_only=True)
     phone = DRFPhoneNumberField(region="US", required=False, allow_null=True)
@@ -140,7 +196,12 @@ class CustomUserDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         exclude = ["profile_photo"]
-        read_only_fields = ["id"]
+        read_only_fields = [
+            "id",
+            "approved_at",
+            "review_claimed_by",
+            "review_claimed_until",
+        ]
 
     def to_internal_value(self, data):
         """
@@ -207,6 +268,21 @@ class CustomUserDetailSerializer(serializers.ModelSerializer):
         return f"data:image/{image_format};base64,{base64_data}"
 
 
+class CustomUserBootstrapSerializer(CustomUserDetailSerializer):
+    """
+    The signed-in user for /api/bootstrap/: the detail fields without the
+    inline base64 photo (fetch /api/users/me/ when has_photo is true), the
+    password hash or the Django permission lists, so it costs one query.
+    Expects `has_photo` to be annotated.
+    """
+
+    photo = None
+    has_photo = serializers.BooleanField(read_only=True)
+
+    class Meta(CustomUserDetailSerializer.Meta):
+        exclude = ["profile_photo", "password", "groups", "user_permissions"]
+
+
 class PasswordResetRequestSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
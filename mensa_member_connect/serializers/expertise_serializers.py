@@ -16,3 +16,20 @@ class ExpertiseDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Expertise
         fields = "__all__"
+
+
+# Item serializer for replacing a user's whole expertise set in one request
+class ExpertiseBulkItemSerializer(serializers.ModelSerializer):
+    # Present for rows being kept/updated, omitted for new rows
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Expertise
+        fields = [
+            "id",
+            "area_of_expertise",
+            "what_offering",
+            "who_would_benefit",
+            "why_choose_you",
+            "skills_not_offered",
+        ]
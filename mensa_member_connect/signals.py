@@ -0,0 +1,196 @@
+# mensa_member_connect/signals.py
+"""
+Model signal handlers that keep in-process snapshots, caches and
+denormalized counters in sync. Connected from MensaMemberConnectConfig.ready().
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.email_suppression import EmailSuppression
+from mensa_member_connect.models.expertise import Expertise
+from mensa_member_connect.models.inbox_counter import InboxCounter
+from mensa_member_connect.models.industry import Industry
+from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.utils.email_suppression import suppressed_emails
+from mensa_member_connect.utils.events import publish_connection_request
+from mensa_member_connect.utils.expert_vectors import schedule_expert_vector_update
+from mensa_member_connect.utils.local_group_resolver import local_group_resolver
+from mensa_member_connect.utils import reference_data
+from mensa_member_connect.utils.stats import invalidate_member_stats
+from mensa_member_connect.utils.suggest import schedule_keyword_refresh, suggest_index
+
+# CustomUser fields that feed the similar-experts vectors
+EXPERT_VECTOR_USER_FIELDS = {
+    "occupation",
+    "industry",
+    "industry_id",
+    "state",
+    "local_group",
+    "local_group_id",
+    "availability_status",
+}
+# ...and the attributes they are stored in, compared to detect real changes
+EXPERT_VECTOR_USER_ATTNAMES = (
+    "occupation",
+    "industry_id",
+    "state",
+    "local_group_id",
+    "availability_status",
+)
+
+# CustomUser fields that the member statistics group or filter on
+STATS_USER_FIELDS = {
+    "status",
+    "local_group",
+    "local_group_id",
+    "industry",
+    "industry_id",
+}
+
+
+@receiver(post_save, sender=EmailSuppression)
+@receiver(post_delete, sender=EmailSuppression)
+def invalidate_email_suppressions(sender, **kwargs):
+    transaction.on_commit(suppressed_emails.invalidate)
+
+
+def _inbox_state(conn_request) -> tuple:
+    # Read from __dict__ so deferred fields are not loaded
+    return (
+        conn_request.__dict__.get("seeker_id"),
+        conn_request.__dict__.get("expert_id"),
+        conn_request.__dict__.get("read_at") is None,
+    )
+
+
+@receiver(post_init, sender=ConnectionRequest)
+def remember_inbox_state(sender, instance, **kwargs):
+    instance._inbox_state = _inbox_state(instance)
+
+
+@receiver(post_save, sender=ConnectionRequest)
+def count_connection_request(sender, instance, created, **kwargs):
+    """
+    Count a new request for both sides, or move the counts when a save
+    changes its seeker, expert or read state (e.g. an edit of expert_id).
+    """
+    old_seeker_id, old_expert_id, was_unread = instance._inbox_state
+    seeker_id, expert_id, unread = instance._inbox_state = _inbox_state(instance)
+    if created:
+        InboxCounter.adjust(seeker_id, total_sent=1)
+        InboxCounter.adjust(
+            expert_id, total_received=1, unread_received=1 if unread else 0
+        )
+        publish_connection_request(instance)
+        return
+
+    if seeker_id != old_seeker_id:
+        InboxCounter.adjust(old_seeker_id, create=False, total_sent=-1)
+        InboxCounter.adjust(seeker_id, total_sent=1)
+    if expert_id != old_expert_id:
+        InboxCounter.adjust(
+            old_expert_id,
+            create=False,
+            total_received=-1,
+            unread_received=-1 if was_unread else 0,
+        )
+        InboxCounter.adjust(
+            expert_id, total_received=1, unread_received=1 if unread else 0
+        )
+    elif unread != was_unread:
+        InboxCounter.adjust(expert_id, unread_received=1 if unread else -1)
+
+
+@receiver(post_delete, sender=ConnectionRequest)
+def count_deleted_connection_request(sender, instance, **kwargs):
+    InboxCounter.adjust(instance.seeker_id, create=False, total_sent=-1)
+    InboxCounter.adjust(
+        instance.expert_id,
+        create=False,
+        total_received=-1,
+        unread_received=0 if instance.read_at else -1,
+    )
+
+
+@receiver(post_save, sender=Expertise)
+@receiver(post_delete, sender=Expertise)
+def refresh_expert_vector_for_expertise(sender, instance, **kwargs):
+    schedule_expert_vector_update(instance.user_id)
+
+
+def _expert_vector_state(user) -> tuple:
+    # Read from __dict__ so deferred fields are not loaded
+    return tuple(user.__dict__.get(attname) for attname in EXPERT_VECTOR_USER_ATTNAMES)
+
+
+@receiver(post_init, sender=CustomUser)
+def remember_expert_vector_state(sender, instance, **kwargs):
+    instance._expert_vector_state = _expert_vector_state(instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_expert_vector_for_user(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return  # new users have no expertise yet
+    if update_fields and not EXPERT_VECTOR_USER_FIELDS & set(update_fields):
+        return
+    state = _expert_vector_state(instance)
+    if state == instance._expert_vector_state:
+        return  # e.g. a status-only edit through the user serializer
+    instance._expert_vector_state = state
+    schedule_expert_vector_update(instance.id)
+
+
+@receiver(post_save, sender=Industry)
+@receiver(post_delete, sender=Industry)
+@receiver(post_save, sender=LocalGroup)
+@receiver(post_delete, sender=LocalGroup)
+def invalidate_suggest_index(sender, **kwargs):
+    transaction.on_commit(suggest_index.invalidate)
+
+
+@receiver(post_save, sender=Expertise)
+@receiver(post_delete, sender=Expertise)
+def refresh_suggest_keywords(sender, **kwargs):
+    transaction.on_commit(schedule_keyword_refresh)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_stats_on_user_save(sender, created, update_fields, **kwargs):
+    if update_fields and not STATS_USER_FIELDS & set(update_fields):
+        return  # e.g. last_login updates on sign-in
+    transaction.on_commit(invalidate_member_stats)
+
+
+@receiver(post_save, sender=Expertise)
+@receiver(post_save, sender=ConnectionRequest)
+def invalidate_stats_on_create(sender, created, **kwargs):
+    if created:
+        transaction.on_commit(invalidate_member_stats)
+
+
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=Expertise)
+@receiver(post_delete, sender=ConnectionRequest)
+@receiver(post_save, sender=Industry)
+@receiver(post_delete, sender=Industry)
+@receiver(post_save, sender=LocalGroup)
+@receiver(post_delete, sender=LocalGroup)
+def invalidate_stats(sender, **kwargs):
+    transaction.on_commit(invalidate_member_stats)
+
+
+@receiver(post_save, sender=Industry)
+@receiver(post_delete, sender=Industry)
+def invalidate_industry_reference(sender, **kwargs):
+    transaction.on_commit(reference_data.industries.invalidate)
+
+
+@receiver(post_save, sender=LocalGroup)
+@receiver(post_delete, sender=LocalGroup)
+def invalidate_local_group_reference(sender, **kwargs):
+    transaction.on_commit(reference_data.local_groups.invalidate)
+    transaction.on_commit(local_group_resolver.invalidate)
@@ -0,0 +1,21 @@
+# mensa_member_connect/tests/helpers.py
+from rest_framework.test import APIClient
+
+from mensa_member_connect.models.custom_user import CustomUser
+
+
+def make_user(email: str, role: str = "member", **fields) -> CustomUser:
+    return CustomUser.objects.create_user(
+        email=email,
+        password="test-password",
+        first_name=email.split("@")[0],
+        last_name="Tester",
+        role=role,
+        **fields,
+    )
+
+
+def client_for(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
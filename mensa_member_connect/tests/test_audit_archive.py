@@ -0,0 +1,116 @@
+# mensa_member_connect/tests/test_audit_archive.py
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from mensa_member_connect.models.admin_action import AdminAction
+from mensa_member_connect.tests.helpers import make_user
+from mensa_member_connect.utils.audit import archive_admin_actions
+
+
+def read_archive(directory) -> list:
+    rows = []
+    for path in sorted(Path(directory).glob("admin_actions-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            rows.extend(json.loads(line) for line in archive)
+    return rows
+
+
+class ArchiveAdminActionsTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.admin = make_user("admin@example.org", role="admin")
+        self.target = make_user("target@example.org")
+        self.old = [
+            self._action(datetime(2024, 1, 10, tzinfo=dt_timezone.utc), "pending"),
+            self._action(datetime(2024, 1, 20, tzinfo=dt_timezone.utc), "active"),
+            self._action(datetime(2024, 2, 5, tzinfo=dt_timezone.utc), "pending"),
+        ]
+        self.recent = self._action(timezone.now(), "active")
+
+    def _action(self, created_at, new_value):
+        action = AdminAction.field_change(
+            self.admin,
+            self.target,
+            AdminAction.TYPE_STATUS_CHANGE,
+            "status",
+            "x",
+            new_value,
+        )
+        action.save()
+        AdminAction.objects.filter(pk=action.pk).update(created_at=created_at)
+        return action
+
+    def _archive(self, **kwargs):
+        return archive_admin_actions(
+            retention_days=30, directory=self.directory, batch_size=2, **kwargs
+        )
+
+    def test_old_rows_are_archived_by_month_and_deleted(self):
+        self.assertEqual(self._archive(), 3)
+        rows = read_archive(self.directory)
+        self.assertEqual([row["id"] for row in rows], [a.id for a in self.old])
+        self.assertEqual(rows[0]["target_user__email"], "target@example.org")
+        self.assertEqual(rows[2]["new_value"], "pending")
+        names = sorted(path.name for path in Path(self.directory).iterdir())
+        self.assertEqual(
+            names,
+            [
+                f"admin_actions-2024-01-{self.old[0].id}-{self.old[1].id}.jsonl.gz",
+                f"admin_actions-2024-02-{self.old[2].id}-{self.old[2].id}.jsonl.gz",
+            ],
+        )
+        self.assertEqual(list(AdminAction.objects.all()), [self.recent])
+
+    def test_rows_are_written_before_they_are_deleted(self):
+        with mock.patch(
+            "mensa_member_connect.utils.audit.os.replace",
+            side_effect=OSError("disk full"),
+        ):
+            with self.assertRaises(OSError):
+                self._archive()
+        self.assertEqual(AdminAction.objects.count(), 4)
+        self.assertEqual(read_archive(self.directory), [])
+
+    def test_rerun_after_interruption_does_not_duplicate(self):
+        with mock.patch(
+            "django.db.models.query.QuerySet.delete",
+            side_effect=RuntimeError("killed"),
+        ):
+            with self.assertRaises(RuntimeError):
+                self._archive()
+        # The first batch is on disk but still in the table
+        self.assertEqual(len(read_archive(self.directory)), 2)
+        self.assertEqual(AdminAction.objects.count(), 4)
+
+        self.assertEqual(self._archive(), 1)
+        self.assertEqual(
+            [row["id"] for row in read_archive(self.directory)],
+            [a.id for a in self.old],
+        )
+        self.assertEqual(list(AdminAction.objects.all()), [self.recent])
+        self.assertEqual(self._archive(), 0)
+
+    def test_deleting_a_user_keeps_their_audit_rows(self):
+        self.target.delete()
+        self.assertEqual(AdminAction.objects.count(), 4)
+        self.assertFalse(AdminAction.objects.filter(target_user__isnull=False).exists())
+
+    def test_command_reports_the_count(self):
+        out = mock.MagicMock()
+        call_command(
+            "archive_admin_actions",
+            retention_days=30,
+            output_dir=self.directory,
+            stdout=out,
+        )
+        self.assertIn("Archived 3 admin actions.", str(out.write.call_args))
@@ -0,0 +1,112 @@
+# mensa_member_connect/tests/test_batch.py
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from mensa_member_connect.models.admin_action import AdminAction
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.tests.helpers import make_user
+
+URL = "/api/batch/"
+
+
+def jwt_client(user) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.member = make_user("member@example.org", status="active")
+        self.admin = make_user("admin@example.org", role="admin", status="active")
+        self.pending = make_user("pending@example.org", status="pending")
+
+    def _batch(self, client, *items):
+        response = client.post(URL, {"requests": list(items)}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data["responses"]
+
+    def test_each_sub_request_gets_its_own_status(self):
+        responses = self._batch(
+            jwt_client(self.member),
+            {"method": "GET", "path": "/api/users/me/"},
+            {
+                "method": "POST",
+                "path": "/api/users/bulk_status/",
+                "body": {"ids": [self.pending.id], "status": "active"},
+            },
+            {"method": "GET", "path": "/api/no-such-endpoint/"},
+            {"method": "POST", "path": URL, "body": {"requests": []}},
+        )
+        self.assertEqual([item["status"] for item in responses], [200, 403, 404, 400])
+        self.assertEqual(responses[0]["body"]["email"], self.member.email)
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, "pending")
+
+    def test_sub_requests_run_as_the_caller(self):
+        responses = self._batch(
+            jwt_client(self.admin),
+            {"method": "GET", "path": "/api/users/me/"},
+            {
+                "method": "POST",
+                "path": "/api/users/bulk_status/",
+                "body": {"ids": [self.pending.id], "status": "active"},
+            },
+        )
+        self.assertEqual([item["status"] for item in responses], [200, 200])
+        self.assertEqual(responses[0]["body"]["email"], self.admin.email)
+
+    def test_caller_is_loaded_once_per_batch(self):
+        user_lookup = (
+            f'FROM "{CustomUser._meta.db_table}" WHERE '
+            f'"{CustomUser._meta.db_table}"."id" = {self.member.id}'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            responses = self._batch(
+                jwt_client(self.member),
+                *[{"method": "GET", "path": "/api/users/me/"}] * 3,
+            )
+        self.assertEqual([item["status"] for item in responses], [200] * 3)
+        lookups = [
+            query["sql"]
+            for query in queries.captured_queries
+            if user_lookup in query["sql"]
+        ]
+        self.assertEqual(len(lookups), 1, lookups)
+
+    def test_sub_requests_share_the_batch_request_id(self):
+        client = jwt_client(self.admin)
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+            HTTP_X_REQUEST_ID="batch-123",
+        )
+        self._batch(
+            client,
+            {
+                "method": "POST",
+                "path": "/api/users/bulk_status/",
+                "body": {"ids": [self.pending.id], "status": "active"},
+            },
+        )
+        self.assertEqual(
+            list(AdminAction.objects.values_list("request_id", flat=True)),
+            ["batch-123"],
+        )
+
+    def test_invalid_batches_are_rejected(self):
+        client = jwt_client(self.member)
+        for payload in (
+            {"requests": []},
+            {"requests": [{"method": "GET", "path": "/admin/"}]},
+            {"requests": [{"method": "GET", "path": "/api/users/me/"}] * 21},
+        ):
+            response = client.post(URL, payload, format="json")
+            self.assertEqual(response.status_code, 400, payload)
+
+    def test_anonymous_callers_are_refused(self):
+        payload = {"requests": [{"method": "GET", "path": "/api/users/me/"}]}
+        response = APIClient().post(URL, payload, format="json")
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,77 @@
+# mensa_member_connect/tests/test_bulk_status.py
+from django.test import TestCase
+
+from mensa_member_connect.models.admin_action import AdminAction
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.queued_email import QueuedEmail
+from mensa_member_connect.tests.helpers import client_for, make_user
+
+URL = "/api/users/bulk_status/"
+
+
+class BulkStatusTests(TestCase):
+    def setUp(self):
+        self.admin = make_user("admin@example.org", role="admin", status="active")
+        self.pending = make_user("pending@example.org", status="pending")
+        self.active = make_user("active@example.org", status="active")
+        self.client = client_for(self.admin)
+
+    def test_unknown_status_is_rejected(self):
+        response = self.client.post(
+            URL, {"ids": [self.pending.id], "status": "bogus-status"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.data)
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, "pending")
+        self.assertFalse(AdminAction.objects.exists())
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_ids_are_validated(self):
+        for ids in ([], [0], ["x"], list(range(1, 502))):
+            response = self.client.post(
+                URL, {"ids": ids, "status": "active"}, format="json"
+            )
+            self.assertEqual(response.status_code, 400, ids)
+
+    def test_approving_reports_updated_unchanged_and_not_found(self):
+        response = self.client.post(
+            URL,
+            {"ids": [self.pending.id, self.active.id, 999999], "status": "active"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], [self.pending.id])
+        self.assertEqual(response.data["unchanged"], [self.active.id])
+        self.assertEqual(response.data["not_found"], [999999])
+
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, CustomUser.STATUS_ACTIVE)
+        self.assertIsNotNone(self.pending.approved_at)
+        self.assertEqual(
+            AdminAction.objects.filter(
+                target_user=self.pending, action_type=AdminAction.TYPE_STATUS_CHANGE
+            ).count(),
+            1,
+        )
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(queued.sender, "notify_user_approval")
+        self.assertEqual(queued.args[0], self.pending.email)
+        self.assertIsNone(queued.sent_at)
+
+    def test_rejecting_queues_no_email(self):
+        response = self.client.post(
+            URL, {"ids": [self.pending.id], "status": "rejected"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], [self.pending.id])
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, CustomUser.STATUS_REJECTED)
+        self.assertIsNone(self.pending.approved_at)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_members_are_refused(self):
+        response = client_for(self.pending).post(
+            URL, {"ids": [self.pending.id], "status": "active"}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
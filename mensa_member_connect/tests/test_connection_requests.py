@@ -0,0 +1,185 @@
+# mensa_member_connect/tests/test_connection_requests.py
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.tests.helpers import client_for, make_user
+
+URL = "/api/connection_requests/"
+NOTIFY = "mensa_member_connect.views.connection_request_views.notify_expert_new_message"
+
+
+@override_settings(CONNECTION_REQUEST_DUPLICATE_WINDOW=timedelta(hours=24))
+class DuplicateConnectionRequestTests(TestCase):
+    def setUp(self):
+        cache.clear()  # throttle history
+        self.seeker = make_user("seeker@example.org", status="active")
+        self.expert = make_user("expert@example.org", status="active")
+        self.client = client_for(self.seeker)
+        notify = mock.patch(NOTIFY)
+        notify.start()
+        self.addCleanup(notify.stop)
+
+    def _send(self, message, expert=None):
+        return self.client.post(
+            URL,
+            {"expert_id": (expert or self.expert).id, "message": message},
+            format="json",
+        )
+
+    def test_identical_message_within_window_is_rejected(self):
+        self.assertEqual(self._send("Could we talk about  Rust?").status_code, 201)
+        response = self._send("could we talk about rust?")  # normalized equal
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("message", response.data)
+        self.assertEqual(ConnectionRequest.objects.count(), 1)
+
+    def test_same_message_after_window_is_accepted(self):
+        self.assertEqual(self._send("Hello").status_code, 201)
+        ConnectionRequest.objects.update(
+            created_at=ConnectionRequest.objects.get().created_at - timedelta(hours=25)
+        )
+        self.assertEqual(self._send("Hello").status_code, 201)
+
+    def test_different_message_or_expert_is_accepted(self):
+        other_expert = make_user("other-expert@example.org", status="active")
+        self.assertEqual(self._send("Hello").status_code, 201)
+        self.assertEqual(self._send("Hello again").status_code, 201)
+        self.assertEqual(self._send("Hello", expert=other_expert).status_code, 201)
+
+    def test_fingerprint_is_not_exposed(self):
+        response = self._send("Hello")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("message_fingerprint", response.data)
+        detail = self.client.get(f"{URL}{response.data['id']}/")
+        self.assertEqual(detail.status_code, 200)
+        self.assertNotIn("message_fingerprint", detail.data)
+
+
+class InboxCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seeker = make_user("seeker@example.org", status="active")
+        self.expert = make_user("expert@example.org", status="active")
+        self.expert_client = client_for(self.expert)
+
+    def _request(self, message="Hello"):
+        return ConnectionRequest.objects.create(
+            seeker=self.seeker, expert=self.expert, message=message
+        )
+
+    def _summary(self, user):
+        response = client_for(user).get(f"{URL}summary/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_creating_requests_counts_both_sides(self):
+        self._request("one")
+        self._request("two")
+        self.assertEqual(
+            self._summary(self.expert),
+            {"unread_count": 2, "total_received": 2, "total_sent": 0},
+        )
+        self.assertEqual(
+            self._summary(self.seeker),
+            {"unread_count": 0, "total_received": 0, "total_sent": 2},
+        )
+
+    def test_marking_read_decrements_unread_once(self):
+        conn_request = self._request()
+        self._request("other")
+        for _ in range(2):  # repeating the call must not count twice
+            response = self.expert_client.post(f"{URL}{conn_request.id}/read/")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["unread_count"], 1)
+
+        response = self.expert_client.post(f"{URL}read_all/")
+        self.assertEqual(response.data["unread_count"], 0)
+        self.assertEqual(response.data["total_received"], 2)
+
+    def test_only_the_expert_can_mark_read(self):
+        conn_request = self._request()
+        response = client_for(self.seeker).post(f"{URL}{conn_request.id}/read/")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self._summary(self.expert)["unread_count"], 1)
+
+    def test_deleting_requests_reverses_the_counts(self):
+        unread = self._request("unread")
+        read = self._request("read")
+        self.expert_client.post(f"{URL}{read.id}/read/")
+
+        read.refresh_from_db()
+        read.delete()
+        unread.delete()
+        self.assertEqual(
+            self._summary(self.expert),
+            {"unread_count": 0, "total_received": 0, "total_sent": 0},
+        )
+        self.assertEqual(self._summary(self.seeker)["total_sent"], 0)
+
+    def test_changing_the_expert_moves_the_counts(self):
+        other = make_user("other@example.org", status="active")
+        conn_request = self._request()
+        read = self._request("read")
+        self.expert_client.post(f"{URL}{read.id}/read/")
+
+        conn_request.expert = other
+        conn_request.save()
+        read.refresh_from_db()
+        read.expert = other
+        read.save()
+        self.assertEqual(
+            self._summary(self.expert),
+            {"unread_count": 0, "total_received": 0, "total_sent": 0},
+        )
+        self.assertEqual(
+            self._summary(other),
+            {"unread_count": 1, "total_received": 2, "total_sent": 0},
+        )
+        self.assertEqual(self._summary(self.seeker)["total_sent"], 2)
+
+    def test_saving_without_changes_keeps_the_counts(self):
+        conn_request = self._request()
+        conn_request.message = "Edited"
+        conn_request.save()
+        ConnectionRequest.objects.get(pk=conn_request.pk).save()
+        self.assertEqual(
+            self._summary(self.expert),
+            {"unread_count": 1, "total_received": 1, "total_sent": 0},
+        )
+
+
+class ConnectionRequestAccessTests(TestCase):
+    def setUp(self):
+        self.seeker = make_user("seeker@example.org", status="active")
+        self.expert = make_user("expert@example.org", status="active")
+        self.admin = make_user("admin@example.org", role="admin", status="active")
+        self.conn_request = ConnectionRequest.objects.create(
+            seeker=self.seeker, expert=self.expert, message="Hello"
+        )
+        self.detail_url = f"{URL}{self.conn_request.id}/"
+
+    def test_participants_can_read_but_not_change_a_request(self):
+        for user in (self.seeker, self.expert):
+            client = client_for(user)
+            self.assertEqual(client.get(self.detail_url).status_code, 200)
+            response = client.patch(self.detail_url, {"message": "Edited"})
+            self.assertEqual(response.status_code, 403)
+            self.assertEqual(client.delete(self.detail_url).status_code, 403)
+        self.conn_request.refresh_from_db()
+        self.assertEqual(self.conn_request.message, "Hello")
+
+    def test_admins_can_change_and_delete_any_request(self):
+        client = client_for(self.admin)
+        response = client.patch(self.detail_url, {"message": "Edited"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.delete(self.detail_url).status_code, 204)
+        self.assertFalse(ConnectionRequest.objects.exists())
+
+    def test_invalid_box_lists_the_accepted_values(self):
+        response = client_for(self.seeker).get(URL, {"box": "all"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("'all'", str(response.data["box"]))
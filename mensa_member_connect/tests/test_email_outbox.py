@@ -0,0 +1,71 @@
+# mensa_member_connect/tests/test_email_outbox.py
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from mensa_member_connect.models.queued_email import QueuedEmail
+from mensa_member_connect.utils import email_utils
+from mensa_member_connect.utils.email_utils import (
+    deliver_queued_email,
+    notify_user_approval,
+    queue_emails,
+    send_queued_emails,
+)
+
+SMTP = "mensa_member_connect.utils.email_utils.send_email_via_smtp"
+
+
+@override_settings(EMAIL_QUEUE_MAX_ATTEMPTS=2)
+@mock.patch.dict("os.environ", {"USE_MAILGUN_API": "false"})
+class EmailOutboxTests(TestCase):
+    def _queue(self, email="new@example.org"):
+        with self.captureOnCommitCallbacks() as callbacks:
+            queue_emails(
+                notify_user_approval,
+                [((email, "New Member"), {"first_name": "New"})],
+            )
+        self.assertEqual(len(callbacks), 1)  # the background hand-off
+        return QueuedEmail.objects.get(args__0=email)
+
+    def test_queued_email_is_stored_until_sent(self):
+        queued = self._queue()
+        self.assertIsNone(queued.sent_at)
+        self.assertEqual(queued.kwargs, {"first_name": "New"})
+
+        self.assertTrue(deliver_queued_email(queued.id))
+        queued.refresh_from_db()
+        self.assertIsNotNone(queued.sent_at)
+        self.assertEqual(queued.attempts, 1)
+        self.assertEqual([m.to for m in mail.outbox], [["new@example.org"]])
+        # Sent emails are never sent again
+        self.assertFalse(deliver_queued_email(queued.id))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failed_send_is_retried_later(self):
+        queued = self._queue()
+        with mock.patch(SMTP, side_effect=OSError("connection refused")):
+            self.assertFalse(deliver_queued_email(queued.id))
+        queued.refresh_from_db()
+        self.assertIsNone(queued.sent_at)
+        self.assertTrue(queued.last_error)
+        self.assertGreater(queued.next_attempt_at, timezone.now())
+        self.assertEqual(send_queued_emails(), (0, 0))  # not due yet
+
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        call_command("send_queued_emails", stdout=mock.MagicMock())
+        queued.refresh_from_db()
+        self.assertIsNotNone(queued.sent_at)
+        self.assertEqual(queued.attempts, 2)
+
+    def test_retries_stop_after_max_attempts(self):
+        queued = self._queue()
+        QueuedEmail.objects.filter(pk=queued.pk).update(attempts=2)
+        self.assertEqual(send_queued_emails(), (0, 0))
+
+    def test_only_registered_senders_can_be_queued(self):
+        with self.assertRaises(ValueError):
+            queue_emails(email_utils.notify_user_registration, [((), {})])
+        self.assertFalse(QueuedEmail.objects.exists())
@@ -0,0 +1,90 @@
+# mensa_member_connect/tests/test_email_webhook.py
+import hashlib
+import hmac
+import os
+import time
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from mensa_member_connect.models.email_suppression import EmailSuppression
+from mensa_member_connect.tests.helpers import make_user
+from mensa_member_connect.utils.email_suppression import suppressed_emails
+
+URL = "/api/email/events/"
+SIGNING_KEY = "test-signing-key"
+
+
+def signature(key=SIGNING_KEY) -> dict:
+    timestamp, token = str(int(time.time())), "token-123"
+    digest = hmac.new(
+        key.encode("utf-8"), f"{timestamp}{token}".encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    return {"timestamp": timestamp, "token": token, "signature": digest}
+
+
+@override_settings(MAILGUN_WEBHOOK_SIGNING_KEY=SIGNING_KEY)
+class MailgunEventWebhookTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_non_object_bodies_are_rejected(self):
+        for body in ([signature()], "signature", 42):
+            response = self.client.post(URL, body, format="json")
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_invalid_signature_is_refused(self):
+        payload = {
+            "signature": signature(key="wrong"),
+            "event-data": {"event": "complained", "recipient": "a@example.org"},
+        }
+        response = self.client.post(URL, payload, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(EmailSuppression.objects.exists())
+
+    def test_permanent_failures_and_complaints_are_suppressed(self):
+        payload = {
+            "signature": signature(),
+            "items": [
+                {"event": "failed", "severity": "permanent", "recipient": "A@x.org"},
+                {"event": "failed", "severity": "temporary", "recipient": "b@x.org"},
+                {"event": "complained", "recipient": "c@x.org"},
+            ],
+        }
+        response = self.client.post(URL, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"received": 3, "suppressed": 2})
+        self.assertEqual(
+            set(EmailSuppression.objects.values_list("email", flat=True)),
+            {"a@x.org", "c@x.org"},
+        )
+
+
+@mock.patch.dict(os.environ, {"USE_MAILGUN_API": "False"})
+class SuppressedPasswordResetTests(TestCase):
+    URL = "/api/users/password-reset-request/"
+
+    def setUp(self):
+        make_user("member@example.org", status="active")
+        self.addCleanup(suppressed_emails.invalidate)
+
+    def test_reset_email_is_sent_to_deliverable_addresses(self):
+        response = APIClient().post(
+            self.URL, {"email": "member@example.org"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_suppressed_address_gets_no_reset_email(self):
+        EmailSuppression.objects.create(
+            email="member@example.org", reason=EmailSuppression.REASON_BOUNCE
+        )
+        suppressed_emails.invalidate()
+        response = APIClient().post(
+            self.URL, {"email": "member@example.org"}, format="json"
+        )
+        # Same answer as for any other address, so nothing is revealed
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,117 @@
+# mensa_member_connect/tests/test_event_stream.py
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from mensa_member_connect.tests.helpers import client_for, make_user
+from mensa_member_connect.utils.events import broker
+
+STREAM_URL = "/api/connection_requests/stream/"
+TICKET_URL = "/api/connection_requests/stream/ticket/"
+
+
+class StreamTicketTests(TestCase):
+    def setUp(self):
+        cache.clear()  # used tickets
+        self.member = make_user("member@example.org", status="active")
+
+    def _ticket(self):
+        response = client_for(self.member).post(TICKET_URL)
+        self.assertEqual(response.status_code, 200)
+        return response.data["ticket"]
+
+    def test_ticket_requires_authentication(self):
+        self.assertEqual(APIClient().post(TICKET_URL).status_code, 401)
+
+    def test_ticket_is_not_an_access_token(self):
+        ticket = self._ticket()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {ticket}")
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
+
+    async def test_stream_opens_with_a_ticket(self):
+        ticket = await sync_to_async(self._ticket)()
+        response = await AsyncClient().get(STREAM_URL, {"ticket": ticket})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = response.streaming_content
+        self.assertEqual(await anext(content), b"retry: 5000\n\n")
+        await content.aclose()
+
+    async def test_ticket_is_single_use(self):
+        ticket = await sync_to_async(self._ticket)()
+        first = await AsyncClient().get(STREAM_URL, {"ticket": ticket})
+        await first.streaming_content.aclose()
+        second = await AsyncClient().get(STREAM_URL, {"ticket": ticket})
+        self.assertEqual(second.status_code, 401)
+
+    async def test_access_token_in_the_query_string_is_refused(self):
+        token = str(AccessToken.for_user(self.member))
+        response = await AsyncClient().get(STREAM_URL, {"token": token})
+        self.assertEqual(response.status_code, 401)
+        response = await AsyncClient().get(STREAM_URL, {"ticket": token})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_accepts_an_authorization_header(self):
+        token = str(AccessToken.for_user(self.member))
+        response = await AsyncClient().get(
+            STREAM_URL, headers={"authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        await response.streaming_content.aclose()
+
+    async def test_stream_requires_credentials(self):
+        response = await AsyncClient().get(STREAM_URL)
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_is_refused_under_wsgi(self):
+        response = self.client.get(STREAM_URL, {"ticket": self._ticket()})
+        self.assertEqual(response.status_code, 501)
+
+
+class InProcessBrokerTests(TestCase):
+    """
+    The non-PostgreSQL path: events are dispatched after commit.
+    """
+
+    def setUp(self):
+        self.expert = make_user("expert@example.org", status="active")
+
+    def _publish(self, rollback=False):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    broker.publish(self.expert.id, {"type": "ping"})
+                    if rollback:
+                        raise RuntimeError("rolled back")
+            except RuntimeError:
+                pass
+
+    async def test_event_reaches_the_stream_after_commit(self):
+        token = str(AccessToken.for_user(self.expert))
+        response = await AsyncClient().get(
+            STREAM_URL, headers={"authorization": f"Bearer {token}"}
+        )
+        content = response.streaming_content
+        await anext(content)  # retry hint; the stream is now subscribed
+        await sync_to_async(self._publish)()
+        chunk = await asyncio.wait_for(anext(content), timeout=1)
+        self.assertTrue(chunk.startswith(b"event: ping\n"))
+        await content.aclose()
+
+    async def test_rolled_back_events_are_not_delivered(self):
+        queue = broker.subscribe(self.expert.id)
+        try:
+            await sync_to_async(self._publish)(rollback=True)
+            await asyncio.sleep(0)
+            self.assertTrue(queue.empty())
+            await sync_to_async(self._publish)()
+            event = await asyncio.wait_for(queue.get(), timeout=1)
+            self.assertEqual(event, {"type": "ping"})
+        finally:
+            broker.unsubscribe(self.expert.id, queue)
@@ -0,0 +1,112 @@
+# mensa_member_connect/tests/test_expert_vectors.py
+import json
+import tempfile
+import threading
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+
+from mensa_member_connect.models.expertise import Expertise
+from mensa_member_connect.tests.helpers import make_user
+from mensa_member_connect.utils import expert_vectors
+
+UPDATE = "mensa_member_connect.utils.expert_vectors.update_expert_vector"
+
+
+class ScheduleExpertVectorUpdateTests(TestCase):
+    def test_rolled_back_update_does_not_block_later_updates(self):
+        with mock.patch(UPDATE) as update:
+            try:
+                with transaction.atomic():
+                    expert_vectors.schedule_expert_vector_update(42)
+                    raise RuntimeError("roll back")
+            except RuntimeError:
+                pass
+
+            with self.captureOnCommitCallbacks(execute=True):
+                expert_vectors.schedule_expert_vector_update(42)
+
+        update.assert_called_once_with(42)
+
+    def test_repeated_calls_in_one_transaction_run_once(self):
+        with mock.patch(UPDATE) as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                expert_vectors.schedule_expert_vector_update(42)
+                expert_vectors.schedule_expert_vector_update(42)
+                expert_vectors.schedule_expert_vector_update(43)
+
+        self.assertEqual(update.call_args_list, [mock.call(42), mock.call(43)])
+
+    def test_pending_update_in_another_transaction_does_not_suppress(self):
+        def other_thread():
+            try:
+                expert_vectors.schedule_expert_vector_update(42)
+            finally:
+                connection.close()
+
+        with mock.patch(UPDATE) as update:
+            with self.captureOnCommitCallbacks(execute=False):
+                expert_vectors.schedule_expert_vector_update(42)
+                thread = threading.Thread(target=other_thread)
+                thread.start()
+                thread.join()
+
+        # The other thread autocommits, so its update runs immediately
+        update.assert_called_once_with(42)
+
+
+class ExpertVectorSignalTests(TestCase):
+    def setUp(self):
+        self.user = make_user("expert@example.org", occupation="Chemist")
+
+    def test_status_only_save_does_not_schedule(self):
+        with mock.patch(UPDATE) as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.status = "active"
+                self.user.save()
+        update.assert_not_called()
+
+    def test_vectorised_field_change_schedules(self):
+        with mock.patch(UPDATE) as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.occupation = "Physicist"
+                self.user.save()
+        update.assert_called_once_with(self.user.id)
+
+
+class UpdateExpertVectorTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings_override = override_settings(EXPERT_VECTORS_DIR=self.directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        expert_vectors._loaded.reset()
+        self.addCleanup(expert_vectors._loaded.reset)
+
+        for email in ("a@example.org", "b@example.org"):
+            Expertise.objects.create(
+                user=make_user(email), what_offering="organic chemistry tutoring"
+            )
+
+    def _manifest(self):
+        with open(f"{self.directory.name}/manifest.json", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_new_expert_fills_a_spare_row_in_place(self):
+        with mock.patch(UPDATE):
+            expert_vectors.build_index(dims=64)
+            newcomer = make_user("c@example.org")
+            Expertise.objects.create(
+                user=newcomer, what_offering="organic chemistry lessons"
+            )
+        before = self._manifest()
+
+        expert_vectors.update_expert_vector(newcomer.id)
+
+        after = self._manifest()
+        self.assertEqual(after["generation"], before["generation"])
+        self.assertEqual(after["experts"], before["experts"] + 1)
+        similar = dict(expert_vectors.similar_experts(newcomer.id, k=5))
+        self.assertEqual(len(similar), 2)
@@ -0,0 +1,96 @@
+# mensa_member_connect/tests/test_expertise_views.py
+from unittest import mock
+
+from django.test import TestCase
+
+from mensa_member_connect.models.expertise import Expertise
+from mensa_member_connect.tests.helpers import client_for, make_user
+
+
+class ReplaceByUserInvalidationTests(TestCase):
+    def setUp(self):
+        self.user = make_user("expert@example.org")
+        self.client = client_for(self.user)
+        self.url = f"/api/expertises/by_user/{self.user.id}/"
+
+    def test_bulk_put_schedules_keyword_refresh_on_commit(self):
+        target = "mensa_member_connect.views.expertise_views.schedule_keyword_refresh"
+        with mock.patch(target) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.put(
+                    self.url, [{"what_offering": "Rust mentoring"}], format="json"
+                )
+        self.assertEqual(response.status_code, 200)
+        refresh.assert_called_once_with()
+
+    def test_bulk_put_creating_expertise_invalidates_stats(self):
+        target = "mensa_member_connect.views.expertise_views.invalidate_member_stats"
+        with mock.patch(target) as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.put(
+                    self.url, [{"what_offering": "Rust mentoring"}], format="json"
+                )
+        invalidate.assert_called_once_with()
+
+
+class ReplaceByUserTests(TestCase):
+    def setUp(self):
+        self.user = make_user("expert@example.org")
+        self.client = client_for(self.user)
+        self.url = f"/api/expertises/by_user/{self.user.id}/"
+        self.kept = Expertise.objects.create(user=self.user, what_offering="Keep me")
+        self.dropped = Expertise.objects.create(user=self.user, what_offering="Drop me")
+
+    def _put(self, items, client=None, url=None):
+        return (client or self.client).put(url or self.url, items, format="json")
+
+    def test_updates_creates_and_deletes_in_one_request(self):
+        response = self._put(
+            [
+                {"id": self.kept.id, "what_offering": "Kept and edited"},
+                {"what_offering": "Brand new"},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(item["what_offering"] for item in response.data),
+            ["Brand new", "Kept and edited"],
+        )
+        self.assertEqual(
+            sorted(self.user.expertises.values_list("what_offering", flat=True)),
+            ["Brand new", "Kept and edited"],
+        )
+        self.assertFalse(Expertise.objects.filter(id=self.dropped.id).exists())
+
+    def test_empty_list_removes_everything(self):
+        self.assertEqual(self._put([]).status_code, 200)
+        self.assertFalse(self.user.expertises.exists())
+
+    def test_invalid_ids_change_nothing(self):
+        other = make_user("other@example.org")
+        foreign = Expertise.objects.create(user=other, what_offering="Not yours")
+        for items in (
+            [{"id": foreign.id, "what_offering": "Stolen"}],
+            [{"id": self.kept.id}, {"id": self.kept.id}],
+        ):
+            response = self._put(items)
+            self.assertEqual(response.status_code, 400, items)
+        self.assertEqual(self.user.expertises.count(), 2)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.what_offering, "Not yours")
+
+    def test_only_the_owner_or_an_admin_may_replace(self):
+        other = make_user("other@example.org")
+        response = self._put([], client=client_for(other))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.user.expertises.count(), 2)
+
+        admin = make_user("admin@example.org", role="admin")
+        self.assertEqual(self._put([], client=client_for(admin)).status_code, 200)
+        self.assertFalse(self.user.expertises.exists())
+
+    def test_non_numeric_user_id_is_not_found(self):
+        for user_id in ("abc", "1.5", "999999"):
+            response = self._put([], url=f"/api/expertises/by_user/{user_id}/")
+            self.assertEqual(response.status_code, 404, user_id)
+        self.assertEqual(self.user.expertises.count(), 2)
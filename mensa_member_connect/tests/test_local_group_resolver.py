@@ -0,0 +1,71 @@
+# mensa_member_connect/tests/test_local_group_resolver.py
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.utils.local_group_resolver import LocalGroupResolver
+
+
+class LocalGroupResolverTests(SimpleTestCase):
+    def setUp(self):
+        # Group id 123 and group number "123" belong to different groups
+        self.by_id = LocalGroup(id=123, group_name="Central Ohio", group_number="094")
+        self.by_number = LocalGroup(id=7, group_name="Gulf Coast", group_number="123")
+        self.resolver = LocalGroupResolver([self.by_id, self.by_number])
+
+    def test_digit_strings_are_ids(self):
+        self.assertIs(self.resolver.resolve("123"), self.by_id)
+        self.assertIs(self.resolver.resolve(" 7 "), self.by_number)
+        self.assertIs(self.resolver.resolve(123), self.by_id)
+        self.assertIsNone(self.resolver.resolve("094"))  # no group with id 94
+
+    def test_group_numbers_only_through_resolve_number(self):
+        self.assertIs(self.resolver.resolve_number("123"), self.by_number)
+        self.assertIs(self.resolver.resolve_number(" 094 "), self.by_id)
+        self.assertIsNone(self.resolver.resolve_number("7"))
+        self.assertIsNone(self.resolver.resolve_number(None))
+
+    def test_names_ignore_case_and_whitespace(self):
+        self.assertIs(self.resolver.resolve("  gulf   COAST "), self.by_number)
+        self.assertIsNone(self.resolver.resolve(True))
+        self.assertIsNone(self.resolver.resolve(None))
+
+
+class RegistrationLocalGroupTests(TestCase):
+    def setUp(self):
+        self.group = LocalGroup.objects.create(
+            id=150, group_name="Central Ohio", group_number="094"
+        )
+        self.other = LocalGroup.objects.create(
+            id=3, group_name="Gulf Coast", group_number="150"
+        )
+
+    def register(self, email, **fields):
+        return APIClient().post(
+            "/api/users/register/",
+            {
+                "email": email,
+                "first_name": "New",
+                "last_name": "Member",
+                "password": "aLongEnoughPassw0rd!",
+                **fields,
+            },
+            format="json",
+        )
+
+    def test_string_id_of_three_digits_is_an_id(self):
+        response = self.register("a@example.com", local_group="150")
+        self.assertEqual(response.status_code, 201, response.data)
+        user = CustomUser.objects.get(email="a@example.com")
+        self.assertEqual(user.local_group, self.group)
+
+    def test_group_number_is_its_own_field(self):
+        response = self.register("b@example.com", local_group_number="150")
+        self.assertEqual(response.status_code, 201, response.data)
+        user = CustomUser.objects.get(email="b@example.com")
+        self.assertEqual(user.local_group, self.other)
+
+    def test_unknown_group_number_is_rejected(self):
+        response = self.register("c@example.com", local_group_number="999")
+        self.assertEqual(response.status_code, 400)
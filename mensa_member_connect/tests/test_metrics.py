@@ -0,0 +1,82 @@
+# mensa_member_connect/tests/test_metrics.py
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from mensa_member_connect.utils import metrics
+
+TEST_COUNTER = metrics.Counter("mmc_test_events", "Test counter.", labelnames=("kind",))
+
+
+def _exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _exited_worker():
+    return socket.gethostname(), _exited_pid(), "1"
+
+
+class WorkerMergeTests(SimpleTestCase):
+    def setUp(self):
+        TEST_COUNTER.clear()
+        self.addCleanup(TEST_COUNTER.clear)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+
+    def _write_worker(self, worker, value):
+        state = {"mmc_test_events": [[["a"], value]]}
+        host, pid, started = worker
+        path = self.directory / f"metrics-{host}-{pid}-{started}.json"
+        path.write_text(json.dumps(state))
+
+    def _total(self):
+        for line in metrics.render_prometheus(self.directory).splitlines():
+            if line.startswith('mmc_test_events_total{kind="a"}'):
+                return float(line.split()[-1])
+        return None
+
+    def test_live_and_exited_workers_are_summed_without_drops(self):
+        TEST_COUNTER.inc(kind="a")
+        self._write_worker(_exited_worker(), 5)
+
+        self.assertEqual(self._total(), 6)
+        # The exited worker was folded into dead-workers.json, not dropped
+        self.assertEqual(len(list(self.directory.glob("metrics-*.json"))), 0)
+        self.assertTrue((self.directory / metrics.DEAD_WORKERS_NAME).exists())
+        self.assertEqual(self._total(), 6)
+
+        self._write_worker(_exited_worker(), 2)
+        self.assertEqual(self._total(), 8)
+
+    def test_reused_pid_does_not_keep_an_exited_worker_alive(self):
+        parent = os.getppid()
+        host, _, started = metrics._worker_id(parent)
+        self._write_worker((host, parent, started), 5)
+        self._write_worker((host, parent, started + "0"), 2)
+
+        self.assertEqual(self._total(), 7)
+        remaining = list(self.directory.glob("metrics-*.json"))
+        self.assertEqual(len(remaining), 1)
+        self.assertTrue(remaining[0].stem.endswith(f"-{parent}-{started}"))
+
+    def test_other_hosts_workers_are_summed_but_not_folded(self):
+        self._write_worker(("other.host-1", _exited_pid(), "1"), 5)
+
+        self.assertEqual(self._total(), 5)
+        self.assertEqual(len(list(self.directory.glob("metrics-*.json"))), 1)
+        self.assertFalse((self.directory / metrics.DEAD_WORKERS_NAME).exists())
+
+    def test_own_file_is_replaced_by_live_values(self):
+        TEST_COUNTER.inc(3, kind="a")
+        metrics.write_snapshot(self.directory)
+        TEST_COUNTER.inc(kind="a")
+        self.assertEqual(self._total(), 4)
@@ -0,0 +1,46 @@
+# mensa_member_connect/tests/test_pagination.py
+from unittest import mock
+
+from django.test import TestCase
+
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.pagination import EstimatedCountPaginator
+from mensa_member_connect.tests.helpers import client_for, make_user
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for index in range(5):
+            make_user(f"user{index}@example.org")
+        estimate = mock.patch.object(
+            EstimatedCountPaginator, "_estimated_rows", return_value=20000
+        )
+        estimate.start()
+        self.addCleanup(estimate.stop)
+
+    def _paginator(self):
+        return EstimatedCountPaginator(CustomUser.objects.order_by("id"), 2)
+
+    def test_unfiltered_tables_use_the_estimate(self):
+        paginator = self._paginator()
+        self.assertEqual(paginator.count, 20000)
+        self.assertEqual(len(paginator.page(3).object_list), 1)
+
+    def test_page_past_the_real_end_is_the_real_last_page(self):
+        paginator = self._paginator()
+        page = paginator.page(50)
+        self.assertEqual(page.number, 3)
+        self.assertEqual(len(page.object_list), 1)
+        self.assertEqual(paginator.count, 5)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_admin_changelist_past_the_real_end(self):
+        admin = make_user("admin@example.org", role="admin", is_staff=True)
+        admin.is_superuser = True
+        admin.save()
+        self.client.force_login(admin)
+        response = self.client.get(
+            "/admin/mensa_member_connect/customuser/", {"p": "150"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].paginator.num_pages, 1)
@@ -0,0 +1,52 @@
+# mensa_member_connect/tests/test_review_queue.py
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.tests.helpers import client_for, make_user
+
+
+class ReviewQueueNextTests(TestCase):
+    def setUp(self):
+        self.admin = make_user("admin@example.org", role="admin")
+        self.other_admin = make_user("other-admin@example.org", role="admin")
+        self.pending = []
+        for days in range(6, 0, -1):  # oldest registration first
+            user = make_user(f"pending{days}@example.org", status="pending")
+            CustomUser.objects.filter(id=user.id).update(
+                date_joined=timezone.now() - timedelta(days=days)
+            )
+            self.pending.append(user)
+
+    def _claim(self, user, admin):
+        CustomUser.objects.filter(id=user.id).update(
+            review_claimed_by=admin,
+            review_claimed_until=timezone.now() + timedelta(minutes=5),
+        )
+
+    def _next(self, admin, size):
+        response = client_for(admin).get(f"/api/users/review_queue/next/?size={size}")
+        self.assertEqual(response.status_code, 200)
+        return [user["id"] for user in response.data["results"]]
+
+    def test_own_claims_come_first_and_others_claims_are_skipped(self):
+        self._claim(self.pending[-1], self.admin)  # newest, claimed by caller
+        self._claim(self.pending[0], self.other_admin)  # oldest, claimed by other
+
+        self.assertEqual(
+            self._next(self.admin, 3),
+            [self.pending[-1].id, self.pending[1].id, self.pending[2].id],
+        )
+
+    def test_batches_of_different_admins_are_disjoint(self):
+        first = self._next(self.admin, 3)
+        second = self._next(self.other_admin, 3)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(len(first + second), 6)
+
+    def test_members_are_refused(self):
+        member = make_user("member@example.org")
+        response = client_for(member).get("/api/users/review_queue/next/")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,126 @@
+# mensa_member_connect/tests/test_rollups.py
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.daily_stats import (
+    DailyConnectionStat,
+    DailyMemberStat,
+    RollupWatermark,
+)
+from mensa_member_connect.models.industry import Industry
+from mensa_member_connect.tests.helpers import client_for, make_user
+from mensa_member_connect.utils.rollups import (
+    rollup_connection_requests,
+    rollup_registrations,
+)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.industry = Industry.objects.create(industry_name="Science")
+        self.expert = make_user("expert@example.org", industry=self.industry)
+        self.seeker = make_user("seeker@example.org")
+        self.seeker.approved_at = self.now - timedelta(days=5)
+        self.seeker.save()
+        CustomUser.objects.update(date_joined=self.now - timedelta(days=6))
+
+    def _request(self, created_at, **fields):
+        conn_request = ConnectionRequest.objects.create(
+            seeker=self.seeker, expert=self.expert, message="Hi", **fields
+        )
+        ConnectionRequest.objects.filter(pk=conn_request.pk).update(
+            created_at=created_at
+        )
+        return conn_request
+
+    def _daily_requests(self) -> dict:
+        return {
+            stat.day: stat.connection_requests
+            for stat in DailyConnectionStat.objects.all()
+        }
+
+    def test_first_run_counts_everything_settled(self):
+        three_days_ago = self.now - timedelta(days=3)
+        self._request(three_days_ago)
+        self._request(three_days_ago + timedelta(minutes=1))
+        self._request(self.now)  # too young, left for the next run
+
+        self.assertEqual(rollup_connection_requests(), 2)
+        self.assertEqual(rollup_registrations(), 2)
+        day = timezone.localdate(three_days_ago)
+        self.assertEqual(self._daily_requests(), {day: 2})
+        stat = DailyConnectionStat.objects.get()
+        self.assertEqual(stat.industry_id, self.industry.id)
+
+        member_stat = DailyMemberStat.objects.get(day=day)
+        self.assertEqual(member_stat.first_requests, 1)
+        self.assertEqual(member_stat.approved_first_requests, 1)
+        self.assertAlmostEqual(
+            member_stat.seconds_to_first_request, timedelta(days=2).total_seconds()
+        )
+        joined = DailyMemberStat.objects.get(
+            day=timezone.localdate(self.now - timedelta(days=6))
+        )
+        self.assertEqual(joined.registrations, 2)
+
+    def test_incremental_run_only_adds_rows_after_the_watermark(self):
+        three_days_ago = self.now - timedelta(days=3)
+        self._request(three_days_ago)
+        rollup_connection_requests()
+        first_id = RollupWatermark.objects.get(name="connection_requests").last_id
+
+        two_days_ago = self.now - timedelta(days=2)
+        self._request(two_days_ago)
+        self._request(two_days_ago)
+        rollup_connection_requests()
+        rollup_connection_requests()  # re-running changes nothing
+
+        self.assertEqual(
+            self._daily_requests(),
+            {
+                timezone.localdate(three_days_ago): 1,
+                timezone.localdate(two_days_ago): 2,
+            },
+        )
+        watermark = RollupWatermark.objects.get(name="connection_requests")
+        self.assertGreater(watermark.last_id, first_id)
+        # Only the first request of the seeker counts as a first request
+        self.assertEqual(
+            sum(stat.first_requests for stat in DailyMemberStat.objects.all()), 1
+        )
+
+    def test_late_rows_below_the_watermark_are_recounted(self):
+        ten_minutes_ago = self.now - timedelta(minutes=10)
+        self._request(ten_minutes_ago)
+        late_id = self._request(ten_minutes_ago).id
+        self._request(ten_minutes_ago)
+        # The middle request was not committed yet when the first run ran
+        ConnectionRequest.objects.filter(id=late_id).delete()
+        rollup_connection_requests()
+        day = timezone.localdate(ten_minutes_ago)
+        self.assertEqual(self._daily_requests(), {day: 2})
+        self.assertGreater(
+            RollupWatermark.objects.get(name="connection_requests").last_id, late_id
+        )
+
+        self._request(ten_minutes_ago, id=late_id)
+        rollup_connection_requests()
+        self.assertEqual(self._daily_requests(), {day: 3})
+
+    def test_daily_stats_endpoint_reads_the_rollups(self):
+        self._request(self.now - timedelta(days=3))
+        rollup_connection_requests()
+        admin = make_user("admin@example.org", role="admin")
+        response = client_for(admin).get("/api/stats/daily/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["count"] for item in response.data["connection_requests"]], [1]
+        )
+        self.assertEqual(
+            response.data["connection_requests"][0]["industry_name"], "Science"
+        )
@@ -0,0 +1,38 @@
+# mensa_member_connect/tests/test_snapshot.py
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from mensa_member_connect.utils.snapshot import VersionedSnapshot
+
+
+class BackgroundReloadTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_copy_is_served_while_reloading(self):
+        loaded = threading.Event()
+        release = threading.Event()
+        values = iter(["first", "second"])
+
+        def loader():
+            value = next(values)
+            if value == "second":
+                release.wait(5)
+                loaded.set()
+            return value
+
+        snapshot = VersionedSnapshot("test", loader, reload_in_background=True)
+        self.assertEqual(snapshot.get(), "first")
+
+        snapshot.invalidate()
+        self.assertEqual(snapshot.get(), "first")  # reload runs in a thread
+        release.set()
+        self.assertTrue(loaded.wait(5))
+        for _ in range(100):
+            if not snapshot._reloading:
+                break
+            time.sleep(0.01)
+        self.assertEqual(snapshot.get(), "second")
@@ -0,0 +1,15 @@
+from rest_framework.throttling import UserRateThrottle
+
+
+class ConnectionRequestCreateThrottle(UserRateThrottle):
+    """
+    Per-seeker limit on creating connection requests, checked before any
+    database write or email. Rate: REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].
+    """
+
+    scope = "connection_request"
+
+    def allow_request(self, request, view):
+        if getattr(view, "action", None) != "create":
+            return True
+        return super().allow_request(request, view)
@@ -0,0 +1,185 @@
+# mensa_member_connect/utils/audit.py
+import gzip
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from mensa_member_connect.models.admin_action import AdminAction
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 1000
+# admin_actions-<month>-<first id>-<last id>.jsonl.gz, one file per month of
+# each archived batch
+ARCHIVE_NAME_RE = re.compile(r"^admin_actions-(\d{4}-\d{2})-(\d+)-(\d+)\.jsonl\.gz$")
+# Columns written to the archive; user emails are kept because the user
+# rows (and so the ids) may be gone by the time the archive is read.
+ARCHIVE_FIELDS = (
+    "id",
+    "created_at",
+    "admin_id",
+    "admin__email",
+    "target_user_id",
+    "target_user__email",
+    "action_type",
+    "field",
+    "old_value",
+    "new_value",
+    "request_id",
+    "action",
+)
+
+# CustomUser fields whose changes are written to the admin action log
+AUDITED_USER_FIELDS = {
+    "status": AdminAction.TYPE_STATUS_CHANGE,
+    "role": AdminAction.TYPE_ROLE_CHANGE,
+}
+
+
+def get_request_id(request) -> str:
+    """
+    The id the proxy assigned to this request (X-Request-ID), or a new one.
+    Cached on the request so every audit row it writes shares the id.
+    """
+    request = getattr(request, "_request", request)  # DRF Request -> HttpRequest
+    if not hasattr(request, "audit_request_id"):
+        header = request.META.get("HTTP_X_REQUEST_ID", "").strip()
+        request.audit_request_id = header[:64] or uuid.uuid4().hex
+    return request.audit_request_id
+
+
+def snapshot_audited_fields(user) -> dict:
+    return {field: getattr(user, field) for field in AUDITED_USER_FIELDS}
+
+
+def user_change_records(request, target_user, before: dict) -> list:
+    """
+    Unsaved AdminActions, one per audited field of `target_user` that
+    differs from `before` (see snapshot_audited_fields).
+    """
+    return [
+        AdminAction.field_change(
+            request.user,
+            target_user,
+            action_type,
+            field,
+            before[field],
+            getattr(target_user, field),
+            request_id=get_request_id(request),
+        )
+        for field, action_type in AUDITED_USER_FIELDS.items()
+        if before[field] != getattr(target_user, field)
+    ]
+
+
+def log_user_changes(request, target_user, before: dict) -> list:
+    """
+    Write the audit rows for one user's update in a single INSERT.
+    """
+    return AdminAction.objects.bulk_create(
+        user_change_records(request, target_user, before)
+    )
+
+
+def _write_archive(directory: Path, month: str, rows: list):
+    """
+    Write one batch's rows of `month` to their own file, named by the first
+    and last AdminAction id it holds, via a temporary file and a rename, so
+    a file is either complete or absent.
+    """
+    path = directory / (
+        f"admin_actions-{month}-{rows[0]['id']}-{rows[-1]['id']}.jsonl.gz"
+    )
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    lines = b"".join(
+        json.dumps(row, cls=DjangoJSONEncoder).encode("utf-8") + b"\n" for row in rows
+    )
+    with open(tmp_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            archive.write(lines)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp_path, path)
+
+
+def _archived_ranges(directory: Path) -> list:
+    """
+    (first id, last id, path) of every archive file in `directory`.
+    """
+    ranges = []
+    for path in directory.iterdir():
+        match = ARCHIVE_NAME_RE.match(path.name)
+        if match:
+            ranges.append((int(match.group(2)), int(match.group(3)), path))
+    return ranges
+
+
+def _already_archived(ranges: list, ids: list) -> set:
+    """
+    The ids among `ids` (ascending) that an earlier run wrote to an archive
+    file but did not get to delete. Only files whose id range overlaps the
+    batch are read, which after a clean run is none of them.
+    """
+    found = set()
+    for first, last, path in ranges:
+        if first <= ids[-1] and last >= ids[0]:
+            with gzip.open(path, "rt", encoding="utf-8") as archive:
+                found.update(json.loads(line)["id"] for line in archive)
+    return found.intersection(ids)
+
+
+def archive_admin_actions(
+    retention_days=None, directory=None, batch_size: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    """
+    Move admin actions older than the retention window into gzip-compressed
+    JSONL files, oldest first, one batch at a time. Each batch is written to
+    one file per month and deleted only after the files are on disk. Files
+    are named by AdminAction id range, and rows already in a file (left by
+    an interrupted run) are deleted without being written again, so
+    re-running never duplicates or loses a row. Returns the rows archived.
+    """
+    if retention_days is None:
+        retention_days = settings.ADMIN_ACTION_RETENTION_DAYS
+    directory = Path(directory or settings.ADMIN_ACTION_ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    # Files written by this run never overlap its later, higher-id batches
+    ranges = _archived_ranges(directory)
+
+    archived = 0
+    last_id = 0
+    while True:
+        rows = list(
+            AdminAction.objects.filter(created_at__lt=cutoff, id__gt=last_id)
+            .order_by("id")
+            .values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            break
+
+        ids = [row["id"] for row in rows]
+        done = _already_archived(ranges, ids)
+        by_month = {}
+        for row in rows:
+            if row["id"] in done:
+                continue
+            month = row["created_at"].strftime("%Y-%m")
+            by_month.setdefault(month, []).append(row)
+        for month, month_rows in by_month.items():
+            _write_archive(directory, month, month_rows)
+
+        AdminAction.objects.filter(id__in=ids).delete()
+        archived += len(rows) - len(done)
+        last_id = ids[-1]
+        logger.info("[AUDIT] Archived %d admin actions up to id %s", archived, last_id)
+
+    return archived
@@ -0,0 +1,75 @@
+# mensa_member_connect/utils/email_suppression.py
+import logging
+
+from django.db import transaction
+
+from mensa_member_connect.models.email_suppression import EmailSuppression
+from mensa_member_connect.utils.snapshot import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Mailgun event name -> suppression reason. "failed" only counts when permanent.
+MAILGUN_EVENT_REASONS = {
+    "failed": EmailSuppression.REASON_BOUNCE,
+    "bounced": EmailSuppression.REASON_BOUNCE,
+    "complained": EmailSuppression.REASON_COMPLAINT,
+    "unsubscribed": EmailSuppression.REASON_UNSUBSCRIBE,
+}
+
+
+def normalize_email(email) -> str:
+    return str(email or "").strip().lower()
+
+
+def _load_suppressed_emails() -> frozenset:
+    return frozenset(EmailSuppression.objects.values_list("email", flat=True))
+
+
+suppressed_emails = VersionedSnapshot("email_suppressions", _load_suppressed_emails)
+
+
+def is_suppressed(email) -> bool:
+    """
+    Return True if `email` bounced, complained or unsubscribed.
+    Served from the in-process snapshot, so it costs no query per send.
+    """
+    return normalize_email(email) in suppressed_emails.get()
+
+
+def suppression_from_mailgun_event(event_data: dict):
+    """
+    Map one Mailgun `event-data` object to an unsaved EmailSuppression,
+    or None when the event should not suppress the recipient.
+    """
+    event = str(event_data.get("event", "")).lower()
+    reason = MAILGUN_EVENT_REASONS.get(event)
+    if reason is None:
+        return None
+    if event == "failed" and event_data.get("severity") != "permanent":
+        return None  # temporary failures are retried by Mailgun
+
+    email = normalize_email(event_data.get("recipient"))
+    if not email:
+        return None
+    return EmailSuppression(
+        email=email, reason=reason, event_id=str(event_data.get("id", ""))[:64]
+    )
+
+
+def ingest_mailgun_events(events) -> int:
+    """
+    Store suppressions for a batch of Mailgun events with a single INSERT.
+    Addresses that are already suppressed are left untouched.
+    Returns the number of events that mapped to a suppression.
+    """
+    rows = {}
+    for event_data in events:
+        suppression = suppression_from_mailgun_event(event_data)
+        if suppression is not None:
+            rows.setdefault(suppression.email, suppression)
+
+    if rows:
+        EmailSuppression.objects.bulk_create(rows.values(), ignore_conflicts=True)
+        transaction.on_commit(suppressed_emails.invalidate)
+        logger.info("[EMAIL] Ingested %d suppression events", len(rows))
+    return len(rows)
@@ -1,18 +1,169 @@
 # mensa_member_connect/utils/email_utils.py
 
 from django.core.mail import EmailMultiAlternatives
+from django.db import close_old_connections, transaction
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 import os
+import threading
+import time
 import requests
 
+from mensa_member_connect.models.queued_email import QueuedEmail
+from mensa_member_connect.utils.email_suppression import is_suppressed
+from mensa_member_connect.utils.metrics import Counter, Histogram
+
 logger = logging.getLogger(__name__)
 
+EMAIL_SEND_SECONDS = Histogram(
+    "mmc_email_send_seconds",
+    "Time spent handing an email to a delivery provider.",
+    ["template", "provider"],
+)
+EMAIL_SEND_RESULTS = Counter(
+    "mmc_email_send",
+    "Email delivery attempts by template, provider and outcome.",
+    ["template", "provider", "outcome"],
+)
+EMAIL_FALLBACKS = Counter(
+    "mmc_email_fallback",
+    "Emails that fell back from the Mailgun API to SMTP.",
+    ["template"],
+)
+
 # Get the project root directory (parent of mensa_member_connect_backend)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
+class _LazyExecutor:
+    """
+    This process's email thread pool, created on first use so that importing
+    the module starts no threads.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.EMAIL_QUEUE_WORKERS,
+                    thread_name_prefix="email",
+                )
+        return self._executor.submit(fn, *args)
+
+
+_email_executor = _LazyExecutor()
+
+
+def _deliver_in_background(queued_email_ids):
+    try:
+        for queued_email_id in queued_email_ids:
+            deliver_queued_email(queued_email_id)
+    except Exception as e:  # the rows stay in the outbox for the retry command
+        logger.error("[EMAIL] Background delivery of queued emails failed: %s", e)
+    finally:
+        close_old_connections()
+
+
+def queue_emails(send, calls):
+    """
+    Queue `send(*args, **kwargs)` (e.g. notify_user_approval) for each
+    (args, kwargs) in `calls`. Arguments must be JSON-serializable.
+
+    The emails are written to the QueuedEmail outbox in the current
+    transaction, then handed to this process's email thread pool once it
+    commits, so slow providers never hold up the request or its row locks.
+    An email whose send fails, or never runs because the worker exited,
+    stays in the outbox and is retried by the `send_queued_emails` command.
+    """
+    if QUEUED_SENDERS.get(send.__name__) is not send:
+        raise ValueError(f"{send.__name__} is not a queueable email.")
+    now = timezone.now()
+    queued = QueuedEmail.objects.bulk_create(
+        [
+            QueuedEmail(
+                sender=send.__name__,
+                args=list(args),
+                kwargs=kwargs,
+                next_attempt_at=now,
+            )
+            for args, kwargs in calls
+        ]
+    )
+    if queued:
+        ids = [queued_email.pk for queued_email in queued]
+        transaction.on_commit(
+            lambda: _email_executor.submit(_deliver_in_background, ids)
+        )
+
+
+def deliver_queued_email(queued_email_id) -> bool:
+    """
+    Send one unsent outbox email and record the outcome; a failure is
+    retried after EMAIL_RETRY_DELAY, doubling with each attempt. The row is
+    locked (SKIP LOCKED) while sending, so the thread pool and the command
+    never send the same email twice. Returns True if it was sent now.
+    """
+    with transaction.atomic():
+        queued = (
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(pk=queued_email_id, sent_at__isnull=True)
+            .first()
+        )
+        if queued is None:
+            return False  # already sent, or being sent by someone else
+        queued.attempts += 1
+        try:
+            send = QUEUED_SENDERS[queued.sender]
+            sent = send(*queued.args, **queued.kwargs) is not False
+            queued.last_error = "" if sent else "Delivery failed; see the logs."
+        except Exception as e:  # keep the row for a retry
+            sent = False
+            queued.last_error = f"{type(e).__name__}: {e}"
+        now = timezone.now()
+        if sent:
+            queued.sent_at = now
+        else:
+            queued.next_attempt_at = now + settings.EMAIL_RETRY_DELAY * 2 ** (
+                queued.attempts - 1
+            )
+            logger.warning(
+                "[EMAIL] Queued email %s (%s) failed, attempt %d: %s",
+                queued.pk,
+                queued.sender,
+                queued.attempts,
+                queued.last_error,
+            )
+        queued.save(
+            update_fields=["attempts", "sent_at", "next_attempt_at", "last_error"]
+        )
+    return sent
+
+
+def send_queued_emails(limit: int = 100) -> tuple:
+    """
+    Retry outbox emails that are due, oldest first, skipping those that
+    already failed EMAIL_QUEUE_MAX_ATTEMPTS times.
+    Returns (sent, due) counts.
+    """
+    due = list(
+        QueuedEmail.objects.filter(
+            sent_at__isnull=True,
+            next_attempt_at__lte=timezone.now(),
+            attempts__lt=settings.EMAIL_QUEUE_MAX_ATTEMPTS,
+        )
+        .order_by("next_attempt_at", "id")
+        .values_list("id", flat=True)[:limit]
+    )
+    sent = sum(1 for queued_email_id in due if deliver_queued_email(queued_email_id))
+    return sent, len(due)
+
 
 def send_email_via_mailgun_api(
     to_email: str,
@@ -20,11 +171,13 @@ def send_email_via_mailgun_api(
     text_content: str,
     html_content: str = None,
     from_email: str = None,
-    reply_to: str = None
+    reply_to: str = None,
+    template: str = "unknown",
 ) -> bool:
     """
     Send email using Mailgun HTTP API (more reliable than SMTP in cloud environments).
-    
+
+    `template` is only used to label the delivery metrics.
     Returns True if successful, False otherwise.
     """
     # Get Mailgun API credentials from environment
@@ -36,6 +189,9 @@ def send_email_via_mailgun_api(
             "[EMAIL] Mailgun API credentials not configured. "
             "Set MAILGUN_API_KEY and MAILGUN_DOMAIN environment variables."
         )
+        EMAIL_SEND_RESULTS.inc(
+            template=template, provider="mailgun_api", outcome="unconfigured"
+        )
         return False
     
     # Determine Mailgun API endpoint (US or EU)
@@ -64,6 +220,8 @@ def send_email_via_mailgun_api(
     if reply_to:
         data["h:Reply-To"] = reply_to
     
+    started = time.perf_counter()
+    outcome = "failure"
     try:
         response = requests.post(
             api_url,
@@ -74,6 +232,7 @@ def send_email_via_mailgun_api(
         
         if response.status_code == 200:
             logger.info("[EMAIL] Successfully sent email via Mailgun API to %s", to_email)
+            outcome = "success"
             return True
         else:
             logger.error(
@@ -85,16 +244,56 @@ def send_email_via_mailgun_api(
             
     except requests.exceptions.Timeout:
         logger.error("[EMAIL] Mailgun API request timed out")
+        outcome = "timeout"
         return False
     except requests.exceptions.RequestException as e:
         logger.error("[EMAIL] Mailgun API request failed: %s", e)
         return False
+    finally:
+        EMAIL_SEND_SECONDS.observe(
+            time.perf_counter() - started, template=template, provider="mailgun_api"
+        )
+        EMAIL_SEND_RESULTS.inc(template=template, provider="mailgun_api", outcome=outcome)
+
+
+def send_email_via_smtp(msg: EmailMultiAlternatives, template: str = "unknown"):
+    """
+    Send a prepared message through the configured Django email backend (SMTP),
+    recording latency and outcome under `template`. Exceptions are re-raised.
+    """
+    started = time.perf_counter()
+    outcome = "failure"
+    try:
+        msg.send(fail_silently=False)
+        outcome = "success"
+    finally:
+        EMAIL_SEND_SECONDS.observe(
+            time.perf_counter() - started, template=template, provider="smtp"
+        )
+        EMAIL_SEND_RESULTS.inc(template=template, provider="smtp", outcome=outcome)
+
+
+def skip_suppressed_recipient(to_email: str, template: str) -> bool:
+    """
+    Return True (and count it) if `to_email` is on the suppression list,
+    so the caller can skip rendering and sending entirely.
+    """
+    if not is_suppressed(to_email):
+        return False
+    logger.info(
+        "[EMAIL] Skipping %s email to suppressed address %s", template, to_email
+    )
+    EMAIL_SEND_RESULTS.inc(template=template, provider="none", outcome="suppressed")
+    return True
 
 
 def notify_admin_new_registration(user_email, user_name, first_name=None, last_name=None):
     """
     Notify admin that a new user registered and is awaiting approval.
     """
+    if skip_suppressed_recipient(settings.ADMIN_EMAIL, "admin_new_registration"):
+        return
+
     context = {
         'user_email': user_email,
         'user_name': user_name,
@@ -121,10 +320,12 @@ def notify_admin_new_registration(user_email, user_name, first_name=None, last_n
             subject=subject,
             text_content=text_content,
             html_content=html_content,
-            from_email=settings.DEFAULT_FROM_EMAIL
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            template="admin_new_registration",
         )
         if success:
             return
+        EMAIL_FALLBACKS.inc(template="admin_new_registration")
         logger.warning("[EMAIL] Mailgun API failed, falling back to SMTP")
     
     # Fallback to SMTP
@@ -136,7 +337,7 @@ def notify_admin_new_registration(user_email, user_name, first_name=None, last_n
             [settings.ADMIN_EMAIL],  # set ADMIN_EMAIL in settings.py
         )
         msg.attach_alternative(html_content, "text/html")
-        msg.send(fail_silently=False)
+        send_email_via_smtp(msg, template="admin_new_registration")
         logger.info(
             "[EMAIL] Successfully sent notification to %s",
             settings.ADMIN_EMAIL,
@@ -152,6 +353,9 @@ def notify_user_registration(user_email, user_name, first_name=None, last_name=N
     """
     Notify the new user that their registration was received and is awaiting approval.
     """
+    if skip_suppressed_recipient(user_email, "user_registration"):
+        return
+
     context = {
         'user_email': user_email,
         'user_name': user_name,
@@ -176,10 +380,12 @@ def notify_user_registration(user_email, user_name, first_name=None, last_name=N
             subject=subject,
             text_content=text_content,
             html_content=html_content,
-            from_email=settings.DEFAULT_FROM_EMAIL
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            template="user_registration",
         )
         if success:
             return
+        EMAIL_FALLBACKS.inc(template="user_registration")
         logger.warning("[EMAIL] Mailgun API failed, falling back to SMTP")
     
     # Fallback to SMTP
@@ -191,7 +397,7 @@ def notify_user_registration(user_email, user_name, first_name=None, last_name=N
             [user_email],
         )
         msg.attach_alternative(html_content, "text/html")
-        msg.send(fail_silently=False)
+        send_email_via_smtp(msg, template="user_registration")
         logger.info(
             "[EMAIL] Successfully sent registration confirmation to %s", user_email
         )
@@ -204,7 +410,11 @@ def notify_user_registration(user_email, user_name, first_name=None, last_name=N
 def notify_user_approval(user_email, user_name, first_name=None, last_name=None):
     """
     Send an email to a user notifying them that their account has been approved.
+    Returns False if it could not be delivered (queue_emails then retries it).
     """
+    if skip_suppressed_recipient(user_email, "user_approval"):
+        return True
+
     context = {
         'user_email': user_email,
         'user_name': user_name,
@@ -227,10 +437,12 @@ def notify_user_approval(user_email, user_name, first_name=None, last_name=None)
             subject=subject,
             text_content=text_content,
             html_content=html_content,
-            from_email=settings.DEFAULT_FROM_EMAIL
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            template="user_approval",
         )
         if success:
-            return
+            return True
+        EMAIL_FALLBACKS.inc(template="user_approval")
         logger.warning("[EMAIL] Mailgun API failed, falling back to SMTP")
     
     # Fallback to SMTP
@@ -242,14 +454,16 @@ def notify_user_approval(user_email, user_name, first_name=None, last_name=None)
             [user_email],
         )
         msg.attach_alternative(html_content, "text/html")
-        msg.send(fail_silently=False)
+        send_email_via_smtp(msg, template="user_approval")
         logger.info(
             "[EMAIL] Successfully sent account approval email to %s", user_email
         )
+        return True
     except Exception as e:
         logger.error(
             "[EMAIL] Failed to send account approval email to %s: %s", user_email, e
         )
+        return False
 
 
 def notify_expert_new_message(
@@ -262,6 +476,9 @@ def notify_expert_new_message(
     local_group_name=None,
     preferred_contact_method=None
 ):
+    if skip_suppressed_recipient(expert_email, "expert_new_message"):
+        return
+
     # Format preferred contact method for display
     contact_method_display = ''
     if preferred_contact_method:
@@ -306,10 +523,12 @@ def notify_expert_new_message(
             text_content=text_content,
             html_content=html_content,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            reply_to=seeker_email if seeker_email else None
+            reply_to=seeker_email if seeker_email else None,
+            template="expert_new_message",
         )
         if success:
             return
+        EMAIL_FALLBACKS.inc(template="expert_new_message")
         logger.warning("[EMAIL] Mailgun API failed, falling back to SMTP")
     
     # Fallback to SMTP
@@ -322,7 +541,7 @@ def notify_expert_new_message(
             reply_to=[seeker_email] if seeker_email else [],
         )
         msg.attach_alternative(html_content, "text/html")
-        msg.send(fail_silently=False)
+        send_email_via_smtp(msg, template="expert_new_message")
         logger.info(
             "[EMAIL] Successfully sent new connection request email to %s from %s",
             expert_email,
@@ -348,6 +567,9 @@ def send_password_reset_email(user_email: str, user_name: str, reset_link: str,
         first_name: The recipient's first name (optional).
         last_name: The recipient's last name (optional).
     """
+    if skip_suppressed_recipient(user_email, "password_reset"):
+        return
+
     context = {
         'user_email': user_email,
         'user_name': user_name,
@@ -371,11 +593,13 @@ def send_password_reset_email(user_email: str, user_name: str, reset_link: str,
             subject=subject,
             text_content=text_content,
             html_content=html_content,
-            from_email=settings.DEFAULT_FROM_EMAIL
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            template="password_reset",
         )
         if success:
             return
         # If API fails, fall through to SMTP as backup
+        EMAIL_FALLBACKS.inc(template="password_reset")
         logger.warning("[EMAIL] Mailgun API failed, falling back to SMTP")
     
     # Fallback to SMTP
@@ -387,7 +611,7 @@ def send_password_reset_email(user_email: str, user_name: str, reset_link: str,
             [user_email],
         )
         msg.attach_alternative(html_content, "text/html")
-        msg.send(fail_silently=False)
+        send_email_via_smtp(msg, template="password_reset")
         logger.info("[EMAIL] Successfully sent password reset email to %s", user_email)
     except Exception as e:
         # Log the error but don't raise - let the calling function handle it
@@ -396,3 +620,8 @@ def send_password_reset_email(user_email: str, user_name: str, reset_link: str,
         )
         # Re-raise so calling code knows email failed (but can still return success to user)
         raise
+
+
+# Senders queue_emails accepts, by name as stored in QueuedEmail.sender. Each
+# returns False when delivery failed, so the outbox retries it.
+QUEUED_SENDERS = {send.__name__: send for send in (notify_user_approval,)}
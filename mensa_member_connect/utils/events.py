@@ -0,0 +1,147 @@
+# mensa_member_connect/utils/events.py
+"""
+Lightweight pub/sub used to push connection-request events to the
+server-sent-events stream (views/event_stream_views.py).
+
+On PostgreSQL, events are published with pg_notify and every process that
+has stream subscribers LISTENs on the channel, so a request handled by a
+WSGI worker reaches a browser connected to the ASGI process. NOTIFY is
+transactional: events from rolled-back transactions are never delivered.
+On other databases events are dispatched in-process after commit.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "mmc_connection_request_events"
+# Per-subscriber backlog; a client that falls this far behind drops events
+MAX_QUEUED_EVENTS = 100
+LISTEN_POLL_SECONDS = 30
+LISTEN_RETRY_SECONDS = 5
+
+
+class EventBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user_id -> {(loop, queue), ...}
+        self._listener = None
+
+    def subscribe(self, user_id) -> asyncio.Queue:
+        """
+        Register a queue for `user_id`'s events. Call from the event loop
+        that will consume the queue.
+        """
+        queue = asyncio.Queue(maxsize=MAX_QUEUED_EVENTS)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(
+                (asyncio.get_running_loop(), queue)
+            )
+        if connection.vendor == "postgresql":
+            self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, user_id, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, set())
+            subscribers.difference_update(
+                {entry for entry in subscribers if entry[1] is queue}
+            )
+            if not subscribers:
+                self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id, event: dict):
+        """
+        Send `event` to `user_id`'s open streams once the current
+        transaction commits. Safe to call from any (sync) thread.
+        """
+        if user_id is None:
+            return
+        if connection.vendor == "postgresql":
+            payload = json.dumps({"user_id": user_id, "event": event}, default=str)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+        else:
+            transaction.on_commit(lambda: self.dispatch(user_id, event))
+
+    def dispatch(self, user_id, event: dict):
+        """
+        Hand `event` to this process's subscribers for `user_id`.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: dict):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("[EVENTS] Dropping event for a slow stream subscriber")
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="event-broker-listener", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self):
+        """
+        Background thread: LISTEN on the channel (psycopg2) and dispatch
+        notifications to local subscribers, reconnecting on errors.
+        """
+        while True:
+            try:
+                db = connections["default"]
+                db.ensure_connection()
+                pg_conn = db.connection
+                with pg_conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                logger.info("[EVENTS] Listening for %s notifications", CHANNEL)
+
+                while True:
+                    ready, _, _ = select.select([pg_conn], [], [], LISTEN_POLL_SECONDS)
+                    if not ready:
+                        continue
+                    pg_conn.poll()
+                    while pg_conn.notifies:
+                        notify = pg_conn.notifies.pop(0)
+                        try:
+                            message = json.loads(notify.payload)
+                            self.dispatch(message["user_id"], message["event"])
+                        except (ValueError, KeyError) as e:
+                            logger.warning("[EVENTS] Bad notification payload: %s", e)
+            except Exception as e:  # keep the listener alive across DB restarts
+                logger.error("[EVENTS] Listener failed, retrying: %s", e)
+                connections["default"].close()
+                time.sleep(LISTEN_RETRY_SECONDS)
+
+
+broker = EventBroker()
+
+
+def publish_connection_request(conn_request):
+    """
+    Notify the receiving expert's open streams about a new request.
+    """
+    seeker = conn_request.seeker
+    broker.publish(
+        conn_request.expert_id,
+        {
+            "type": "connection_request.created",
+            "id": conn_request.id,
+            "seeker_id": conn_request.seeker_id,
+            "seeker_name": seeker.get_full_name() if seeker else "",
+            "created_at": conn_request.created_at.isoformat(),
+        },
+    )
@@ -0,0 +1,544 @@
+# mensa_member_connect/utils/expert_vectors.py
+"""
+TF-IDF vectors for experts, used for the "similar experts" panel.
+
+Each expert's expertise text, occupation and industry are tokenized and
+hashed into EXPERT_VECTOR_DIMS buckets (signed feature hashing), weighted by
+sublinear TF and per-bucket IDF, and L2-normalized. The matrix is stored as
+float32 .npy files in EXPERT_VECTORS_DIR and memory-mapped by every worker,
+so cosine similarity against all experts is one vectorized dot product.
+The same matrix serves free-text matching (match_experts): a query only
+reads the matrix columns of its own hashed terms, like posting lists of an
+inverted index, and per-expert attribute arrays supply ranking boosts.
+
+Files are written as numbered generations and published by atomically
+replacing manifest.json; readers reload when the manifest changes. Each
+generation reserves spare zero rows: profile edits overwrite a row in place
+and new experts fill the next spare row, so an update never rewrites the
+matrix. Run `python manage.py build_expert_vectors` for a full rebuild (also
+needed once the spare rows run out).
+"""
+import fcntl
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Prefetch
+
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.expertise import Expertise
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOPWORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down
+    during each few for from further get had has have having he her here hers
+    him his how i if in into is it its just me more most my no nor not now of
+    off on once only or other our ours out over own same she should so some
+    such than that the their theirs them then there these they this those
+    through to too under until up us very was we were what when where which
+    while who whom why will with would you your yours
+    """.split()
+)
+
+# Expertise fields describing what an expert offers. skills_not_offered is
+# deliberately left out: matching on it would recommend the opposite.
+EXPERTISE_TEXT_FIELDS = ("what_offering", "who_would_benefit", "why_choose_you")
+
+MANIFEST_NAME = "manifest.json"
+KEEP_GENERATIONS = 2
+# Unused rows reserved in each generation for experts added afterwards
+SPARE_ROW_FRACTION = 0.1
+MIN_SPARE_ROWS = 64
+
+# Per-expert attributes stored next to the vectors, used for match boosts
+ATTRIBUTE_DTYPES = {
+    "local_group_ids": np.int64,  # 0 when the expert has no local group
+    "states": "U24",  # upper-cased CustomUser.state
+    "available": np.bool_,
+}
+# availability_status values (lower-cased) that count as taking requests
+AVAILABLE_STATUSES = frozenset({"available", "open", "accepting requests"})
+
+# Multipliers applied to text relevance by match_experts
+LOCAL_GROUP_BOOST = 0.5
+STATE_BOOST = 0.25
+AVAILABLE_BOOST = 0.25
+
+
+def tokenize(text) -> list:
+    return [
+        token
+        for token in TOKEN_RE.findall(str(text or "").lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def hash_token(token: str, dims: int):
+    """
+    Stable (unsalted) hash of a token to a (bucket, sign) pair.
+    """
+    value = zlib.crc32(token.encode("utf-8"))
+    return value % dims, 1.0 if (value // dims) % 2 == 0 else -1.0
+
+
+def expert_text(user) -> str:
+    """
+    The text describing an expert. Expects `expertises` (with
+    area_of_expertise) and `industry` to be prefetched/selected.
+    """
+    parts = [user.occupation or ""]
+    if user.industry_id and user.industry:
+        parts.append(user.industry.industry_name)
+    for expertise in user.expertises.all():
+        parts.extend(getattr(expertise, field) or "" for field in EXPERTISE_TEXT_FIELDS)
+        if expertise.area_of_expertise_id and expertise.area_of_expertise:
+            parts.append(expertise.area_of_expertise.industry_name)
+    return " ".join(parts)
+
+
+def expert_attributes(user) -> dict:
+    return {
+        "local_group_ids": user.local_group_id or 0,
+        "states": (user.state or "").strip().upper(),
+        "available": (user.availability_status or "").strip().lower()
+        in AVAILABLE_STATUSES,
+    }
+
+
+def hashed_term_frequencies(text, dims: int) -> dict:
+    """
+    Map bucket -> signed, sublinear term frequency for `text`.
+    """
+    weights = {}
+    for token, count in Counter(tokenize(text)).items():
+        bucket, sign = hash_token(token, dims)
+        weights[bucket] = weights.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+    return weights
+
+
+def vectorize(text, idf: np.ndarray) -> np.ndarray:
+    """
+    TF-IDF vector for `text` using an existing IDF table, L2-normalized.
+    """
+    vector = np.zeros(idf.shape[0], dtype=np.float32)
+    for bucket, weight in hashed_term_frequencies(text, idf.shape[0]).items():
+        vector[bucket] = weight
+    vector *= idf
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+def experts_queryset():
+    """
+    Experts (users with at least one expertise) with everything expert_text
+    needs, and the photo blob left behind.
+    """
+    return (
+        CustomUser.objects.filter(expertises__isnull=False)
+        .distinct()
+        .select_related("industry")
+        .only(
+            "id",
+            "occupation",
+            "state",
+            "availability_status",
+            "local_group_id",
+            "industry__industry_name",
+        )
+        .prefetch_related(
+            Prefetch(
+                "expertises",
+                queryset=Expertise.objects.select_related("area_of_expertise"),
+            )
+        )
+        .order_by("id")
+    )
+
+
+class ExpertVectorIndex:
+    """
+    A loaded generation: `user_ids[i]` owns row `vectors[i]`. Rows from
+    manifest["experts"] on are spare: user id 0 and an all-zero vector,
+    which never scores above zero.
+    """
+
+    def __init__(self, directory: Path, manifest: dict, writable: bool = False):
+        self.directory = directory
+        self.manifest = manifest
+        generation = manifest["generation"]
+        mode = "r+" if writable else "r"
+        self.vectors = np.load(directory / f"vectors-{generation}.npy", mmap_mode=mode)
+        self.user_ids = np.load(
+            directory / f"user_ids-{generation}.npy", mmap_mode=mode
+        )
+        self.idf = np.load(directory / f"idf-{generation}.npy")
+        self.experts = manifest["experts"]
+        self.rows = {
+            int(user_id): row
+            for row, user_id in enumerate(self.user_ids[: self.experts])
+        }
+        self.attributes = {}
+        for name, dtype in ATTRIBUTE_DTYPES.items():
+            path = directory / f"{name}-{generation}.npy"
+            self.attributes[name] = (
+                np.load(path, mmap_mode=mode)
+                if path.exists()
+                else np.zeros(len(self.user_ids), dtype=dtype)
+            )
+
+    def similar(self, user_id, k: int = 10):
+        """
+        Top-k (user_id, cosine score) pairs most similar to `user_id`.
+        """
+        row = self.rows.get(int(user_id))
+        if row is None or self.experts < 2:
+            return []
+        scores = self.vectors @ self.vectors[row]
+        scores[row] = -np.inf
+        k = min(k, len(scores) - 1)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(self.user_ids[i]), float(scores[i])) for i in top if scores[i] > 0
+        ]
+
+    def match(
+        self, text, limit: int = 20, local_group_id=None, state=None, exclude_user_id=None
+    ):
+        """
+        Rank experts against free text in one vectorized pass.
+        Relevance is the cosine between the text and each expert; it is then
+        multiplied up for experts in the same local group or state, and for
+        those marked available. Returns (user_id, score) pairs, best first.
+        """
+        query = vectorize(text, self.idf)
+        terms = np.flatnonzero(query)
+        if terms.size == 0 or self.experts == 0:
+            return []
+
+        relevance = self.vectors[:, terms] @ query[terms]
+        boost = np.ones_like(relevance)
+        if local_group_id:
+            boost += LOCAL_GROUP_BOOST * (
+                self.attributes["local_group_ids"] == local_group_id
+            )
+        if state:
+            boost += STATE_BOOST * (self.attributes["states"] == state.strip().upper())
+        boost += AVAILABLE_BOOST * self.attributes["available"]
+        scores = np.where(relevance > 0, relevance * boost, 0).astype(np.float32)
+
+        if exclude_user_id is not None:
+            row = self.rows.get(int(exclude_user_id))
+            if row is not None:
+                scores[row] = 0
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.user_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+
+def vectors_dir() -> Path:
+    return Path(settings.EXPERT_VECTORS_DIR)
+
+
+@contextmanager
+def _write_lock(directory: Path):
+    """
+    Serialize writers across processes (full builds and incremental updates).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / ".lock", "w", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_manifest(directory: Path):
+    try:
+        with open(directory / MANIFEST_NAME, encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_manifest(directory: Path, manifest: dict):
+    tmp_path = directory / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(tmp_path, directory / MANIFEST_NAME)
+
+
+def _with_spare_rows(array, spare: int):
+    padding = np.zeros((spare,) + array.shape[1:], dtype=array.dtype)
+    return np.concatenate([array, padding])
+
+
+def _publish(directory: Path, vectors, user_ids, idf, attributes, documents: int):
+    """
+    Write a new generation, with spare rows for later experts, and point
+    the manifest at it. Must be called with the write lock held.
+    """
+    generation = time.time_ns()
+    experts = int(user_ids.shape[0])
+    spare = max(MIN_SPARE_ROWS, int(experts * SPARE_ROW_FRACTION))
+    np.save(
+        directory / f"vectors-{generation}.npy",
+        _with_spare_rows(vectors.astype(np.float32), spare),
+    )
+    np.save(
+        directory / f"user_ids-{generation}.npy",
+        _with_spare_rows(user_ids.astype(np.int64), spare),
+    )
+    np.save(directory / f"idf-{generation}.npy", idf.astype(np.float32))
+    for name, dtype in ATTRIBUTE_DTYPES.items():
+        np.save(
+            directory / f"{name}-{generation}.npy",
+            _with_spare_rows(attributes[name].astype(dtype), spare),
+        )
+
+    manifest = {
+        "generation": generation,
+        "dims": int(idf.shape[0]),
+        "experts": experts,
+        "documents": documents,
+    }
+    _write_manifest(directory, manifest)
+
+    # Keep the previous generation for readers that have not reloaded yet
+    generations = sorted(
+        {int(path.stem.split("-")[1]) for path in directory.glob("vectors-*.npy")}
+    )
+    for old in generations[:-KEEP_GENERATIONS]:
+        for prefix in ("vectors", "user_ids", "idf", *ATTRIBUTE_DTYPES):
+            (directory / f"{prefix}-{old}.npy").unlink(missing_ok=True)
+    return manifest
+
+
+def build_index(dims: int = None, chunk_size: int = 2000) -> dict:
+    """
+    Rebuild vectors for every expert and publish them as a new generation.
+    """
+    dims = dims or settings.EXPERT_VECTOR_DIMS
+    user_ids, rows = [], []
+    attribute_values = {name: [] for name in ATTRIBUTE_DTYPES}
+    document_frequency = np.zeros(dims, dtype=np.int64)
+
+    for user in experts_queryset().iterator(chunk_size=chunk_size):
+        weights = hashed_term_frequencies(expert_text(user), dims)
+        user_ids.append(user.id)
+        rows.append(weights)
+        for name, value in expert_attributes(user).items():
+            attribute_values[name].append(value)
+        if weights:
+            document_frequency[list(weights)] += 1
+
+    documents = len(rows)
+    idf = (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    vectors = np.zeros((documents, dims), dtype=np.float32)
+    for row, weights in enumerate(rows):
+        if weights:
+            vectors[row, list(weights)] = list(weights.values())
+    vectors *= idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+    attributes = {
+        name: np.array(values, dtype=ATTRIBUTE_DTYPES[name])
+        for name, values in attribute_values.items()
+    }
+    directory = vectors_dir()
+    with _write_lock(directory):
+        manifest = _publish(
+            directory,
+            vectors,
+            np.array(user_ids, dtype=np.int64),
+            idf,
+            attributes,
+            documents,
+        )
+    _loaded.reset()
+    logger.info(
+        "[EXPERT_VECTORS] Built generation %s for %d experts",
+        manifest["generation"],
+        documents,
+    )
+    return manifest
+
+
+class _LoadedIndex:
+    """
+    Per-process cache of the current generation, reloaded when the
+    manifest file changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._manifest_mtime = None
+
+    def reset(self):
+        with self._lock:
+            self._index = None
+            self._manifest_mtime = None
+
+    def get(self):
+        directory = vectors_dir()
+        try:
+            mtime = os.stat(directory / MANIFEST_NAME).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if self._index is not None and mtime == self._manifest_mtime:
+            return self._index
+        with self._lock:
+            if self._index is None or mtime != self._manifest_mtime:
+                manifest = _read_manifest(directory)
+                if manifest is None:
+                    return None
+                self._index = ExpertVectorIndex(directory, manifest)
+                self._manifest_mtime = mtime
+            return self._index
+
+
+_loaded = _LoadedIndex()
+
+
+def get_index():
+    """
+    The current ExpertVectorIndex, or None if no index has been built yet.
+    """
+    return _loaded.get()
+
+
+def similar_experts(user_id, k: int = 10):
+    index = get_index()
+    if index is None:
+        return []
+    return index.similar(user_id, k)
+
+
+def match_experts(text, limit: int = 20, seeker=None):
+    """
+    Experts ranked against a need description, boosted towards the seeker's
+    local group and state. Returns (user_id, score) pairs, best first.
+    """
+    index = get_index()
+    if index is None:
+        return []
+    return index.match(
+        text,
+        limit,
+        local_group_id=getattr(seeker, "local_group_id", None),
+        state=getattr(seeker, "state", None),
+        exclude_user_id=getattr(seeker, "id", None),
+    )
+
+
+def update_expert_vector(user_id):
+    """
+    Recompute one expert's vector with the current IDF table. Existing rows
+    are overwritten in place (visible to all workers through the shared
+    memory map); experts new to the index take the next spare row and bump
+    manifest["experts"]. Users who no longer have expertise are zeroed out.
+    """
+    directory = vectors_dir()
+    with _write_lock(directory):
+        manifest = _read_manifest(directory)
+        if manifest is None:
+            return  # nothing built yet; the next full build picks them up
+        index = ExpertVectorIndex(directory, manifest, writable=True)
+
+        user = experts_queryset().filter(id=user_id).first()
+        if user is not None:
+            vector = vectorize(expert_text(user), index.idf)
+            attributes = expert_attributes(user)
+        else:
+            vector = np.zeros(index.idf.shape[0], dtype=np.float32)
+            attributes = {name: 0 for name in ATTRIBUTE_DTYPES}
+            attributes["states"] = ""
+
+        row = index.rows.get(int(user_id))
+        if row is None:
+            if user is None:
+                return
+            row = index.experts
+            if row >= index.vectors.shape[0] or not isinstance(
+                index.attributes["available"], np.memmap
+            ):
+                # No spare row (or a generation from before spare rows)
+                logger.info(
+                    "[EXPERT_VECTORS] No spare row for user ID=%s; run "
+                    "build_expert_vectors to include them",
+                    user_id,
+                )
+                return
+            index.user_ids[row] = int(user_id)
+            index.user_ids.flush()
+
+        index.vectors[row] = vector
+        index.vectors.flush()
+        for name, value in attributes.items():
+            array = index.attributes[name]
+            array[row] = value
+            if isinstance(array, np.memmap):
+                array.flush()
+
+        if row == index.experts:
+            # Publishing the new count makes readers reload with the new row
+            _write_manifest(directory, {**manifest, "experts": row + 1})
+    logger.debug("[EXPERT_VECTORS] Updated vector for user ID=%s", user_id)
+
+
+def _update_scheduled(user_id) -> bool:
+    """
+    Whether the current transaction already has an update queued for
+    `user_id`. Django drops a transaction's on_commit callbacks when it (or
+    the savepoint that queued them) rolls back, so this never outlives it.
+    """
+    return any(
+        getattr(callback, "expert_vector_user_id", None) == user_id
+        for _, callback, _ in connection.run_on_commit
+    )
+
+
+def schedule_expert_vector_update(user_id):
+    """
+    Update `user_id`'s vector once the current transaction commits.
+    Repeated calls in one transaction collapse into a single update.
+    """
+    if user_id is None or _update_scheduled(user_id):
+        return
+
+    def run():
+        try:
+            update_expert_vector(user_id)
+        except Exception as e:  # never fail the request over a recommendation
+            logger.error(
+                "[EXPERT_VECTORS] Failed to update vector for user ID=%s: %s",
+                user_id,
+                e,
+            )
+
+    run.expert_vector_user_id = user_id
+    transaction.on_commit(run)
@@ -0,0 +1,64 @@
+# mensa_member_connect/utils/local_group_resolver.py
+"""
+Process-wide lookup of local groups by id, 3-digit group number or name,
+served from a VersionedSnapshot so registration resolves a group without a
+query. Signals invalidate the snapshot when a group changes.
+"""
+import re
+
+from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.utils.snapshot import VersionedSnapshot
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_group_name(name) -> str:
+    return _WHITESPACE_RE.sub(" ", str(name or "")).strip().casefold()
+
+
+class LocalGroupResolver:
+    def __init__(self, groups):
+        self.by_id = {group.id: group for group in groups}
+        self.by_number = {group.group_number: group for group in groups}
+        self.by_name = {}
+        for group in sorted(groups, key=lambda group: group.id):
+            # On duplicate names the oldest group wins
+            self.by_name.setdefault(normalize_group_name(group.group_name), group)
+
+    def resolve(self, value):
+        """
+        The LocalGroup for `value`, or None. An integer or a digit string is
+        an id (as registration has always sent them); anything else is
+        matched by name, ignoring case and extra whitespace.
+        """
+        if isinstance(value, bool) or value is None:
+            return None
+        if isinstance(value, int):
+            return self.by_id.get(value)
+        value = str(value).strip()
+        if value.isdigit():
+            return self.by_id.get(int(value))
+        return self.by_name.get(normalize_group_name(value))
+
+    def resolve_number(self, value):
+        """
+        The LocalGroup whose 3-digit group_number is `value` ("094"), or None.
+        """
+        if isinstance(value, bool) or value is None:
+            return None
+        return self.by_number.get(str(value).strip())
+
+
+def _load_resolver() -> LocalGroupResolver:
+    return LocalGroupResolver(list(LocalGroup.objects.all()))
+
+
+local_group_resolver = VersionedSnapshot("local_group_resolver", _load_resolver)
+
+
+def resolve_local_group(value):
+    return local_group_resolver.get().resolve(value)
+
+
+def resolve_local_group_number(value):
+    return local_group_resolver.get().resolve_number(value)
@@ -0,0 +1,392 @@
+# mensa_member_connect/utils/metrics.py
+"""
+Small in-process metrics registry rendered in the Prometheus text format.
+
+Counters and histograms are module-level objects created once at import time,
+e.g. in email_utils.py, and updated from request threads. The registry is
+exposed by the admin-only /api/metrics/ endpoint.
+
+With several worker processes (gunicorn), each process periodically writes
+its values to METRICS_DIR as metrics-<host>-<pid>-<start>.json (flush_if_due)
+and the endpoint sums every worker's file, so any worker can answer for all
+of them. When a worker on this host has exited, its file is folded into
+dead-workers.json, so totals never go down when workers are replaced. The
+process start time in the name tells a reused pid from the worker that wrote
+the file; files of other hosts sharing the directory are only ever summed.
+"""
+import fcntl
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, covering fast DB work up to slow SMTP sessions.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds between a process's snapshot writes to the metrics directory
+FLUSH_INTERVAL = 5.0
+DEAD_WORKERS_NAME = "dead-workers.json"
+
+_lock = threading.Lock()
+_registry = {}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        with _lock:
+            if name in _registry:
+                raise ValueError(f"Metric '{name}' is already registered.")
+            _registry[name] = self
+
+    def _label_key(self, labels: dict) -> tuple:
+        unknown = set(labels) - set(self.labelnames)
+        if unknown:
+            raise ValueError(f"Unknown labels for {self.name}: {sorted(unknown)}")
+        return tuple(str(labels.get(label, "")) for label in self.labelnames)
+
+    def clear(self):
+        with _lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._label_key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> dict:
+        with _lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0) + value
+
+    def samples(self, values=None):
+        items = (self.snapshot() if values is None else values).items()
+        for key, value in items:
+            yield f"{self.name}_total", key, value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=None):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+
+    def observe(self, value: float, **labels):
+        key = self._label_key(labels)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count.
+                state = [[0] * len(self.buckets), 0.0, 0]
+                self._values[key] = state
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the wrapped block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> dict:
+        with _lock:
+            return {
+                key: [list(state[0]), state[1], state[2]]
+                for key, state in self._values.items()
+            }
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return [list(value[0]), value[1], value[2]]
+        for index, bucket_count in enumerate(value[0]):
+            total[0][index] += bucket_count
+        total[1] += value[1]
+        total[2] += value[2]
+        return total
+
+    def samples(self, values=None):
+        items = (self.snapshot() if values is None else values).items()
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", key + (_format_value(bound),), cumulative
+            yield f"{self.name}_bucket", key + ("+Inf",), count
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _start_time(pid: int):
+    """
+    When process `pid` started, in clock ticks since boot, or None if there
+    is no such process. "" where /proc is not available.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return None if Path("/proc/self/stat").exists() else ""
+    except OSError:
+        return ""
+    # Field 22; the command name before it may contain spaces and parens
+    return stat.rsplit(")", 1)[1].split()[19]
+
+
+def _worker_id(pid: int = None):
+    """
+    (host, pid, start time) naming a process's snapshot file, or None if
+    `pid` is not running.
+    """
+    pid = os.getpid() if pid is None else pid
+    started = _start_time(pid)
+    if started is None:
+        return None
+    return socket.gethostname(), pid, started
+
+
+def _snapshot_path(directory) -> Path:
+    host, pid, started = _worker_id()
+    return Path(directory) / f"metrics-{host}-{pid}-{started}.json"
+
+
+def _write_json(path: Path, state: dict):
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, path)
+
+
+def _dump(values_by_name: dict) -> dict:
+    return {
+        name: [[list(key), value] for key, value in values.items()]
+        for name, values in values_by_name.items()
+    }
+
+
+def write_snapshot(directory):
+    """
+    Atomically write this process's metric values to `directory`.
+    """
+    with _lock:
+        metrics = list(_registry.values())
+    path = _snapshot_path(directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json(path, _dump({metric.name: metric.snapshot() for metric in metrics}))
+
+
+class _FlushSchedule:
+    """
+    When this process next writes its snapshot.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_flush = 0.0
+
+
+_flush_schedule = _FlushSchedule()
+
+
+def flush_if_due(directory):
+    """
+    Write this process's snapshot if FLUSH_INTERVAL has passed since the
+    last write. Cheap enough to call after every request.
+    """
+    schedule = _flush_schedule
+    if not directory or time.monotonic() < schedule.next_flush:
+        return
+    if not schedule.lock.acquire(blocking=False):
+        return  # another thread is writing it right now
+    try:
+        now = time.monotonic()
+        if now < schedule.next_flush:
+            return
+        schedule.next_flush = now + FLUSH_INTERVAL
+        write_snapshot(directory)
+    except OSError as e:  # never fail the request being measured
+        logger.warning("[METRICS] Could not write snapshot to %s: %s", directory, e)
+    finally:
+        schedule.lock.release()
+
+
+def _worker_alive(worker_id) -> bool:
+    """
+    Whether the process that wrote a snapshot is still running. Workers of
+    other hosts cannot be checked from here and count as alive.
+    """
+    host, pid, started = worker_id
+    if host != socket.gethostname():
+        return True
+    current = _start_time(pid)
+    if current is None:
+        return False
+    if current == "" or started == "":  # no /proc: the pid is all there is
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    return current == started
+
+
+def _read_state(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None  # missing, or being replaced by its worker
+
+
+def _merge_state(merged: dict, metrics: dict, state: dict):
+    for name, entries in state.items():
+        metric = metrics.get(name)
+        if metric is None:
+            continue  # written by a different code version
+        values = merged.setdefault(name, {})
+        for key, value in entries:
+            key = tuple(key)
+            values[key] = metric.merge(values.get(key), value)
+
+
+def _worker_files(directory: Path) -> dict:
+    """
+    (host, pid, start time) -> snapshot file, for every worker in `directory`.
+    """
+    files = {}
+    for path in directory.glob("metrics-*.json"):
+        parts = path.stem[len("metrics-") :].rsplit("-", 2)
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue  # not a snapshot name
+        files[(parts[0], int(parts[1]), parts[2])] = path
+    return files
+
+
+def _fold_dead_workers(directory: Path, metrics: dict, dead_paths):
+    """
+    Add the snapshots of exited workers to dead-workers.json and delete
+    them. Serialized across processes by a lock file, so each is folded once.
+    """
+    with open(directory / ".lock", "w", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            dead_path = directory / DEAD_WORKERS_NAME
+            folded = {}
+            _merge_state(folded, metrics, _read_state(dead_path) or {})
+            paths = [path for path in dead_paths if path.exists()]
+            for path in paths:
+                _merge_state(folded, metrics, _read_state(path) or {})
+            if paths:
+                _write_json(dead_path, _dump(folded))
+                for path in paths:
+                    path.unlink(missing_ok=True)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _merged_values(directory) -> dict:
+    """
+    Metric name -> {label key: value}, summed over every worker snapshot in
+    `directory` and the folded totals of exited workers, with this process's
+    live values in place of its own file.
+    """
+    with _lock:
+        metrics = dict(_registry)
+    merged = {name: metric.snapshot() for name, metric in metrics.items()}
+    if not directory or not Path(directory).is_dir():
+        return merged
+
+    directory = Path(directory)
+    files = _worker_files(directory)
+    files.pop(_worker_id(), None)
+    dead = {
+        worker: path for worker, path in files.items() if not _worker_alive(worker)
+    }
+    if dead:
+        _fold_dead_workers(directory, metrics, dead.values())
+
+    for worker, path in files.items():
+        if worker not in dead:
+            _merge_state(merged, metrics, _read_state(path) or {})
+    _merge_state(merged, metrics, _read_state(directory / DEAD_WORKERS_NAME) or {})
+    return merged
+
+
+def render_prometheus(directory=None) -> str:
+    """
+    Render every registered metric in the Prometheus text exposition format,
+    summed across the worker snapshots in `directory` when given.
+    """
+    with _lock:
+        metrics = sorted(_registry.values(), key=lambda metric: metric.name)
+    merged = _merged_values(directory)
+
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for sample_name, label_values, value in metric.samples(merged[metric.name]):
+            names = metric.labelnames
+            if sample_name.endswith("_bucket"):
+                names = names + ("le",)
+            lines.append(
+                f"{sample_name}{_format_labels(names, label_values)} {_format_value(value)}"
+            )
+    return "\n".join(lines) + "\n"
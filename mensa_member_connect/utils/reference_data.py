@@ -0,0 +1,72 @@
+# mensa_member_connect/utils/reference_data.py
+"""
+Precomputed responses for the reference lists (industries, local groups).
+
+Each list is serialized once per version into JSON bytes held in a
+VersionedSnapshot; signals bump the version when a row changes. List
+responses are byte copies with a content-hash ETag, so browsers can
+revalidate with If-None-Match and get an empty 304.
+"""
+import hashlib
+from dataclasses import dataclass
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+from mensa_member_connect.models.industry import Industry
+from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.serializers.industry_serializers import IndustryListSerializer
+from mensa_member_connect.serializers.local_group_serializers import (
+    LocalGroupListSerializer,
+)
+from mensa_member_connect.utils.snapshot import VersionedSnapshot
+
+# Browsers reuse a list this long before revalidating (which is then a 304)
+REFERENCE_MAX_AGE = 3600
+
+
+@dataclass(frozen=True)
+class ReferenceList:
+    data: list
+    body: bytes
+    etag: str
+
+
+def _reference_loader(queryset, serializer_class):
+    def load() -> ReferenceList:
+        data = serializer_class(queryset.all(), many=True).data
+        body = JSONRenderer().render(data)
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        return ReferenceList(data=data, body=body, etag=etag)
+
+    return load
+
+
+industries = VersionedSnapshot(
+    "reference_industries",
+    _reference_loader(Industry.objects.order_by("id"), IndustryListSerializer),
+)
+local_groups = VersionedSnapshot(
+    "reference_local_groups",
+    _reference_loader(LocalGroup.objects.order_by("id"), LocalGroupListSerializer),
+)
+
+
+def reference_response(request, snapshot: VersionedSnapshot) -> HttpResponse:
+    """
+    The snapshot's list as a JSON response, or 304 when the client's
+    If-None-Match already names the current ETag.
+    """
+    reference = snapshot.get()
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if reference.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(reference.body, content_type="application/json")
+    response["ETag"] = reference.etag
+    # Responses depend on the Authorization header, so keep them out of
+    # shared caches
+    patch_cache_control(response, private=True, max_age=REFERENCE_MAX_AGE)
+    patch_vary_headers(response, ["Authorization"])
+    return response
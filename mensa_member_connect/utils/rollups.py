@@ -0,0 +1,221 @@
+# mensa_member_connect/utils/rollups.py
+"""
+Incremental aggregation of raw rows into the daily rollup tables.
+
+Each rollup remembers the highest source id it has folded in (RollupWatermark)
+and finds the days that gained rows above it. Those days, plus the days
+touched by LATE_ROW_WINDOW before the previous run's cutoff, are recounted
+from scratch, so a run costs time proportional to a few days of rows, not
+to the size of the tables. Recounting (rather than adding to the stored
+totals) makes runs idempotent and picks up rows that committed after the
+previous run with ids below its watermark.
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Exists, Max, Min, OuterRef, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.daily_stats import (
+    DailyConnectionStat,
+    DailyMemberStat,
+    RollupWatermark,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows younger than this are left for the next run, so ids allocated by
+# transactions that commit late are not skipped past by the watermark.
+SETTLE_DELAY = timedelta(minutes=5)
+# Rows created this long before the previous run's cutoff may still have
+# been uncommitted then; their days are recounted by the next run.
+LATE_ROW_WINDOW = timedelta(hours=1)
+
+
+def _claim_watermark(name: str, model, date_field: str):
+    """
+    Lock the watermark row for `name` and return (watermark, upper_id,
+    days): rows up to upper_id are safe to aggregate, and `days` are the
+    days to recount. Must be called inside a transaction.
+    """
+    _, created = RollupWatermark.objects.get_or_create(name=name)
+    watermark = RollupWatermark.objects.select_for_update().get(name=name)
+
+    cutoff = timezone.now() - SETTLE_DELAY
+    upper_id = (
+        model.objects.filter(
+            id__gt=watermark.last_id, **{f"{date_field}__lte": cutoff}
+        ).aggregate(upper=Max("id"))["upper"]
+        or watermark.last_id
+    )
+
+    days = set(
+        model.objects.filter(id__gt=watermark.last_id, id__lte=upper_id)
+        .annotate(day=TruncDate(date_field))
+        .values_list("day", flat=True)
+        .distinct()
+        .order_by()
+    )
+    if not created:
+        day = timezone.localdate(
+            watermark.updated_at - SETTLE_DELAY - LATE_ROW_WINDOW
+        )
+        while day <= timezone.localdate(cutoff):
+            days.add(day)
+            day += timedelta(days=1)
+    return watermark, upper_id, days
+
+
+def _on_days(date_field: str, days) -> Q:
+    """
+    `date_field` falls on one of `days`, as ranges the index can serve.
+    """
+    condition = Q(pk__in=[])
+    for day in days:
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        condition |= Q(
+            **{
+                f"{date_field}__gte": start,
+                f"{date_field}__lt": start + timedelta(days=1),
+            }
+        )
+    return condition
+
+
+def _save_member_stats(days, values_by_day: dict, fields):
+    """
+    Set `fields` of DailyMemberStat for each of `days` to the values in
+    `values_by_day` (day -> {field: value}), or to 0 for days without any.
+    """
+    stats = {stat.day: stat for stat in DailyMemberStat.objects.filter(day__in=days)}
+    for day in days:
+        stat = stats.setdefault(day, DailyMemberStat(day=day))
+        for field in fields:
+            setattr(stat, field, values_by_day.get(day, {}).get(field, 0))
+    DailyMemberStat.objects.bulk_update(
+        [stat for stat in stats.values() if stat.pk], fields, batch_size=500
+    )
+    DailyMemberStat.objects.bulk_create(
+        [stat for stat in stats.values() if not stat.pk], batch_size=500
+    )
+
+
+def rollup_connection_requests() -> int:
+    """
+    Recount DailyConnectionStat and the first-request figures of
+    DailyMemberStat for the days with new or possibly late connection
+    requests. Returns the number of requests counted.
+    """
+    with transaction.atomic():
+        watermark, upper_id, days = _claim_watermark(
+            "connection_requests", ConnectionRequest, "created_at"
+        )
+        if not days:
+            return 0
+
+        day_requests = ConnectionRequest.objects.filter(
+            _on_days("created_at", days), id__lte=upper_id
+        )
+
+        # Requests per day / expert industry / seeker local group
+        rows = (
+            day_requests.annotate(day=TruncDate("created_at"))
+            .values("day", "expert__industry_id", "seeker__local_group_id")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        processed = 0
+        stats = []
+        for row in rows:
+            stats.append(
+                DailyConnectionStat(
+                    day=row["day"],
+                    industry_id=row["expert__industry_id"],
+                    local_group_id=row["seeker__local_group_id"],
+                    connection_requests=row["total"],
+                )
+            )
+            processed += row["total"]
+        DailyConnectionStat.objects.filter(day__in=days).delete()
+        DailyConnectionStat.objects.bulk_create(stats, batch_size=500)
+
+        # Seekers whose first-ever request falls on one of the days
+        earlier_request = ConnectionRequest.objects.filter(
+            seeker_id=OuterRef("seeker_id"),
+            created_at__lt=OuterRef("created_at"),
+            id__lte=upper_id,
+        )
+        first_requests = (
+            day_requests.filter(seeker__isnull=False)
+            .exclude(Exists(earlier_request))
+            .values("seeker_id", "seeker__approved_at")
+            .annotate(first_at=Min("created_at"))
+            .order_by()
+        )
+        by_day = {}
+        for row in first_requests:
+            day = timezone.localdate(row["first_at"])
+            entry = by_day.setdefault(
+                day,
+                {
+                    "first_requests": 0,
+                    "approved_first_requests": 0,
+                    "seconds_to_first_request": 0.0,
+                },
+            )
+            entry["first_requests"] += 1
+            approved_at = row["seeker__approved_at"]
+            if approved_at and row["first_at"] >= approved_at:
+                entry["approved_first_requests"] += 1
+                entry["seconds_to_first_request"] += (
+                    row["first_at"] - approved_at
+                ).total_seconds()
+        _save_member_stats(
+            days,
+            by_day,
+            ["first_requests", "approved_first_requests", "seconds_to_first_request"],
+        )
+
+        watermark.last_id = upper_id
+        watermark.save(update_fields=["last_id", "updated_at"])
+
+    logger.info(
+        "[ROLLUP] Recounted %d connection requests over %d days", processed, len(days)
+    )
+    return processed
+
+
+def rollup_registrations() -> int:
+    """
+    Recount DailyMemberStat.registrations for the days with new or possibly
+    late registrations. Returns the number of users counted.
+    """
+    with transaction.atomic():
+        watermark, upper_id, days = _claim_watermark(
+            "registrations", CustomUser, "date_joined"
+        )
+        if not days:
+            return 0
+
+        rows = (
+            CustomUser.objects.filter(_on_days("date_joined", days), id__lte=upper_id)
+            .annotate(day=TruncDate("date_joined"))
+            .values("day")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        by_day = {row["day"]: {"registrations": row["total"]} for row in rows}
+        _save_member_stats(days, by_day, ["registrations"])
+
+        watermark.last_id = upper_id
+        watermark.save(update_fields=["last_id", "updated_at"])
+
+    processed = sum(values["registrations"] for values in by_day.values())
+    logger.info(
+        "[ROLLUP] Recounted %d registrations over %d days", processed, len(days)
+    )
+    return processed
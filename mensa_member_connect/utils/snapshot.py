@@ -0,0 +1,110 @@
+# mensa_member_connect/utils/snapshot.py
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedSnapshot:
+    """
+    Process-local copy of a small, rarely changing dataset.
+
+    A version counter in the shared cache lets any process invalidate the
+    copies held by every other worker. Each process re-reads the counter at
+    most once every `check_interval` seconds, so reads are normally served
+    from memory without touching the cache or the database.
+
+    With `reload_in_background`, a process that already holds a copy keeps
+    serving it after a version change while one thread loads the new one,
+    so expensive loaders never run inside a request (except the first).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader,
+        check_interval: float = 5.0,
+        reload_in_background: bool = False,
+    ):
+        self.name = name
+        self._loader = loader
+        self._check_interval = check_interval
+        self._reload_in_background = reload_in_background
+        self._version_key = f"snapshot:{name}:version"
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._next_check = 0.0
+        self._reloading = False
+
+    def _current_version(self):
+        version = cache.get(self._version_key)
+        if version is None:
+            # Seed with a timestamp so an evicted counter never reuses an old value
+            cache.add(self._version_key, time.time_ns(), timeout=None)
+            version = cache.get(self._version_key)
+        return version
+
+    def get(self):
+        now = time.monotonic()
+        if self._value is not None and now < self._next_check:
+            return self._value
+
+        version = self._current_version()
+        with self._lock:
+            if self._value is not None and version != self._version:
+                if self._reload_in_background:
+                    self._start_background_reload(version)
+                    self._next_check = now + self._check_interval
+                    return self._value
+            if self._value is None or version != self._version:
+                logger.debug("[SNAPSHOT] Loading %s (version %s)", self.name, version)
+                self._value = self._loader()
+                self._version = version
+            self._next_check = now + self._check_interval
+            return self._value
+
+    def _start_background_reload(self, version):
+        # Called with self._lock held
+        if self._reloading:
+            return
+        self._reloading = True
+        threading.Thread(
+            target=self._reload,
+            args=(version,),
+            name=f"reload-{self.name}",
+            daemon=True,
+        ).start()
+
+    def _reload(self, version):
+        try:
+            value = self._loader()
+            with self._lock:
+                self._value = value
+                self._version = version
+        except Exception as e:  # the previous copy keeps being served
+            logger.error("[SNAPSHOT] Background reload of %s failed: %s", self.name, e)
+        finally:
+            with self._lock:
+                self._reloading = False
+            connections.close_all()
+
+    def invalidate(self):
+        """
+        Bump the shared version so every process reloads on its next check,
+        and drop (or, with reload_in_background, start replacing) this
+        process's copy. Call after the change commits.
+        """
+        try:
+            cache.incr(self._version_key)
+        except ValueError:
+            cache.set(self._version_key, time.time_ns(), timeout=None)
+        with self._lock:
+            if self._reload_in_background:
+                self._next_check = 0.0
+            else:
+                self._value = None
@@ -0,0 +1,179 @@
+# mensa_member_connect/utils/stats.py
+"""
+Dashboard and breakdown counts, computed in as few queries as possible and
+served from the shared cache with stale-while-revalidate (CachedStat).
+
+A cached value never expires on its own; a separate "fresh" marker does.
+When the marker is gone (timed out, or deleted by a model signal) the
+current value is still returned and one process, chosen with cache.add,
+recomputes it in a background thread.
+"""
+import logging
+import threading
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
+
+from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.models.expertise import Expertise
+from mensa_member_connect.models.industry import Industry
+from mensa_member_connect.models.local_group import LocalGroup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRESH_SECONDS = 300
+# Upper bound on a refresh; the lock expires if a refresh thread dies
+REFRESH_LOCK_SECONDS = 30
+
+
+class CachedStat:
+    """
+    A computed value kept in the shared cache under `key`, refreshed in
+    the background once it is older than `fresh_seconds` or invalidated.
+    """
+
+    def __init__(self, key: str, compute, fresh_seconds=DEFAULT_FRESH_SECONDS):
+        self.key = key
+        self.fresh_key = f"{key}:fresh"
+        self.lock_key = f"{key}:refreshing"
+        self._compute = compute
+        self._fresh_seconds = fresh_seconds
+
+    def _store(self, data):
+        cache.set(self.key, data, timeout=None)
+        cache.set(self.fresh_key, True, timeout=self._fresh_seconds)
+
+    def _refresh_in_background(self):
+        try:
+            self._store(self._compute())
+        except Exception as e:  # the stale value keeps being served
+            logger.error("[STATS] Background refresh of %s failed: %s", self.key, e)
+        finally:
+            cache.delete(self.lock_key)
+            connections.close_all()
+
+    def get(self):
+        data = cache.get(self.key)
+        if data is None:
+            data = self._compute()
+            self._store(data)
+            return data
+
+        if cache.get(self.fresh_key) is None and cache.add(
+            self.lock_key, True, timeout=REFRESH_LOCK_SECONDS
+        ):
+            threading.Thread(
+                target=self._refresh_in_background,
+                name=f"refresh-{self.key}",
+                daemon=True,
+            ).start()
+        return data
+
+    def invalidate(self):
+        """
+        Mark the cached value stale; the next read triggers a refresh.
+        """
+        cache.delete(self.fresh_key)
+
+
+def compute_dashboard_stats() -> dict:
+    """
+    All dashboard counts in one round trip. An expert is a user with at
+    least one expertise record, so experts are the distinct expertise owners
+    (the FK cascades, so every owner exists).
+    """
+    users = CustomUser._meta.db_table
+    expertise = Expertise._meta.db_table
+    requests = ConnectionRequest._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT
+                (SELECT COUNT(*) FROM {users}),
+                (SELECT COUNT(DISTINCT user_id) FROM {expertise}
+                    WHERE user_id IS NOT NULL),
+                (SELECT COUNT(*) FROM {expertise}),
+                (SELECT COUNT(*) FROM {requests})
+            """
+        )
+        row = cursor.fetchone()
+    return {
+        "total_users": row[0],
+        "total_experts": row[1],
+        "total_expertise": row[2],
+        "total_connection_requests": row[3],
+    }
+
+
+dashboard_stats = CachedStat("stats:dashboard", compute_dashboard_stats)
+
+
+def get_dashboard_stats() -> dict:
+    return dashboard_stats.get()
+
+
+def _breakdown_by(dimension: str) -> list:
+    """
+    Per-`dimension` (a CustomUser FK) member, expert, pending and received
+    connection-request counts in one GROUP BY. Received requests are read
+    from the one-to-one InboxCounter rows, so the join does not fan out.
+    """
+    has_expertise = Exists(Expertise.objects.filter(user_id=OuterRef("id")))
+    return list(
+        CustomUser.objects.values(f"{dimension}_id")
+        .annotate(
+            members=Count("id"),
+            experts=Count("id", filter=Q(has_expertise)),
+            pending=Count("id", filter=Q(status="pending")),
+            connection_requests_received=Coalesce(
+                Sum("inbox_counter__total_received"), 0
+            ),
+        )
+        .order_by(f"{dimension}_id")
+    )
+
+
+def compute_breakdown_stats() -> dict:
+    local_groups = {
+        group.id: group
+        for group in LocalGroup.objects.only("group_name", "group_number")
+    }
+    industries = dict(Industry.objects.values_list("id", "industry_name"))
+
+    by_local_group = []
+    for row in _breakdown_by("local_group"):
+        group = local_groups.get(row.pop("local_group_id"))
+        by_local_group.append(
+            {
+                "id": group.id if group else None,
+                "group_name": group.group_name if group else None,
+                "group_number": group.group_number if group else None,
+                **row,
+            }
+        )
+
+    by_industry = []
+    for row in _breakdown_by("industry"):
+        industry_id = row.pop("industry_id")
+        by_industry.append(
+            {
+                "id": industry_id,
+                "industry_name": industries.get(industry_id),
+                **row,
+            }
+        )
+    return {"local_groups": by_local_group, "industries": by_industry}
+
+
+breakdown_stats = CachedStat("stats:breakdown", compute_breakdown_stats)
+
+
+def invalidate_member_stats():
+    """
+    Mark every cached member statistic stale. Called from model signals.
+    """
+    dashboard_stats.invalidate()
+    breakdown_stats.invalidate()
@@ -0,0 +1,159 @@
+# mensa_member_connect/utils/suggest.py
+"""
+Typeahead suggestions for industries, local groups and expertise keywords.
+
+All suggestable strings are kept in one sorted list of casefolded keys per
+process (a VersionedSnapshot), so a lookup is a bisect to the first key with
+the typed prefix followed by a short scan. Every word of a name is indexed,
+so "eng" finds "Software Engineering". The snapshot is invalidated from
+signals when industries or local groups change; expertise edits only
+schedule a refresh (schedule_keyword_refresh), at most once per
+KEYWORD_REFRESH_DELAY, because rebuilding scans the whole Expertise table.
+Rebuilds after the first run in a background thread.
+"""
+import bisect
+import threading
+from collections import Counter
+
+from django.core.cache import cache
+
+from mensa_member_connect.models.expertise import Expertise
+from mensa_member_connect.models.industry import Industry
+from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.utils.expert_vectors import EXPERTISE_TEXT_FIELDS, tokenize
+from mensa_member_connect.utils.snapshot import VersionedSnapshot
+
+SUGGESTION_TYPES = ("industry", "local_group", "keyword")
+# A keyword must appear in this many experts' profiles to be suggested
+MIN_KEYWORD_EXPERTS = 2
+MAX_KEYWORDS = 5000
+# Matching keys examined per lookup before ranking; bounds the worst case
+MAX_SCAN = 200
+MIN_KEYWORD_LENGTH = 3
+# Expertise edits reach the keyword suggestions after at most this delay
+KEYWORD_REFRESH_DELAY = 60
+KEYWORD_REFRESH_KEY = "suggest:keyword_refresh_pending"
+
+
+def _words(text) -> list:
+    return str(text or "").casefold().split()
+
+
+class SuggestIndex:
+    """
+    `entries` are (type, id, label, weight, search_texts) tuples. `keys` is
+    sorted and `key_entries[i]` is (entry position, whether keys[i] is the
+    start of a search text rather than a later word of it).
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        pairs = set()
+        for position, entry in enumerate(entries):
+            for text in entry[4]:
+                words = _words(text)
+                for start in range(len(words)):
+                    pairs.add((" ".join(words[start:]), position, start == 0))
+        pairs = sorted(pairs)
+        self.keys = [key for key, _, _ in pairs]
+        self.key_entries = [(position, leading) for _, position, leading in pairs]
+
+    def lookup(self, query: str, limit: int = 10, types=None) -> list:
+        prefix = " ".join(_words(query))
+        if not prefix:
+            return []
+
+        start = bisect.bisect_left(self.keys, prefix)
+        leading_by_position = {}
+        for i in range(start, min(start + MAX_SCAN, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            position, leading = self.key_entries[i]
+            if types and self.entries[position][0] not in types:
+                continue
+            leading_by_position[position] = (
+                leading_by_position.get(position, False) or leading
+            )
+
+        # Matches on the start of a name first, then by weight and name
+        ranked = sorted(
+            leading_by_position.items(),
+            key=lambda item: (
+                not item[1],
+                -self.entries[item[0]][3],
+                self.entries[item[0]][2].casefold(),
+            ),
+        )
+        return [
+            {
+                "type": self.entries[position][0],
+                "id": self.entries[position][1],
+                "label": self.entries[position][2],
+            }
+            for position, _ in ranked[:limit]
+        ]
+
+
+def _keyword_entries() -> list:
+    """
+    Frequent terms from expertise descriptions, weighted by how many
+    experts use them.
+    """
+    terms_by_user = {}
+    rows = Expertise.objects.filter(user__isnull=False).values_list(
+        "user_id", *EXPERTISE_TEXT_FIELDS
+    )
+    for user_id, *texts in rows.iterator(chunk_size=2000):
+        terms = terms_by_user.setdefault(user_id, set())
+        for text in texts:
+            terms.update(
+                token for token in tokenize(text) if len(token) >= MIN_KEYWORD_LENGTH
+            )
+
+    experts_per_term = Counter()
+    for terms in terms_by_user.values():
+        experts_per_term.update(terms)
+    return [
+        ("keyword", None, term, count, (term,))
+        for term, count in experts_per_term.most_common(MAX_KEYWORDS)
+        if count >= MIN_KEYWORD_EXPERTS
+    ]
+
+
+def _load_suggest_index() -> SuggestIndex:
+    entries = [
+        ("industry", industry_id, name, 0, (name,))
+        for industry_id, name in Industry.objects.values_list("id", "industry_name")
+        if name
+    ]
+    # Local groups are found by name or by their 3-digit number
+    entries.extend(
+        ("local_group", group_id, name or number, 0, (name, number))
+        for group_id, name, number in LocalGroup.objects.values_list(
+            "id", "group_name", "group_number"
+        )
+    )
+    entries.extend(_keyword_entries())
+    return SuggestIndex(entries)
+
+
+suggest_index = VersionedSnapshot(
+    "suggest_index", _load_suggest_index, reload_in_background=True
+)
+
+
+def schedule_keyword_refresh():
+    """
+    Invalidate the suggest index KEYWORD_REFRESH_DELAY seconds from now,
+    unless a refresh is already pending in any process; the edits made in
+    between are picked up by that one. Call after the change commits.
+    """
+    if not cache.add(KEYWORD_REFRESH_KEY, True, timeout=KEYWORD_REFRESH_DELAY):
+        return
+    timer = threading.Timer(KEYWORD_REFRESH_DELAY, suggest_index.invalidate)
+    timer.daemon = True
+    timer.start()
+
+
+def suggest(query: str, limit: int = 10, types=None) -> list:
+    return suggest_index.get().lookup(query, limit, types)
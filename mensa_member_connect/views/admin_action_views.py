@@ -1,8 +1,14 @@
+from datetime import datetime, time
+
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from mensa_member_connect.authentication import JWTAuthentication
 from mensa_member_connect.models.admin_action import AdminAction
+from mensa_member_connect.pagination import NewestFirstCursorPagination
 from mensa_member_connect.serializers.admin_action_serializers import (
     AdminActionDetailSerializer,
     AdminActionListSerializer,
@@ -10,10 +16,65 @@ from mensa_member_connect.serializers.admin_action_serializers import (
 from mensa_member_connect.permissions import IsAdminRole
 
 
+def _parse_moment(name: str, value: str, end_of_day: bool = False):
+    """
+    Parse an ISO datetime or date query param. A bare date means the start
+    of that day, or the end of it when `end_of_day` is set.
+    """
+    try:
+        day = parse_date(value)
+        moment = None if day is not None else parse_datetime(value)
+    except ValueError:  # well formed but out of range, e.g. month 13
+        day = moment = None
+    if day is not None:
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    elif moment is None:
+        raise ValidationError({name: "Must be an ISO date or datetime."})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
 class AdminActionViewSet(viewsets.ModelViewSet):
-    queryset = AdminAction.objects.all()
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAdminRole]
+    pagination_class = NewestFirstCursorPagination
+
+    def get_queryset(self):
+        """
+        Newest first. List accepts ?admin=<id>, ?target_user=<id>,
+        ?action_type=, ?created_after= and ?created_before= (ISO date or
+        datetime, inclusive).
+        Both users are joined in with their photo blobs deferred.
+        """
+        queryset = AdminAction.objects.select_related("admin", "target_user").defer(
+            "admin__profile_photo", "target_user__profile_photo"
+        )
+        if self.action != "list":
+            return queryset
+
+        params = self.request.query_params
+        for name in ("admin", "target_user"):
+            if params.get(name):
+                try:
+                    queryset = queryset.filter(**{f"{name}_id": int(params[name])})
+                except ValueError as e:
+                    raise ValidationError({name: "Must be a user id."}) from e
+        if params.get("action_type"):
+            if params["action_type"] not in dict(AdminAction.TYPE_CHOICES):
+                raise ValidationError({"action_type": "Unknown action type."})
+            queryset = queryset.filter(action_type=params["action_type"])
+        if params.get("created_after"):
+            queryset = queryset.filter(
+                created_at__gte=_parse_moment("created_after", params["created_after"])
+            )
+        if params.get("created_before"):
+            queryset = queryset.filter(
+                created_at__lte=_parse_moment(
+                    "created_before", params["created_before"], end_of_day=True
+                )
+            )
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -0,0 +1,129 @@
+# mensa_member_connect/views/batch_views.py
+import io
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import Http404
+from django.urls import Resolver404, resolve
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from mensa_member_connect.authentication import JWTAuthentication
+from mensa_member_connect.serializers.batch_serializers import BatchRequestSerializer
+from mensa_member_connect.utils.audit import get_request_id
+
+logger = logging.getLogger(__name__)
+
+# Endpoints that cannot run inside a batch: the batch itself (no recursion)
+# and the event stream, which never finishes.
+EXCLUDED_URL_NAMES = {"batch", "connection_request-stream"}
+
+# Request metadata copied from the batch request to each sub-request. The
+# Authorization header is not: sub-requests reuse the batch's authentication.
+FORWARDED_META = (
+    "REMOTE_ADDR",
+    "SERVER_NAME",
+    "SERVER_PORT",
+    "HTTP_HOST",
+    "HTTP_USER_AGENT",
+    "HTTP_X_FORWARDED_FOR",
+    "HTTP_X_FORWARDED_PROTO",
+)
+
+
+def _build_sub_request(request, method: str, path: str, body) -> WSGIRequest:
+    """
+    A request for one batch item, built from a WSGI environ like the one a
+    server would pass. It shares the batch's request id, so audit records
+    written by sub-requests can be traced back to the batch, and carries the
+    batch's (user, token), which mensa_member_connect.authentication's
+    JWTAuthentication returns instead of decoding a token again.
+    """
+    url = urlsplit(path)
+    payload = b"" if body is None else json.dumps(body).encode("utf-8")
+
+    environ = {
+        key: request.META[key] for key in FORWARDED_META if key in request.META
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(payload)),
+            "HTTP_X_REQUEST_ID": get_request_id(request),
+            "wsgi.input": io.BytesIO(payload),
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    sub = WSGIRequest(environ)
+    sub.batch_auth = (request.user, request.auth)
+    return sub
+
+
+def _run_sub_request(request, item: dict) -> dict:
+    path = urlsplit(item["path"]).path
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {"status": 404, "body": {"detail": "Not found."}}
+    if match.url_name in EXCLUDED_URL_NAMES:
+        return {"status": 400, "body": {"detail": "Not allowed in a batch."}}
+
+    sub = _build_sub_request(request, item["method"], item["path"], item.get("body"))
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Http404:
+        return {"status": 404, "body": {"detail": "Not found."}}
+    if getattr(response, "streaming", False):
+        return {"status": 400, "body": {"detail": "Streaming is not supported."}}
+    if hasattr(response, "render"):
+        response.render()
+
+    content = response.content
+    if content and response.get("Content-Type", "").startswith("application/json"):
+        content = json.loads(content)
+    else:
+        content = content.decode(response.charset or "utf-8")
+    return {"status": response.status_code, "body": content}
+
+
+@api_view(["POST"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Runs several API calls in one round trip, in order, as the caller.
+    Endpoint: POST /api/batch/
+      {"requests": [{"method": "GET", "path": "/api/users/me/"},
+                    {"method": "POST", "path": "/api/...", "body": {...}}]}
+    Returns {"responses": [{"status": 200, "body": ...}, ...]} in the same
+    order. Each sub-request runs through its normal DRF view (permissions,
+    throttles, validation) as the caller, who is authenticated once for the
+    whole batch; a failing sub-request does not stop or roll back the others.
+
+    Sub-requests do not pass through the middleware stack. In particular
+    the request metrics record the whole batch under this view (its SQL
+    includes every sub-request's), not per sub-request view.
+    """
+    params = BatchRequestSerializer(data=request.data)
+    params.is_valid(raise_exception=True)
+
+    responses = []
+    for item in params.validated_data["requests"]:
+        try:
+            responses.append(_run_sub_request(request, item))
+        except Exception:  # one broken call must not sink the whole batch
+            logger.exception(
+                "[BATCH] Sub-request %s %s failed", item["method"], item["path"]
+            )
+            responses.append({"status": 500, "body": {"detail": "Server error."}})
+    return Response({"responses": responses})
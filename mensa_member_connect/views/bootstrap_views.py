@@ -0,0 +1,59 @@
+# mensa_member_connect/views/bootstrap_views.py
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+
+from mensa_member_connect.authentication import JWTAuthentication
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.serializers.custom_user_serializers import (
+    CustomUserBootstrapSerializer,
+)
+from mensa_member_connect.utils import reference_data
+from mensa_member_connect.utils.stats import get_dashboard_stats
+
+
+@api_view(["GET"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def bootstrap(request):
+    """
+    Everything the frontend loads at start-up, in one response:
+    - user: the signed-in user (as /api/users/me/, without the photo)
+    - industries, local_groups: as their list endpoints
+    - stats: as /api/stats/
+    The reference lists are spliced in from their precomputed JSON bytes.
+    """
+    user = (
+        CustomUser.objects.select_related("industry", "local_group")
+        .defer("profile_photo")
+        .annotate(
+            has_photo=ExpressionWrapper(
+                Q(profile_photo__isnull=False), output_field=BooleanField()
+            )
+        )
+        .get(pk=request.user.pk)
+    )
+    renderer = JSONRenderer()
+    body = b"".join(
+        [
+            b'{"user":',
+            renderer.render(CustomUserBootstrapSerializer(user).data),
+            b',"industries":',
+            reference_data.industries.get().body,
+            b',"local_groups":',
+            reference_data.local_groups.get().body,
+            b',"stats":',
+            renderer.render(get_dashboard_stats()),
+            b"}",
+        ]
+    )
+    response = HttpResponse(body, content_type="application/json")
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
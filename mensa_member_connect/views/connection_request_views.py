@@ -1,20 +1,31 @@
 # mensa_member_connect/views/connection_request_views.py
 import logging
 
-# from rest_framework.decorators import action
-# from rest_framework.response import Response
-# from rest_framework import status
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from mensa_member_connect.authentication import JWTAuthentication
 from mensa_member_connect.models.custom_user import CustomUser
-from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.models.connection_request import (
+    ConnectionRequest,
+    message_fingerprint,
+)
+from mensa_member_connect.models.inbox_counter import InboxCounter
 from mensa_member_connect.serializers.connection_request_serializers import (
     ConnectionRequestDetailSerializer,
     ConnectionRequestListSerializer,
+    InboxSummarySerializer,
 )
+from mensa_member_connect.pagination import StandardResultsPagination
+from mensa_member_connect.permissions import IsAdminRole
+from mensa_member_connect.throttles import ConnectionRequestCreateThrottle
 
 from mensa_member_connect.utils.email_utils import notify_expert_new_message
 
@@ -26,6 +37,50 @@ class ConnectionRequestViewSet(viewsets.ModelViewSet):
     serializer_class = ConnectionRequestDetailSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardResultsPagination
+    throttle_classes = [ConnectionRequestCreateThrottle]
+    # Participants only read (and mark read) requests once sent
+    ADMIN_ACTIONS = ["update", "partial_update", "destroy"]
+
+    def get_permissions(self):
+        if self.action in self.ADMIN_ACTIONS:
+            return [IsAdminRole()]
+        return super().get_permissions()
+
+    def get_queryset(self):
+        """
+        Scope requests to the ones the caller sent or received, newest first.
+        List accepts ?box=sent|received (default: both); admins may use ?box=all,
+        and edit or delete any request.
+        Users are joined in with their photo blobs deferred, so the list
+        serializer's names cost no extra queries.
+        """
+        user = self.request.user
+        queryset = ConnectionRequest.objects.select_related(
+            "seeker", "expert"
+        ).defer("seeker__profile_photo", "expert__profile_photo")
+
+        box = self.request.query_params.get("box") if self.action == "list" else None
+        if box == "sent":
+            queryset = queryset.filter(seeker=user)
+        elif box == "received":
+            queryset = queryset.filter(expert=user)
+        elif box == "all" and getattr(user, "role", None) == "admin":
+            pass
+        elif box is None:
+            if self.action not in self.ADMIN_ACTIONS:
+                queryset = queryset.filter(Q(seeker=user) | Q(expert=user))
+        else:
+            raise ValidationError(
+                {"box": "Must be 'sent', 'received' or, for admins, 'all'."}
+            )
+
+        if self.action != "list":
+            # The detail serializer also shows each side's local group
+            queryset = queryset.select_related(
+                "seeker__local_group", "expert__local_group"
+            )
+        return queryset.order_by("-created_at", "-id")
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -52,7 +107,12 @@ class ConnectionRequestViewSet(viewsets.ModelViewSet):
                 )
                 raise PermissionDenied("A valid expert must be specified.")
 
-            conn_request = serializer.save(seeker=self.request.user)
+            # Counters are bumped by the post_save signal in the same transaction
+            with transaction.atomic():
+                self._reject_duplicate(
+                    user, expert, serializer.validated_data.get("message")
+                )
+                conn_request = serializer.save(seeker=self.request.user)
             seeker_id = getattr(user, "id", "unknown")
             expert_id = getattr(getattr(conn_request, "expert", None), "id", "unknown")
 
@@ -91,3 +151,75 @@ class ConnectionRequestViewSet(viewsets.ModelViewSet):
                 "Failed to create connection request for user %s: %s", seeker_id, e
             )
             raise
+
+    def _reject_duplicate(self, user, expert, message):
+        """
+        Reject a request identical to one the seeker sent the same expert
+        within CONNECTION_REQUEST_DUPLICATE_WINDOW. Must run inside a
+        transaction: the seeker's InboxCounter row is locked so concurrent
+        submissions from the same seeker are checked one at a time.
+        """
+        InboxCounter.objects.get_or_create(user_id=user.id)
+        InboxCounter.objects.select_for_update().filter(user_id=user.id).first()
+
+        cutoff = timezone.now() - settings.CONNECTION_REQUEST_DUPLICATE_WINDOW
+        duplicate = ConnectionRequest.objects.filter(
+            seeker=user,
+            expert=expert,
+            message_fingerprint=message_fingerprint(message),
+            created_at__gte=cutoff,
+        ).exists()
+        if duplicate:
+            logger.warning(
+                "Rejected duplicate connection request from seeker %s to expert %s",
+                user.id,
+                expert.id,
+            )
+            raise ValidationError(
+                {"message": "You have already sent this request to this expert."}
+            )
+
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request):
+        """
+        Inbox badge counts for the current user, read from InboxCounter.
+        Endpoint: GET /api/connection_requests/summary/
+        """
+        counter = InboxCounter.objects.filter(user=request.user).first()
+        if counter is None:
+            counter = InboxCounter(user=request.user)
+        return Response(InboxSummarySerializer(counter).data)
+
+    @action(detail=True, methods=["post"], url_path="read")
+    def mark_read(self, request, pk=None):
+        """
+        Mark a received request as read.
+        Endpoint: POST /api/connection_requests/{id}/read/
+        """
+        conn_request = self.get_object()
+        if conn_request.expert_id != request.user.id:
+            raise PermissionDenied("Only the receiving expert can mark a request read.")
+
+        with transaction.atomic():
+            updated = ConnectionRequest.objects.filter(
+                pk=conn_request.pk, read_at__isnull=True
+            ).update(read_at=timezone.now())
+            if updated:
+                InboxCounter.adjust(request.user.id, unread_received=-updated)
+
+        return Response(self.summary(request).data)
+
+    @action(detail=False, methods=["post"], url_path="read_all")
+    def mark_all_read(self, request):
+        """
+        Mark every received request as read.
+        Endpoint: POST /api/connection_requests/read_all/
+        """
+        with transaction.atomic():
+            updated = ConnectionRequest.objects.filter(
+                expert=request.user, read_at__isnull=True
+            ).update(read_at=timezone.now())
+            if updated:
+                InboxCounter.adjust(request.user.id, unread_received=-updated)
+
+        return Response(self.summary(request).data)
@@ -11,10 +11,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authentication import BaseAuthentication
 
+from mensa_member_connect.authentication import JWTAuthentication
 from mensa_member_connect.models.custom_user import CustomUser
 from mensa_member_connect.serializers.custom_user_serializers import (
     PasswordResetRequestSerializer,
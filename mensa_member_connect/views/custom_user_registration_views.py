@@ -35,6 +35,7 @@ class CustomUserRegistrationViewSet(viewsets.ViewSet):
         city = request.data.get("city")
         state = request.data.get("state")
         local_group = request.data.get("local_group")
+        local_group_number = request.data.get("local_group_number")
 
         logger.info(
             "[USER_REG] Attempting registration for %s %s, email=%s",
@@ -108,10 +109,16 @@ class CustomUserRegistrationViewSet(viewsets.ViewSet):
         if state:
             user_data["state"] = state
 
-        # Handle local_group - can be ID (int) or name (string)
-        if local_group:
+        # Handle local_group - can be ID (int) or name (string), or a
+        # 3-digit group number sent as local_group_number
+        if local_group_number or local_group:
             try:
-                user_data["local_group"] = get_local_group(local_group, email)
+                if local_group_number:
+                    user_data["local_group"] = get_local_group(
+                        local_group_number, email, by_number=True
+                    )
+                else:
+                    user_data["local_group"] = get_local_group(local_group, email)
             except ValueError as e:
                 logger.warning("[USER_REG] %s", e)
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
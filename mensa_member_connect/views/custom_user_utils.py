@@ -2,6 +2,10 @@
 import logging
 import re
 from mensa_member_connect.models.local_group import LocalGroup
+from mensa_member_connect.utils.local_group_resolver import (
+    resolve_local_group,
+    resolve_local_group_number,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +49,18 @@ def validate_phone(raw_phone: str) -> str:
     return normalized_phone
 
 
-def get_local_group(local_group_input, context: str = "") -> LocalGroup:
+def get_local_group(
+    local_group_input, context: str = "", by_number: bool = False
+) -> LocalGroup:
     """
-    Resolve a LocalGroup object from an ID (int or numeric string) or name (string).
+    Resolve a LocalGroup object from an ID (int or numeric string) or name
+    (string), or from its 3-digit group_number when `by_number` is set.
+    Served from the in-process resolver (utils/local_group_resolver.py).
 
     Args:
-        local_group_input: int, str, or None. Should be the ID or group_name.
+        local_group_input: int, str, or None. The ID or group_name, or the
+            group_number ("094") when `by_number` is set.
+        by_number: look the input up as a group_number only.
 
     Returns:
         LocalGroup instance.
@@ -61,15 +71,11 @@ def get_local_group(local_group_input, context: str = "") -> LocalGroup:
     if not local_group_input:
         raise ValueError(f"No local group provided. Context: {context}")
 
-    try:
-        # Try ID first
-        if isinstance(local_group_input, int) or (
-            isinstance(local_group_input, str) and local_group_input.isdigit()
-        ):
-            return LocalGroup.objects.get(id=int(local_group_input))
-        # Otherwise, treat as name
-        return LocalGroup.objects.get(group_name=local_group_input)
-    except LocalGroup.DoesNotExist as exc:
+    if by_number:
+        local_group = resolve_local_group_number(local_group_input)
+    else:
+        local_group = resolve_local_group(local_group_input)
+    if local_group is None:
         logger.warning(
             "[USER_REG] Local group not found: %s for context %s",
             local_group_input,
@@ -77,12 +83,5 @@ def get_local_group(local_group_input, context: str = "") -> LocalGroup:
         )
         raise ValueError(
             f"Local group '{local_group_input}' not found.  Context: {context}"
-        ) from exc
-    except Exception as exc:
-        logger.warning(
-            "[USER_REG] Error looking up local group %s for context=%s: %s",
-            local_group_input,
-            context,
-            exc,
         )
-        raise ValueError(f"Invalid local group: {exc}  Context: {context}") from exc
+    return local_group
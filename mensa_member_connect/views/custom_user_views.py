@@ -1,34 +1,56 @@
 # mensa_member_connect/views/custom_user_views.py
 import logging
 import re
+from datetime import timedelta
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.contrib.auth.password_validation import validate_password
-from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from mensa_member_connect.authentication import JWTAuthentication
 from mensa_member_connect.models.custom_user import CustomUser
 from mensa_member_connect.models.expertise import Expertise
-from mensa_member_connect.models.local_group import LocalGroup
 from mensa_member_connect.models.admin_action import AdminAction
 
 from mensa_member_connect.serializers.custom_user_serializers import (
     CustomUserDetailSerializer,
     CustomUserListSerializer,
     CustomUserExpertSerializer,
+    RelatedExpertSerializer,
+    ExpertMatchRequestSerializer,
+    BulkStatusSerializer,
+    ReviewQueueUserSerializer,
 )
 from mensa_member_connect.permissions import IsAdminRole
 from mensa_member_connect.utils.email_utils import (
     notify_admin_new_registration,
     notify_user_registration,
     notify_user_approval,
+    queue_emails,
 )
+from mensa_member_connect.utils.audit import (
+    log_user_changes,
+    snapshot_audited_fields,
+    user_change_records,
+)
+from mensa_member_connect.utils.expert_vectors import match_experts, similar_experts
+from mensa_member_connect.utils.stats import invalidate_member_stats
+from mensa_member_connect.views.custom_user_utils import get_local_group
 
 
 logger = logging.getLogger(__name__)
 
+MAX_RELATED_EXPERTS = 50
+# Pending users handed to one admin per review_queue/next call, and how long
+# they stay reserved for that admin
+DEFAULT_REVIEW_BATCH = 10
+MAX_REVIEW_BATCH = 50
+REVIEW_CLAIM_DURATION = timedelta(minutes=15)
+
 
 class CustomUserViewSet(viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
@@ -45,7 +67,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
             return [IsAuthenticated()]
-        if self.action == "list_all_users":
+        if self.action in ["list_all_users", "bulk_status", "review_queue_next"]:
             return [IsAdminRole()]
         if self.action in ["authenticate_user", "register_user"]:
             return []  # public endpoints, no auth required
@@ -68,7 +90,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         )
 
         old_status = target_user.status
-        old_role = target_user.role
+        audited_before = snapshot_audited_fields(target_user)
 
         serializer = CustomUserDetailSerializer(
             target_user, data=request.data, partial=True
@@ -76,22 +98,17 @@ class CustomUserViewSet(viewsets.ModelViewSet):
 
         if serializer.is_valid():
 
-            serializer.save()
+            new_status = serializer.validated_data.get("status", old_status)
+            if old_status != "active" and new_status == "active":
+                # Keep the first approval time if the user is re-activated
+                serializer.save(approved_at=target_user.approved_at or timezone.now())
+            else:
+                serializer.save()
             print("After save:", target_user.status)
 
             # --- AdminAction Logging ---
-            if old_status != target_user.status:
-                action_message = (
-                    f"Admin {user.get_full_name()} changed the status of user "
-                    f"{target_user.id} - {target_user.get_full_name()} "
-                    f"from '{old_status}' to '{target_user.status}'."
-                )
-                AdminAction.objects.create(
-                    admin=user,
-                    target_user=target_user,
-                    action=action_message,
-                )
-                logger.info("[ADMIN_ACTION] %s", action_message)
+            for record in log_user_changes(request, target_user, audited_before):
+                logger.info("[ADMIN_ACTION] %s", record.action)
 
             logger.info(
                 "[USER_UPDATE] Successfully updated user ID=%s by user %s. Status was: %s. Status is now: %s",
@@ -101,21 +118,6 @@ class CustomUserViewSet(viewsets.ModelViewSet):
                 target_user.status,
             )
 
-            if old_role != target_user.role:
-                role_change_message = (
-                    f"Admin {user.get_full_name()} changed the role of user "
-                    f"{target_user.id} - {target_user.get_full_name()} "
-                    f"from '{old_role}' to '{target_user.role}'."
-                )
-
-                AdminAction.objects.create(
-                    admin=user,
-                    target_user=target_user,
-                    action=role_change_message,
-                )
-
-                logger.info("[ADMIN_ACTION] %s", role_change_message)
-
             target_user.refresh_from_db()
 
             # Send email if status changed to active
@@ -150,6 +152,162 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk_status",
+        permission_classes=[IsAdminRole],
+    )
+    def bulk_status(self, request):
+        """
+        Sets the status of many users at once, e.g. approving ("active") or
+        rejecting ("rejected") a batch of pending registrations.
+        Endpoint: POST /api/users/bulk_status/ {"ids": [1, 2], "status": "active"}
+        Users are updated in one transaction with a single bulk UPDATE and
+        audit INSERT; approval emails are written to the email outbox in
+        the same transaction and sent after commit.
+        """
+        params = BulkStatusSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        ids = set(params.validated_data["ids"])
+        new_status = params.validated_data["status"]
+        now = timezone.now()
+
+        with transaction.atomic():
+            users = list(
+                CustomUser.objects.select_for_update()
+                .filter(id__in=ids)
+                .only(
+                    "id",
+                    "email",
+                    "first_name",
+                    "last_name",
+                    "status",
+                    "role",
+                    "approved_at",
+                )
+            )
+            changed, audit_records = [], []
+            for target_user in users:
+                if target_user.status == new_status:
+                    continue
+                before = snapshot_audited_fields(target_user)
+                target_user.status = new_status
+                if new_status == CustomUser.STATUS_ACTIVE:
+                    target_user.approved_at = target_user.approved_at or now
+                changed.append((target_user, before["status"]))
+                audit_records.extend(
+                    user_change_records(request, target_user, before)
+                )
+
+            CustomUser.objects.bulk_update(
+                [target_user for target_user, _ in changed],
+                ["status", "approved_at"],
+                batch_size=500,
+            )
+            AdminAction.objects.bulk_create(audit_records, batch_size=500)
+            # bulk_update sends no post_save signals
+            transaction.on_commit(invalidate_member_stats)
+
+            if new_status == CustomUser.STATUS_ACTIVE:
+                queue_emails(
+                    notify_user_approval,
+                    [
+                        (
+                            (target_user.email, target_user.get_full_name()),
+                            {
+                                "first_name": target_user.first_name,
+                                "last_name": target_user.last_name,
+                            },
+                        )
+                        for target_user, _ in changed
+                    ],
+                )
+
+        found = {target_user.id for target_user in users}
+        updated = sorted(target_user.id for target_user, _ in changed)
+        logger.info(
+            "[ADMIN_ACTION] %s set status '%s' on %d users",
+            request.user.get_full_name(),
+            new_status,
+            len(updated),
+        )
+        return Response(
+            {
+                "status": new_status,
+                "updated": updated,
+                "unchanged": sorted(found - set(updated)),
+                "not_found": sorted(ids - found),
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="review_queue/next")
+    def review_queue_next(self, request):
+        """
+        Claims the next batch of pending users for the calling admin, oldest
+        registration first, and returns them.
+        Endpoint: GET /api/users/review_queue/next/?size=10
+        Rows are picked with SELECT ... FOR UPDATE SKIP LOCKED, so admins
+        calling at the same time get disjoint batches without waiting on
+        each other. A claim lasts REVIEW_CLAIM_DURATION; the admin's own
+        unexpired claims fill the batch first (and are renewed), then the
+        oldest unclaimed or expired ones.
+        """
+        try:
+            size = min(
+                int(request.query_params.get("size", DEFAULT_REVIEW_BATCH)),
+                MAX_REVIEW_BATCH,
+            )
+        except ValueError:
+            return Response(
+                {"error": "size must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if size < 1:
+            return Response(
+                {"error": "size must be at least 1."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        now = timezone.now()
+        claimed_until = now + REVIEW_CLAIM_DURATION
+        with transaction.atomic():
+            pending = (
+                CustomUser.objects.select_for_update(skip_locked=True)
+                .filter(status="pending")
+                .order_by("date_joined", "id")
+            )
+            ids = list(
+                pending.filter(
+                    review_claimed_by=request.user, review_claimed_until__gte=now
+                ).values_list("id", flat=True)[:size]
+            )
+            if len(ids) < size:
+                ids += pending.filter(
+                    Q(review_claimed_until__isnull=True)
+                    | Q(review_claimed_until__lt=now)
+                ).values_list("id", flat=True)[: size - len(ids)]
+            CustomUser.objects.filter(id__in=ids).update(
+                review_claimed_by=request.user, review_claimed_until=claimed_until
+            )
+
+        users = {
+            user.id: user
+            for user in CustomUser.objects.filter(id__in=ids)
+            .annotate(is_expert=Exists(Expertise.objects.filter(user=OuterRef("pk"))))
+            .select_related("local_group")
+            .defer("profile_photo")
+        }
+        serializer = ReviewQueueUserSerializer(
+            [users[user_id] for user_id in ids if user_id in users], many=True
+        )
+        logger.info(
+            "[REVIEW_QUEUE] Claimed %d pending users for admin %s",
+            len(ids),
+            request.user.id,
+        )
+        return Response({"claimed_until": claimed_until, "results": serializer.data})
+
     @action(
         detail=True,
         methods=["post"],
@@ -217,6 +375,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         city = request.data.get("city")
         state = request.data.get("state")
         local_group = request.data.get("local_group")
+        local_group_number = request.data.get("local_group_number")
 
         logger.info(
             "[USER_REG] Attempting registration for email=%s",
@@ -303,40 +462,18 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         if state:
             user_data["state"] = state
 
-        # Handle local_group - can be ID (int) or name (string)
-        local_group_obj = None
-        if local_group:
+        # Handle local_group - can be ID (int) or name (string), or a
+        # 3-digit group number sent as local_group_number
+        if local_group_number or local_group:
             try:
-                # Try as ID first
-                if isinstance(local_group, int) or (
-                    isinstance(local_group, str) and local_group.isdigit()
-                ):
-                    local_group_obj = LocalGroup.objects.get(id=int(local_group))
+                if local_group_number:
+                    user_data["local_group"] = get_local_group(
+                        local_group_number, email, by_number=True
+                    )
                 else:
-                    # Try as name
-                    local_group_obj = LocalGroup.objects.get(group_name=local_group)
-                user_data["local_group"] = local_group_obj
-            except LocalGroup.DoesNotExist:
-                logger.warning(
-                    "[USER_REG] Local group not found: %s for email=%s",
-                    local_group,
-                    email,
-                )
-                return Response(
-                    {"error": f"Local group '{local_group}' not found."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            except Exception as e:
-                logger.warning(
-                    "[USER_REG] Error looking up local group %s for email=%s: %s",
-                    local_group,
-                    email,
-                    e,
-                )
-                return Response(
-                    {"error": "Invalid local group."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+                    user_data["local_group"] = get_local_group(local_group, email)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         new_user = CustomUser.objects.create_user(**user_data)
 
@@ -429,3 +566,72 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         serializer = CustomUserExpertSerializer(experts, many=True)
         logger.info("[LIST_EXPERTS] Returning %d experts", experts.count())
         return Response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="related",
+        permission_classes=[IsAuthenticated],
+    )
+    def related_experts(self, request, pk=None):
+        """
+        Returns the experts most similar to this one, best match first.
+        Endpoint: GET /api/users/{id}/related/?k=10
+        Scores come from the precomputed TF-IDF index (build_expert_vectors).
+        """
+        try:
+            k = min(int(request.query_params.get("k", 10)), MAX_RELATED_EXPERTS)
+            user_id = int(pk)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "k and id must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if k < 1:
+            return Response(
+                {"error": "k must be at least 1."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        scores = dict(similar_experts(user_id, k))
+        return self._ranked_experts_response(scores)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="experts/match",
+        url_name="match-experts",
+        permission_classes=[IsAuthenticated],
+    )
+    def matching_experts(self, request):
+        """
+        Ranks experts against a free-text description of what the member needs.
+        Endpoint: POST /api/users/experts/match/ {"description": ..., "limit": 20}
+        Text relevance comes from the TF-IDF index; experts in the member's
+        local group or state, and those marked available, rank higher.
+        """
+        params = ExpertMatchRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        scores = dict(
+            match_experts(
+                params.validated_data["description"],
+                params.validated_data["limit"],
+                seeker=request.user,
+            )
+        )
+        logger.info(
+            "[MATCH_EXPERTS] %d matches for user %s", len(scores), request.user.id
+        )
+        return self._ranked_experts_response(scores)
+
+    def _ranked_experts_response(self, scores):
+        experts = (
+            CustomUser.objects.filter(id__in=scores)
+            .select_related("industry", "local_group")
+            .defer("profile_photo")
+        )
+        ordered = sorted(experts, key=lambda expert: -scores[expert.id])
+        serializer = RelatedExpertSerializer(
+            ordered, many=True, context={"scores": scores}
+        )
+        return Response(serializer.data)
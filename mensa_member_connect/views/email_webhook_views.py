@@ -0,0 +1,93 @@
+# mensa_member_connect/views/email_webhook_views.py
+import hashlib
+import hmac
+import logging
+import time
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from mensa_member_connect.utils.email_suppression import ingest_mailgun_events
+
+logger = logging.getLogger(__name__)
+
+# Reject signatures older than this to limit replays
+MAX_SIGNATURE_AGE_SECONDS = 15 * 60
+
+
+def verify_mailgun_signature(signature: dict, signing_key: str) -> bool:
+    """
+    Check a Mailgun webhook signature: HMAC-SHA256(timestamp + token).
+    """
+    try:
+        timestamp = str(signature["timestamp"])
+        token = str(signature["token"])
+        expected = str(signature["signature"])
+        age = abs(time.time() - int(timestamp))
+    except (KeyError, TypeError, ValueError):
+        return False
+
+    if age > MAX_SIGNATURE_AGE_SECONDS:
+        return False
+
+    digest = hmac.new(
+        signing_key.encode("utf-8"),
+        f"{timestamp}{token}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    return hmac.compare_digest(digest, expected)
+
+
+class MailgunEventWebhookView(APIView):
+    """
+    Receives Mailgun delivery events and records bounces, complaints and
+    unsubscribes in the suppression list.
+    Endpoint: POST /api/email/events/
+
+    Accepts Mailgun's native payload ({"signature": {...}, "event-data": {...}})
+    or a batch signed once ({"signature": {...}, "items": [event-data, ...]}),
+    which is what scripts/send_mailgun_events.py posts as a local stand-in.
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        signing_key = getattr(settings, "MAILGUN_WEBHOOK_SIGNING_KEY", "")
+        if not signing_key:
+            logger.error("[EMAIL] Mailgun webhook called but no signing key is set")
+            return Response(
+                {"error": "Webhook is not configured."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        if not isinstance(request.data, dict):
+            return Response(
+                {"error": "Expected a JSON object."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not verify_mailgun_signature(request.data.get("signature"), signing_key):
+            logger.warning("[EMAIL] Rejected Mailgun webhook with invalid signature")
+            return Response(
+                {"error": "Invalid signature."}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        if "items" in request.data:
+            events = request.data.get("items")
+        else:
+            events = [request.data.get("event-data")]
+
+        if not isinstance(events, list) or not all(
+            isinstance(event, dict) for event in events
+        ):
+            return Response(
+                {"error": "Expected event-data or a list of items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        suppressed = ingest_mailgun_events(events)
+        return Response({"received": len(events), "suppressed": suppressed})
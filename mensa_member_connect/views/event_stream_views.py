@@ -0,0 +1,139 @@
+# mensa_member_connect/views/event_stream_views.py
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.crypto import get_random_string
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from mensa_member_connect.authentication import JWTAuthentication
+from mensa_member_connect.models.custom_user import CustomUser
+from mensa_member_connect.utils.events import broker
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+# Stream tickets are only good for opening one stream, shortly after issue
+STREAM_TICKET_SALT = "connection-request-stream"
+STREAM_TICKET_SECONDS = 30
+
+
+@api_view(["POST"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def connection_request_stream_ticket(request):
+    """
+    Issues a ticket for opening the caller's connection request stream.
+    Endpoint: POST /api/connection_requests/stream/ticket/
+    EventSource cannot send an Authorization header, so the stream takes
+    this ticket in its URL instead of the access token: it is signed, only
+    valid for the stream, expires after STREAM_TICKET_SECONDS and can be
+    used once, so one showing up in an access log is of no use.
+    """
+    ticket = signing.dumps(
+        {"user_id": request.user.id, "nonce": get_random_string(16)},
+        salt=STREAM_TICKET_SALT,
+    )
+    return Response({"ticket": ticket, "expires_in": STREAM_TICKET_SECONDS})
+
+
+def _redeem_ticket(ticket):
+    """
+    The active user a stream ticket was issued to, or None if the ticket is
+    forged, expired or already used.
+    """
+    try:
+        payload = signing.loads(
+            ticket, salt=STREAM_TICKET_SALT, max_age=STREAM_TICKET_SECONDS
+        )
+    except signing.BadSignature:  # includes SignatureExpired
+        return None
+    # Marks the ticket used in the shared cache (per process without Redis)
+    if not cache.add(
+        f"stream-ticket:{payload['nonce']}", True, timeout=STREAM_TICKET_SECONDS
+    ):
+        return None
+    return CustomUser.objects.filter(id=payload["user_id"], is_active=True).first()
+
+
+def _authenticate(request):
+    """
+    Resolve the user from a JWT access token in the Authorization header
+    (non-browser clients) or a stream ticket in the ?ticket= parameter.
+    """
+    ticket = request.GET.get("ticket")
+    if ticket:
+        return _redeem_ticket(ticket)
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header is not None else None
+    if not raw_token:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+async def _event_stream(user_id):
+    queue = broker.subscribe(user_id)
+    try:
+        # Ask EventSource to wait 5s before reconnecting after a drop
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+async def connection_request_stream(request):
+    """
+    Server-sent events for the current user's incoming connection requests.
+    Endpoint: GET /api/connection_requests/stream/?ticket=<stream ticket>
+    (see connection_request_stream_ticket), or with an Authorization header.
+
+    Needs the ASGI application (the Procfile runs gunicorn with uvicorn
+    workers): an open stream only holds a coroutine there, whereas under
+    WSGI it would hold a whole worker. Requests reaching a WSGI server are
+    refused.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed."}, status=405)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event streams are only served by the ASGI application."},
+            status=501,
+        )
+
+    user = await sync_to_async(_authenticate)(request)
+    if user is None or not user.is_active:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided or are invalid."},
+            status=401,
+        )
+
+    logger.info("[EVENTS] User ID=%s opened a connection request stream", user.id)
+    response = StreamingHttpResponse(
+        _event_stream(user.id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # disable proxy buffering
+    return response
@@ -1,35 +1,172 @@
 # mensa_member_connect/views/expertise_views.py
+import logging
+
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 
+from mensa_member_connect.authentication import JWTAuthentication
+from mensa_member_connect.models.custom_user import CustomUser
 from mensa_member_connect.models.expertise import Expertise
+from mensa_member_connect.utils.expert_vectors import schedule_expert_vector_update
+from mensa_member_connect.utils.stats import invalidate_member_stats
+from mensa_member_connect.utils.suggest import schedule_keyword_refresh
 from mensa_member_connect.serializers.expertise_serializers import (
+    ExpertiseBulkItemSerializer,
     ExpertiseListSerializer,
     ExpertiseDetailSerializer,
 )
 
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_USER_IDS = 100
+
+EXPERTISE_EDITABLE_FIELDS = [
+    "area_of_expertise",
+    "what_offering",
+    "who_would_benefit",
+    "why_choose_you",
+    "skills_not_offered",
+]
+
 
 class ExpertiseViewSet(viewsets.ModelViewSet):
     queryset = Expertise.objects.all()
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        """
+        Join the industry in up front: ExpertiseDetailSerializer reads
+        area_of_expertise.industry_name for every row.
+        """
+        return Expertise.objects.select_related("area_of_expertise").order_by("id")
+
     def get_serializer_class(self):
         action = getattr(self, 'action', None)
         if action in ["list"]:
             return ExpertiseListSerializer
         return ExpertiseDetailSerializer
 
-    @action(detail=False, methods=["get"], url_path="by_user/(?P<user_id>[^/.]+)")
+    @action(detail=False, methods=["get"], url_path=r"by_user/(?P<user_id>\d+)")
     def by_user(self, request, user_id=None):
         """
         Return all expertise records belonging to a given user.
         Requires authentication to view expert profiles.
         """
-        queryset = Expertise.objects.filter(user_id=user_id)
+        queryset = self.get_queryset().filter(user_id=user_id)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="by_users")
+    def by_users(self, request):
+        """
+        Return expertise records for several users at once, grouped by user id,
+        from a single query: GET /api/expertises/by_users/?user_ids=1,2,3
+        Every requested id is present in the response, with [] if it has none.
+        """
+        raw_ids = request.query_params.get("user_ids", "")
+        try:
+            user_ids = sorted(
+                {int(value) for value in raw_ids.split(",") if value.strip()}
+            )
+        except ValueError as exc:
+            raise ValidationError(
+                {"user_ids": "Must be a comma-separated list of integers."}
+            ) from exc
+        if not user_ids:
+            raise ValidationError({"user_ids": "At least one user id is required."})
+        if len(user_ids) > MAX_BATCH_USER_IDS:
+            raise ValidationError(
+                {"user_ids": f"At most {MAX_BATCH_USER_IDS} user ids per request."}
+            )
+
+        grouped = {str(user_id): [] for user_id in user_ids}
+        queryset = self.get_queryset().filter(user_id__in=user_ids)
+        for item in ExpertiseDetailSerializer(queryset, many=True).data:
+            grouped[str(item["user"])].append(item)
+        return Response(grouped)
+
+    @by_user.mapping.put
+    def replace_by_user(self, request, user_id=None):
+        """
+        Replace a user's whole expertise set with the submitted list.
+        Endpoint: PUT /api/expertises/by_user/{user_id}/
+
+        Items with an "id" update that row, items without one are created,
+        and existing rows missing from the list are deleted, all in one
+        transaction. Returns the resulting set.
+        """
+        target_user = get_object_or_404(CustomUser, pk=user_id)
+        if request.user.id != target_user.id and request.user.role != "admin":
+            raise PermissionDenied("You can only edit your own expertise.")
+
+        serializer = ExpertiseBulkItemSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        item_ids = [item["id"] for item in serializer.validated_data if "id" in item]
+        if len(item_ids) != len(set(item_ids)):
+            raise ValidationError({"id": "Each expertise id may appear only once."})
+
+        with transaction.atomic():
+            existing = {
+                expertise.id: expertise
+                for expertise in Expertise.objects.select_for_update().filter(
+                    user=target_user
+                )
+            }
+            unknown_ids = set(item_ids) - set(existing)
+            if unknown_ids:
+                raise ValidationError(
+                    {
+                        "id": "Unknown expertise ids for this user: "
+                        f"{sorted(unknown_ids)}"
+                    }
+                )
+
+            to_create, to_update = [], []
+            for item in serializer.validated_data:
+                item = dict(item)
+                expertise_id = item.pop("id", None)
+                if expertise_id is None:
+                    to_create.append(Expertise(user=target_user, **item))
+                    continue
+                expertise = existing[expertise_id]
+                changed = False
+                for field, value in item.items():
+                    if getattr(expertise, field) != value:
+                        setattr(expertise, field, value)
+                        changed = True
+                if changed:
+                    to_update.append(expertise)
+
+            deleted, _ = (
+                Expertise.objects.filter(user=target_user)
+                .exclude(id__in=item_ids)
+                .delete()
+            )
+            Expertise.objects.bulk_update(to_update, EXPERTISE_EDITABLE_FIELDS)
+            Expertise.objects.bulk_create(to_create)
+            # bulk operations send no model signals
+            schedule_expert_vector_update(target_user.id)
+            transaction.on_commit(schedule_keyword_refresh)
+            if to_create:
+                transaction.on_commit(invalidate_member_stats)
+
+        logger.info(
+            "[EXPERTISE] User %s replaced expertise of user %s: "
+            "%d created, %d updated, %d deleted",
+            request.user.id,
+            target_user.id,
+            len(to_create),
+            len(to_update),
+            deleted,
+        )
+
+        queryset = self.get_queryset().filter(user=target_user)
+        return Response(ExpertiseDetailSerializer(queryset, many=True).data)
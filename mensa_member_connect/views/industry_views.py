@@ -1,12 +1,13 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from mensa_member_connect.authentication import JWTAuthentication
 from mensa_member_connect.models.industry import Industry
 from mensa_member_connect.serializers.industry_serializers import (
     IndustryListSerializer,
     IndustryDetailSerializer,
 )
+from mensa_member_connect.utils.reference_data import industries, reference_response
 
 
 class IndustryViewSet(viewsets.ModelViewSet):
@@ -14,6 +15,12 @@ class IndustryViewSet(viewsets.ModelViewSet):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def list(self, request, *args, **kwargs):
+        """
+        The cached list of all industries, with an ETag for revalidation.
+        """
+        return reference_response(request, industries)
+
     def get_serializer_class(self):
         if self.action == "list":
             return IndustryListSerializer
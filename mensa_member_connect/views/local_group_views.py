@@ -1,12 +1,13 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from mensa_member_connect.authentication import JWTAuthentication
 from mensa_member_connect.models.local_group import LocalGroup
 from mensa_member_connect.serializers.local_group_serializers import (
     LocalGroupListSerializer,
     LocalGroupDetailSerializer,
 )
+from mensa_member_connect.utils.reference_data import local_groups, reference_response
 
 
 class LocalGroupViewSet(viewsets.ModelViewSet):
@@ -14,6 +15,12 @@ class LocalGroupViewSet(viewsets.ModelViewSet):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def list(self, request, *args, **kwargs):
+        """
+        The cached list of all local groups, with an ETag for revalidation.
+        """
+        return reference_response(request, local_groups)
+
     def get_serializer_class(self):
         if self.action == "list":
             return LocalGroupListSerializer
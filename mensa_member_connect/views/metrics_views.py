@@ -0,0 +1,30 @@
+# mensa_member_connect/views/metrics_views.py
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+
+from mensa_member_connect.authentication import JWTAuthentication
+from mensa_member_connect.permissions import IsAdminRole
+from mensa_member_connect.utils.metrics import CONTENT_TYPE, render_prometheus
+
+# Importing email_utils registers the email delivery metrics, so they are
+# listed (with no samples yet) even before the first email is sent.
+from mensa_member_connect.utils import email_utils  # noqa: F401  pylint: disable=unused-import
+
+
+@api_view(["GET"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAdminRole])
+def metrics(request):
+    """
+    Returns the metrics of all worker processes (summed from the snapshots in
+    METRICS_DIR) in the Prometheus text format (admins only).
+    """
+    return HttpResponse(
+        render_prometheus(settings.METRICS_DIR), content_type=CONTENT_TYPE
+    )
@@ -1,5 +1,9 @@
 # mensa_member_connect/views/stats_views.py
+from datetime import timedelta
 
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
 from rest_framework.decorators import (
     api_view,
     authentication_classes,
@@ -7,11 +11,12 @@ from rest_framework.decorators import (
 )
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from mensa_member_connect.models.custom_user import CustomUser
-from mensa_member_connect.views.custom_user_views import CustomUserViewSet
-from mensa_member_connect.models.expertise import Expertise
-from mensa_member_connect.models.connection_request import ConnectionRequest
+from mensa_member_connect.authentication import JWTAuthentication
+from mensa_member_connect.models.daily_stats import DailyConnectionStat, DailyMemberStat
+from mensa_member_connect.permissions import IsAdminRole
+from mensa_member_connect.utils.stats import breakdown_stats, get_dashboard_stats
+
+DEFAULT_DAILY_RANGE_DAYS = 30
 
 
 @api_view(["GET"])
@@ -24,13 +29,87 @@ def stats(request):
     - total experts
     - total expertise records
     - total connection requests
+    Served from the cache; see utils/stats.py.
+    """
+    return Response(get_dashboard_stats())
+
+
+@api_view(["GET"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAdminRole])
+def breakdown(request):
+    """
+    Returns member, expert, pending and received connection-request counts
+    per local group and per industry (users without one are grouped under
+    id null). Served from the cache; see utils/stats.py.
     """
-    user_viewset = CustomUserViewSet()
+    return Response(breakdown_stats.get())
+
+
+@api_view(["GET"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAdminRole])
+def daily_stats(request):
+    """
+    Returns daily time series from the rollup tables filled by the
+    `rollup_stats` management command:
+    - connection requests per day by expert industry and seeker local group
+    - registrations and first connection requests per day, with the average
+      hours from approval to first request
+    Query params: start, end (YYYY-MM-DD, inclusive; default: last 30 days)
+    """
+    end = parse_date(request.query_params.get("end", "")) or timezone.localdate()
+    start = parse_date(request.query_params.get("start", "")) or (
+        end - timedelta(days=DEFAULT_DAILY_RANGE_DAYS - 1)
+    )
+    if start > end:
+        return Response(
+            {"error": "start must not be after end."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    connection_stats = (
+        DailyConnectionStat.objects.filter(day__range=(start, end))
+        .select_related("industry", "local_group")
+        .order_by("day", "industry_id", "local_group_id")
+    )
+    member_stats = DailyMemberStat.objects.filter(day__range=(start, end)).order_by(
+        "day"
+    )
 
     data = {
-        "total_users": CustomUser.objects.count(),
-        "total_experts": user_viewset.list_experts_raw().count(),
-        "total_expertise": Expertise.objects.count(),
-        "total_connection_requests": ConnectionRequest.objects.count(),
+        "start": start,
+        "end": end,
+        "connection_requests": [
+            {
+                "day": stat.day,
+                "industry_id": stat.industry_id,
+                "industry_name": stat.industry.industry_name if stat.industry else None,
+                "local_group_id": stat.local_group_id,
+                "local_group_name": (
+                    stat.local_group.group_name if stat.local_group else None
+                ),
+                "count": stat.connection_requests,
+            }
+            for stat in connection_stats
+        ],
+        "members": [
+            {
+                "day": stat.day,
+                "registrations": stat.registrations,
+                "first_requests": stat.first_requests,
+                "avg_hours_approval_to_first_request": (
+                    round(
+                        stat.seconds_to_first_request
+                        / stat.approved_first_requests
+                        / 3600,
+                        2,
+                    )
+                    if stat.approved_first_requests
+                    else None
+                ),
+            }
+            for stat in member_stats
+        ],
     }
     return Response(data)
@@ -0,0 +1,47 @@
+# mensa_member_connect/views/suggest_views.py
+from rest_framework import status
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from mensa_member_connect.utils.suggest import SUGGESTION_TYPES, suggest
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 25
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def suggestions(request):
+    """
+    Typeahead for signup and search forms.
+    Endpoint: GET /api/suggest/?q=eng&limit=10&type=industry,keyword
+    Types are industry, local_group and keyword (frequent expertise terms).
+    """
+    try:
+        limit = min(
+            int(request.query_params.get("limit", DEFAULT_SUGGESTIONS)),
+            MAX_SUGGESTIONS,
+        )
+    except ValueError:
+        return Response(
+            {"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    types = None
+    if request.query_params.get("type"):
+        types = set(request.query_params["type"].split(","))
+        unknown = types - set(SUGGESTION_TYPES)
+        if unknown:
+            return Response(
+                {"error": f"Unknown type(s): {', '.join(sorted(unknown))}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    query = request.query_params.get("q", "")
+    return Response({"results": suggest(query, max(limit, 1), types)})
@@ -3,6 +3,18 @@ ASGI config for mensa_member_connect_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+This is what the Procfile and railway.json serve (gunicorn with uvicorn
+workers), for the sake of the connection request event stream: an open
+stream is a coroutine on the worker's event loop rather than a worker
+blocked until the client leaves or the 120s timeout kills it.
+
+The rest of the app is unchanged in what it can do at once. Sync views and
+sync-only middleware (WhiteNoise included) run through sync_to_async with
+thread_sensitive=True, i.e. one after another on a single shared thread per
+worker, so each worker handles one regular request at a time, as a sync
+gunicorn worker does, plus the cost of the thread hand-off. Size --workers
+as before.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -64,6 +64,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-view latency / SQL metrics — first, so it times the whole stack
+    "mensa_member_connect.middleware.RequestMetricsMiddleware",
     # CORS — must come before CommonMiddleware
     "corsheaders.middleware.CorsMiddleware",
     # Security and static file handling
@@ -115,10 +117,20 @@ WSGI_APPLICATION = "mensa_member_connect_backend.wsgi.application"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "mensa_member_connect.authentication.JWTAuthentication",
     ],
+    # Rates for the throttles in mensa_member_connect/throttles.py.
+    # Throttle history lives in the default cache, so use Redis in production.
+    "DEFAULT_THROTTLE_RATES": {
+        "connection_request": os.getenv("CONNECTION_REQUEST_RATE", "10/hour"),
+    },
 }
 
+# Identical requests (same seeker, expert and message) inside this window are rejected
+CONNECTION_REQUEST_DUPLICATE_WINDOW = timedelta(
+    hours=int(os.getenv("CONNECTION_REQUEST_DUPLICATE_WINDOW_HOURS", "24"))
+)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(hours=18),
@@ -159,6 +171,48 @@ else:
     }
 
 
+# Cache
+# Shared between gunicorn workers when REDIS_URL is set (rate limits, snapshot
+# versions, password reset tokens); falls back to a per-process cache.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
+# Similar-experts index (TF-IDF vectors, see utils/expert_vectors.py)
+# Built by `python manage.py build_expert_vectors`; must be on a disk shared by
+# all workers of an instance.
+EXPERT_VECTORS_DIR = os.getenv(
+    "EXPERT_VECTORS_DIR", str(BASE_DIR / "data" / "expert_vectors")
+)
+EXPERT_VECTOR_DIMS = int(os.getenv("EXPERT_VECTOR_DIMS", "256"))
+
+
+# Admin action log archival (`python manage.py archive_admin_actions`)
+# Rows older than the retention window move to .jsonl.gz files by month.
+ADMIN_ACTION_RETENTION_DAYS = int(os.getenv("ADMIN_ACTION_RETENTION_DAYS", "365"))
+ADMIN_ACTION_ARCHIVE_DIR = os.getenv(
+    "ADMIN_ACTION_ARCHIVE_DIR", str(BASE_DIR / "data" / "admin_action_archive")
+)
+
+
+# Request metrics (/api/metrics/, see utils/metrics.py)
+# Each worker process writes its values here and the endpoint sums them, so
+# it must be a directory shared by all workers of an instance. Empty disables
+# the merge and the endpoint reports only the worker that serves it.
+METRICS_DIR = os.getenv("METRICS_DIR", str(BASE_DIR / "data" / "metrics"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -229,6 +283,15 @@ EMAIL_BACKEND = os.environ.get(
     "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
 )
 
+# Background threads per process for queued emails (email_utils.queue_emails)
+EMAIL_QUEUE_WORKERS = int(os.environ.get("EMAIL_QUEUE_WORKERS", "4"))
+# Retries of failed queued emails, by the send_queued_emails command: the
+# delay doubles after each failed attempt, up to EMAIL_QUEUE_MAX_ATTEMPTS.
+EMAIL_RETRY_DELAY = timedelta(
+    minutes=int(os.environ.get("EMAIL_RETRY_DELAY_MINUTES", "5"))
+)
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get("EMAIL_QUEUE_MAX_ATTEMPTS", "8"))
+
 # Mailgun SMTP host and ports:
 # 25, 587, and 2525 = STARTTLS (recommended)
 # 465 = SSL/TLS (legacy)
@@ -251,6 +314,10 @@ EMAIL_TIMEOUT = int(os.environ.get("EMAIL_TIMEOUT", 30))
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:5173")
 EMAIL_SUBJECT_PREFIX = os.environ.get("EMAIL_SUBJECT_PREFIX", "[MENSA] ")
 
+# Mailgun webhook signing key, used to verify bounce/complaint/unsubscribe events
+# posted to /api/email/events/. The webhook is disabled while this is empty.
+MAILGUN_WEBHOOK_SIGNING_KEY = os.environ.get("MAILGUN_WEBHOOK_SIGNING_KEY", "")
+
 # Admin and Manager notifications
 ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@namme.us")
 ADMINS = [
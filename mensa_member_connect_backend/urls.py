@@ -20,7 +20,16 @@ from mensa_member_connect.views.connection_request_views import ConnectionReques
 from mensa_member_connect.views.industry_views import IndustryViewSet
 from mensa_member_connect.views.local_group_views import LocalGroupViewSet
 from mensa_member_connect.views.admin_action_views import AdminActionViewSet
+from mensa_member_connect.views.email_webhook_views import MailgunEventWebhookView
 from mensa_member_connect.views import stats_views
+from mensa_member_connect.views.event_stream_views import (
+    connection_request_stream,
+    connection_request_stream_ticket,
+)
+from mensa_member_connect.views import metrics_views
+from mensa_member_connect.views.suggest_views import suggestions
+from mensa_member_connect.views.bootstrap_views import bootstrap
+from mensa_member_connect.views.batch_views import batch
 
 
 class NoAuth(BaseAuthentication):
@@ -65,5 +74,27 @@ urlpatterns = [
     ),
     path("api/users/logout/", LogoutUserView.as_view(), name="user-logout"),
     path("api/stats/", stats_views.stats, name="stats"),
+    path("api/stats/daily/", stats_views.daily_stats, name="stats-daily"),
+    path("api/stats/breakdown/", stats_views.breakdown, name="stats-breakdown"),
+    path("api/metrics/", metrics_views.metrics, name="metrics"),
+    path("api/suggest/", suggestions, name="suggest"),
+    path("api/bootstrap/", bootstrap, name="bootstrap"),
+    path("api/batch/", batch, name="batch"),
+    path(
+        "api/email/events/",
+        MailgunEventWebhookView.as_view(),
+        name="email-events",
+    ),
+    # Registered before the router so "stream" is not taken for a request id
+    path(
+        "api/connection_requests/stream/",
+        connection_request_stream,
+        name="connection_request-stream",
+    ),
+    path(
+        "api/connection_requests/stream/ticket/",
+        connection_request_stream_ticket,
+        name="connection_request-stream-ticket",
+    ),
     path("api/", include(router.urls)),
 ]
@@ -0,0 +1,57 @@
+"""
+send_mailgun_events.py
+
+Local stand-in for Mailgun's event webhooks. Signs a batch of sample
+bounce/complaint/unsubscribe events with MAILGUN_WEBHOOK_SIGNING_KEY and posts
+them to /api/email/events/, so suppression handling can be tested without
+a Mailgun account. Run with:
+
+    MAILGUN_WEBHOOK_SIGNING_KEY=local-test-key python send_mailgun_events.py [email ...]
+
+The backend must be started with the same MAILGUN_WEBHOOK_SIGNING_KEY.
+"""
+
+import hashlib
+import hmac
+import os
+import sys
+import time
+import uuid
+import requests
+
+API_BASE_URL = "http://localhost:8000/api/"
+EVENTS_ENDPOINT = f"{API_BASE_URL}email/events/"
+
+signing_key = os.environ.get("MAILGUN_WEBHOOK_SIGNING_KEY", "local-test-key")
+recipients = sys.argv[1:] or ["bounced@example.com", "complained@example.com"]
+
+timestamp = str(int(time.time()))
+token = uuid.uuid4().hex
+signature = hmac.new(
+    signing_key.encode("utf-8"),
+    f"{timestamp}{token}".encode("utf-8"),
+    hashlib.sha256,
+).hexdigest()
+
+# Cycle through the event types Mailgun sends for dead or unwilling recipients
+sample_events = [
+    {"event": "failed", "severity": "permanent"},
+    {"event": "complained"},
+    {"event": "unsubscribed"},
+]
+items = []
+for i, recipient in enumerate(recipients):
+    event = dict(sample_events[i % len(sample_events)])
+    event.update({"id": uuid.uuid4().hex, "recipient": recipient})
+    items.append(event)
+
+payload = {
+    "signature": {"timestamp": timestamp, "token": token, "signature": signature},
+    "items": items,
+}
+
+try:
+    response = requests.post(EVENTS_ENDPOINT, json=payload, timeout=10)
+    print(f"{response.status_code}: {response.json()}")
+except Exception as e:
+    print(f"⚠️ Error posting events: {e}")